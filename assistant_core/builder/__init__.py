@@ -1,4 +1,42 @@
-from .agent import AgentBuilder, MultiAgent, SingleAgent
-from .base import BaseBuilder, BaseDirector
-from .context import BuilderContext, MultiAgentContext
-from .exceptions import BuilderError
+"""Builders, directors and contexts.
+
+Exports are resolved on first access so importing the package stays cheap.
+"""
+
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+_EXPORTS = {
+    "AgentBuilder": ".agent",
+    "MultiAgent": ".agent",
+    "SingleAgent": ".agent",
+    "BaseBuilder": ".base",
+    "BaseDirector": ".base",
+    "GraphCache": ".cache",
+    "BuilderContext": ".context",
+    "MultiAgentContext": ".context",
+    "BuilderError": ".exceptions",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+if TYPE_CHECKING:
+    from .agent import AgentBuilder, MultiAgent, SingleAgent
+    from .base import BaseBuilder, BaseDirector
+    from .cache import GraphCache
+    from .context import BuilderContext, MultiAgentContext
+    from .exceptions import BuilderError
@@ -1,16 +1,56 @@
 from langgraph.graph import END, StateGraph
 from langgraph.prebuilt import ToolNode, tools_condition
 
+from assistant_core.metrics import get_instrumentation
+from assistant_core.nodes.mixins import check_context_channel
+from assistant_core.profiling import profiled_tool_call
+from assistant_core.tools import ToolExecutor, ToolSelector
+
 from .base import BaseBuilder, BaseDirector
 from .context import BuilderContext, MultiAgentContext
 
 
 class AgentBuilder(BaseBuilder):
+    def __init__(
+        self,
+        tool_executor: ToolExecutor | None = None,
+        tool_selector: ToolSelector | None = None,
+    ):
+        """Configure the canonical agent wiring.
+
+        :param tool_executor: Optional executor that bounds concurrency and
+            applies timeouts to the tool calls of the agent.
+        :param tool_selector: Optional selector that binds only the tools
+            relevant to each question. The tools are indexed at build time;
+            the tool node still runs every tool.
+        """
+        super().__init__()
+        self.tool_executor = tool_executor
+        self.tool_selector = tool_selector
+
+    def create_tool_node(self, tools: list, name: str | None = None) -> ToolNode:
+        """Create the node that executes the agent tool calls.
+
+        When node instrumentation is installed, the tool calls are recorded
+        under ``name``. Tool calls of invocations run with the profile flag
+        are sampled by the profiler.
+        """
+        wrapper = self.tool_executor
+        instrumentation = get_instrumentation()
+        if instrumentation is not None and name:
+            wrapper = instrumentation.tool_call_wrapper(name, wrapper)
+        return ToolNode(tools, awrap_tool_call=profiled_tool_call(wrapper))
+
     def build(self, context: BuilderContext) -> None:
+        # Runs after the pre-agent builders, so their nodes are all added
+        check_context_channel(context.graph_builder)
         tools_node_name = f"tools_{context.agent_node.name}"
 
         # Agent Node
         context.agent_node.rebind_tools(context.tools)
+        if self.tool_selector:
+            self.tool_selector.index(context.tools)
+            context.agent_node.tool_selector = self.tool_selector
         context.graph_builder.add_node(
             context.agent_node.name,
             context.agent_node,
@@ -24,7 +64,7 @@ class AgentBuilder(BaseBuilder):
         # Tool Node
         context.graph_builder.add_node(
             tools_node_name,
-            ToolNode(context.tools),
+            self.create_tool_node(context.tools, tools_node_name),
         )
         context.graph_builder.add_edge(tools_node_name, context.resolver_node.name)
 
@@ -37,12 +77,16 @@ class AgentBuilder(BaseBuilder):
 
 
 class SingleAgentDirector(BaseDirector):
+    def __init__(self, agent_builder: AgentBuilder | None = None):
+        super().__init__()
+        self.agent_builder = agent_builder or AgentBuilder()
+
     def make(self, context: BuilderContext) -> StateGraph:
         """
         Execute the build process for a single agent.
         """
         super().make(context)
-        AgentBuilder().build(context)
+        self.agent_builder.build(context)
 
         return context.graph_builder
 
@@ -51,6 +95,10 @@ SingleAgent = SingleAgentDirector
 
 
 class MultiAgentDirector(BaseDirector):
+    def __init__(self, agent_builder: AgentBuilder | None = None):
+        super().__init__()
+        self.agent_builder = agent_builder or AgentBuilder()
+
     def make(self, context: MultiAgentContext) -> StateGraph:
         """
         Execute the build process for multiple agents.
@@ -65,7 +113,7 @@ class MultiAgentDirector(BaseDirector):
         context.graph_builder.set_conditional_entry_point(
             context.conditional_entrypoint_factory()
         )
-        AgentBuilder().build(context)
+        self.agent_builder.build(context)
 
         return context.graph_builder
 
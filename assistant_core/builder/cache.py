@@ -0,0 +1,162 @@
+"""Cache of compiled graphs keyed by a builder/context fingerprint.
+
+Directors rebuild every node and re-validate the whole ``StateGraph`` on each
+``make()`` + ``compile()``. ``GraphCache`` derives a stable fingerprint from
+the director's builders and the ``ContextFactory`` inputs (configuration and
+component factories), and returns the already compiled graph when the
+fingerprint was seen before.
+
+The fingerprint never creates context components: on a hit with a lazy
+context no model, node or tool is built. Functions, tools and other objects
+without a value ``repr`` are keyed by identity (the cache keeps them alive so
+ids are not reused), so factories must be stable objects, e.g. module level
+functions rather than per-request lambdas, to get hits. Components already
+set on the context are part of the key too: assigned nodes and all
+materialized tools by identity.
+
+On a hit the director does not run, so the given context is left untouched.
+Compiled graphs are shared between callers; nodes must not keep per-request
+state on ``self``.
+"""
+
+import hashlib
+import inspect
+from typing import Any
+
+from langchain_core.messages import BaseMessage
+from langchain_core.tools import BaseTool
+from langgraph.graph.state import CompiledStateGraph
+
+from assistant_core.cache import LRUCache, freeze
+
+from .base import BaseBuilder, BaseDirector
+from .context import BuilderContext
+
+DEFAULT_MAX_GRAPHS = 64
+
+
+def describe(value: Any, anchors: list | None = None) -> Any:
+    """Return a hashable, repr-stable description of a builder attribute.
+
+    Objects described by identity are appended to ``anchors``; keep them
+    alive as long as the description is used as a key.
+    """
+    if value is None or isinstance(value, (str, int, float, bool, bytes)):
+        return value
+    if isinstance(value, BaseTool):
+        # Same schema does not mean same implementation (closure, backend)
+        return ("tool", value.name, _identity(value, anchors))
+    if isinstance(value, BaseMessage):
+        return (type(value).__name__, freeze(value.content))
+    if isinstance(value, dict):
+        return tuple(sorted((str(k), describe(v, anchors)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(describe(v, anchors) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted(repr(describe(v, anchors)) for v in value))
+    if isinstance(value, BaseBuilder):
+        return (_qualname(type(value)), describe(vars(value), anchors))
+    if inspect.isfunction(value) or inspect.ismethod(value):
+        # Functions are compared by identity: a new lambda is a new graph
+        return ("callable", value.__module__, value.__qualname__) + _identity(
+            value, anchors
+        )
+    if type(value).__repr__ is object.__repr__:
+        return _identity(value, anchors)
+    return (_qualname(type(value)), repr(value))
+
+
+def fingerprint(
+    director: BaseDirector, context: BuilderContext, anchors: list | None = None
+) -> str:
+    """Return a stable fingerprint of what ``director.make(context)`` builds.
+
+    Only the inputs of the build are read, no context component is created.
+    """
+    factory = context._factory
+    parts = [
+        _qualname(type(director)),
+        describe(getattr(director, "agent_builder", None), anchors),
+        tuple(
+            (_qualname(type(builder)), describe(vars(builder), anchors))
+            for builder in director.builders
+        ),
+        _qualname(type(context)),
+        freeze(factory.config),
+        describe(
+            [
+                factory._agent_factory,
+                factory._graph_factory,
+                factory._model_factory,
+                factory._resolver_factory,
+                factory._base_tools_factory,
+                factory._model_registry,
+            ],
+            anchors,
+        ),
+        describe(getattr(context, "entrypoint_mapping", None), anchors),
+    ]
+    created = context.construction_stats["created"]
+    for name in context.materialized:
+        if name == "tools":
+            # The list may have been changed in place after its creation
+            parts.append((name, describe(context.tools, anchors)))
+        elif name not in created:
+            # Assigned by the caller rather than built by the factory
+            parts.append((name, _identity(getattr(context, name), anchors)))
+    return hashlib.sha256(repr(parts).encode()).hexdigest()
+
+
+class GraphCache:
+    """LRU/TTL cache of compiled graphs.
+
+    Use one instance per tenant to size and monitor it independently.
+    """
+
+    def __init__(
+        self, max_size: int | None = DEFAULT_MAX_GRAPHS, ttl: float | None = None
+    ):
+        self._graphs = LRUCache(max_size=max_size, ttl=ttl)
+
+    def __len__(self) -> int:
+        return len(self._graphs)
+
+    @property
+    def hits(self) -> int:
+        return self._graphs.hits
+
+    @property
+    def misses(self) -> int:
+        return self._graphs.misses
+
+    def compile(
+        self, director: BaseDirector, context: BuilderContext, **compile_kwargs
+    ) -> CompiledStateGraph:
+        """Return the compiled graph for the director and context.
+
+        ``compile_kwargs`` (checkpointer, store, ...) are forwarded to
+        ``StateGraph.compile`` and are part of the cache key by identity.
+        """
+        anchors = []
+        key = (fingerprint(director, context, anchors), freeze(compile_kwargs))
+        entry = self._graphs.get(key)
+        if entry is None:
+            entry = director.make(context).compile(**compile_kwargs), anchors
+            self._graphs.set(key, entry)
+        return entry[0]
+
+    def stats(self) -> dict[str, int]:
+        return self._graphs.stats()
+
+    def clear(self) -> None:
+        self._graphs.clear()
+
+
+def _identity(value: Any, anchors: list | None) -> tuple[str, int]:
+    if anchors is not None:
+        anchors.append(value)
+    return _qualname(type(value)), id(value)
+
+
+def _qualname(cls: type) -> str:
+    return f"{cls.__module__}.{cls.__qualname__}"
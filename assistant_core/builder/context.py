@@ -1,5 +1,5 @@
 import warnings
-from typing import Callable, Self
+from typing import Any, Callable, Self
 
 from assistant_core.factories import (
     AgentFactory,
@@ -10,13 +10,53 @@ from assistant_core.factories import (
     ResolverFactory,
 )
 
+COMPONENTS = ("model", "graph_builder", "agent_node", "resolver_node", "tools")
+
+
+class _Component:
+    """Context attribute created through the context factory on first access."""
+
+    def __init__(self, create: Callable[[ContextFactory], Any]):
+        self.create = create
+
+    def __set_name__(self, owner, name):
+        self.name = name
+        self.attr = f"_{name}"
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        try:
+            return obj.__dict__[self.attr]
+        except KeyError:
+            value = self.create(obj._factory)
+            obj.__dict__[self.attr] = value
+            obj._created.append(self.name)
+            return value
+
+    def __set__(self, obj, value):
+        obj.__dict__[self.attr] = value
+
 
 class BuilderContext:
+    model = _Component(lambda factory: factory.model)
+    graph_builder = _Component(lambda factory: factory.create_graph_builder())
+    agent_node = _Component(lambda factory: factory.create_agent_node())
+    resolver_node = _Component(lambda factory: factory.create_resolver_node())
+    tools = _Component(lambda factory: factory.create_base_tools())
+
     def __init__(
         self,
         context_factory: ContextFactory = None,
         agent_factory: ContextFactory = None,
+        *,
+        lazy: bool = False,
     ):
+        """Create the assembly context.
+
+        With ``lazy=True`` the model, graph builder, nodes and tools are only
+        created by the factory when first accessed.
+        """
         if context_factory is None:
             if agent_factory is None:
                 raise ValueError("context_factory must be provided")
@@ -30,15 +70,36 @@ class BuilderContext:
 
         # Keep a reference to enable cloning/customization
         self._factory = context_factory
+        self._lazy = lazy
+        self._created: list[str] = []
 
-        self.model = context_factory.model
-        self.graph_builder = context_factory.create_graph_builder()
-        self.agent_node = context_factory.create_agent_node()
-        self.resolver_node = context_factory.create_resolver_node()
-        self.tools = context_factory.create_base_tools()
+        if not lazy:
+            for name in COMPONENTS:
+                getattr(self, name)
 
         self._entrypoint = None
 
+    @property
+    def context_factory(self) -> ContextFactory:
+        """The factory components are created with (config, model registry)."""
+        return self._factory
+
+    @property
+    def materialized(self) -> tuple[str, ...]:
+        """Names of the components created so far."""
+        return tuple(name for name in COMPONENTS if f"_{name}" in self.__dict__)
+
+    @property
+    def construction_stats(self) -> dict[str, tuple[str, ...]]:
+        """Components this context built through its factory and those avoided.
+
+        Only lazy contexts can avoid constructing a component.
+        """
+        return {
+            "created": tuple(self._created),
+            "avoided": tuple(name for name in COMPONENTS if name not in self._created),
+        }
+
     @property
     def entrypoint(self):
         return self._entrypoint or self.agent_node.name
@@ -64,6 +125,7 @@ class BuilderContext:
         model_factory: ModelFactory = None,
         resolver_factory: ResolverFactory = None,
         base_tools_factory: BaseToolsFactory = None,
+        lazy: bool = False,
     ) -> Self:
         """Create a BuilderContext with a custom ContextFactory."""
         factory = ContextFactory(
@@ -74,7 +136,7 @@ class BuilderContext:
             resolver_factory=resolver_factory,
             base_tools_factory=base_tools_factory,
         )
-        return cls(factory)
+        return cls(factory, lazy=lazy)
 
     def clone(
         self,
@@ -85,7 +147,12 @@ class BuilderContext:
         resolver_factory: ResolverFactory = None,
         base_tools_factory: BaseToolsFactory = None,
     ) -> Self:
-        """Clone the context with optional overrides for component factories."""
+        """Clone the context with optional overrides for component factories.
+
+        The clone keeps the lazy mode of the original. Unless
+        ``model_factory`` is overridden it gets the same pooled model from the
+        model registry.
+        """
         new_factory = self._factory.clone(
             agent_factory=agent_factory,
             graph_factory=graph_factory,
@@ -94,14 +161,14 @@ class BuilderContext:
             base_tools_factory=base_tools_factory,
         )
 
-        return self.__class__(new_factory)
+        return self.__class__(new_factory, lazy=self._lazy)
 
 
 class MultiAgentContext(BuilderContext):
     """Context for multi-agent workflows with conditional entrypoint selection."""
 
-    def __init__(self, context_factory: ContextFactory):
-        super().__init__(context_factory)
+    def __init__(self, context_factory: ContextFactory, *, lazy: bool = False):
+        super().__init__(context_factory, lazy=lazy)
         self.entrypoint_mapping: dict[str, str] = {}
 
     def conditional_entrypoint_factory(self) -> Callable[[dict], str]:
@@ -44,20 +44,26 @@ class DateTimeNode(DataNode):
     async def __call__(self, state, config):
         """Return the prompt with the current date and time."""
         prompt = get_current_date_prompt(self.TZ)
-        return {"messages": [self.system_message(prompt)]}
+        return self.context_update([self.system_message(prompt)])
 
 
 class DateTimeBuilder(BaseBuilder):
     """Builder for the date and time node."""
 
-    def __init__(self, TZ: ZoneInfo = UTC):
-        """Initialize the builder."""
+    def __init__(self, TZ: ZoneInfo = UTC, ephemeral: bool = False):
+        """Initialize the builder.
+
+        With ``ephemeral=True`` the prompt is written to the ephemeral context
+        channel (the graph must use ``EphemeralContextState``) instead of
+        being appended to the thread history on every turn.
+        """
         super().__init__()
         self.TZ = TZ
+        self.ephemeral = ephemeral
 
     def build(self, context):
         """Build the date and time node."""
-        date_time_node = DateTimeNode(TZ=self.TZ)
+        date_time_node = DateTimeNode(TZ=self.TZ, ephemeral=self.ephemeral)
 
         context.graph_builder.add_node(
             date_time_node.name,
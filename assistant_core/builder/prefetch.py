@@ -0,0 +1,142 @@
+"""This builder adds a node that prefetches store keys before the agent runs.
+
+Tools that read tenant or thread keys from the store one ``aget`` at a time
+pay a round trip each while the user waits for the reply. The prefetch node
+reads every declared key with a single ``abatch`` call at the start of the
+turn and puts the values in the ``prefetched`` channel of ``PrefetchState``.
+
+Namespaces are templates formatted with the ``configurable`` values of the
+run (``thread_id``, ``organization_id``, ...) and the state values::
+
+    StorePrefetchBuilder(
+        {
+            "available_options": (("{organization_id}",), "available_options"),
+            "active_item": (("{thread_id}", "todos"), "active_item"),
+        }
+    )
+
+When the run uses a ``CachedStore`` the fetched items are also cached, so
+tools reading the same keys with ``get_store(config)`` do no round trip.
+"""
+
+import logging
+from typing import Any
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.store.base import GetOp
+
+from assistant_core.builder import BaseBuilder, BuilderContext
+from assistant_core.nodes import BaseNode
+from assistant_core.nodes.mixins import UsesSystemMessage, WritesContext
+from assistant_core.state import PREFETCH_KEY
+from assistant_core.store import get_store
+
+_logger = logging.getLogger(__name__)
+
+StoreKeys = dict[str, tuple[tuple[str, ...], str]]
+
+
+class StorePrefetchNode(BaseNode, WritesContext, UsesSystemMessage):
+    """Reads the declared store keys in one batch."""
+
+    def __init__(
+        self,
+        keys: StoreKeys,
+        name: str = "store_prefetch_node",
+        prompt: str | None = None,
+        *args,
+        **kwargs,
+    ):
+        """Initialize the node.
+
+        ``prompt`` is an optional template formatted with the prefetched
+        values and published as a system message for the agent. Placeholders
+        without a value (unknown names, keys that were skipped or whose read
+        failed) are left empty.
+        """
+        super().__init__(name, *args, **kwargs)
+        self.keys = keys
+        self.prompt = prompt
+
+    @property
+    def writes_context(self) -> bool:
+        return self.ephemeral and self.prompt is not None
+
+    def resolve(self, state: dict, config: RunnableConfig) -> dict[str, GetOp]:
+        """Return the ``GetOp`` of every key whose template can be formatted."""
+        values = {
+            **{k: v for k, v in (state or {}).items() if isinstance(v, str)},
+            **((config or {}).get("configurable") or {}),
+        }
+        ops = {}
+        for name, (namespace, key) in self.keys.items():
+            try:
+                ops[name] = GetOp(
+                    tuple(part.format_map(values) for part in namespace), key
+                )
+            except KeyError as exc:
+                _logger.debug("%s: skipping %s, missing %s", self.name, name, exc)
+        return ops
+
+    async def __call__(self, state: dict, config: RunnableConfig) -> dict:
+        prefetched: dict[str, Any] = dict.fromkeys(self.keys)
+        store = get_store(config)
+        ops = self.resolve(state, config)
+        if store is None:
+            _logger.warning("%s: the graph has no store", self.name)
+        elif ops:
+            try:
+                items = await store.abatch(list(ops.values()))
+            except Exception:
+                # Tools can still read the keys, the turn goes on
+                _logger.warning("%s: prefetch failed", self.name, exc_info=True)
+                items = []
+            for name, item in zip(ops, items):
+                prefetched[name] = item.value if item else None
+
+        update = {PREFETCH_KEY: prefetched}
+        if self.prompt is not None:
+            prompt = self.prompt.format_map(_PromptValues(self.name, prefetched))
+            update.update(self.context_update([self.system_message(prompt)]))
+        return update
+
+
+class _PromptValues(dict):
+    """Prompt values where missing placeholders format as an empty string."""
+
+    def __init__(self, node: str, values: dict[str, Any]):
+        super().__init__(values)
+        self.node = node
+
+    def __missing__(self, key: str) -> str:
+        _logger.debug("%s: no value for prompt placeholder %s", self.node, key)
+        return ""
+
+
+class StorePrefetchBuilder(BaseBuilder):
+    """Builder for the store prefetch node.
+
+    The graph must use ``PrefetchState`` (or a state with a ``prefetched``
+    channel) and be compiled with a store.
+    """
+
+    def __init__(
+        self, keys: StoreKeys, prompt: str | None = None, ephemeral: bool = True
+    ):
+        super().__init__()
+        self.keys = keys
+        self.prompt = prompt
+        self.ephemeral = ephemeral
+
+    def build(self, context: BuilderContext):
+        """Build the prefetch node and add it to the entrypoint chain."""
+        prefetch_node = StorePrefetchNode(
+            self.keys, prompt=self.prompt, ephemeral=self.ephemeral
+        )
+
+        context.graph_builder.add_node(
+            prefetch_node.name,
+            prefetch_node,
+        )
+
+        context.entrypoint = prefetch_node.name
@@ -0,0 +1,27 @@
+"""This builder adds a semantic answer cache to the agent.
+
+Near-duplicate questions ("what's your refund policy" and "how do refunds
+work") are answered from a ``SemanticCache`` of previous final answers,
+scoped per tenant (``configurable["organization_id"]`` by default) and per
+prompt version, without calling the model or running tools.
+
+Share one cache between builds so answers survive graph rebuilds::
+
+    cache = SemanticCache(embeddings, threshold=0.9, ttl=3600)
+    director.add_builder(SemanticCacheBuilder(cache))
+"""
+
+from assistant_core.builder import BaseBuilder, BuilderContext
+from assistant_core.nodes.semantic_cache import SemanticCache
+
+
+class SemanticCacheBuilder(BaseBuilder):
+    """Builder that attaches a semantic cache to the context agent."""
+
+    def __init__(self, cache: SemanticCache):
+        super().__init__()
+        self.cache = cache
+
+    def build(self, context: BuilderContext):
+        """Attach the cache to the agent node."""
+        context.agent_node.semantic_cache = self.cache
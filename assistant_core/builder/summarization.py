@@ -0,0 +1,296 @@
+"""This builder adds a node that compacts older turns into a rolling summary.
+
+Once the conversation exceeds ``max_tokens`` the messages before the most
+recent ``keep_tokens`` are summarized by a (cheap) model and removed from the
+state. The summary is kept as a single system message at the start of the
+thread and folded into the next summary.
+
+With ``background=True`` the builder adds a deferred node that runs once
+the reply is complete and starts the summary in a task; the summary is
+applied at the start of the next turn, so the summarization call never
+delays or competes with a reply. Pending summaries are kept for at most
+``max_threads`` threads.
+
+The model defaults to ``GPT_5_NANO``. The usage of summary calls is returned
+under the ``usage`` channel (see ``UsageState``) when a tracker is set.
+"""
+
+import asyncio
+import functools
+import logging
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import (
+    BaseMessage,
+    HumanMessage,
+    RemoveMessage,
+    SystemMessage,
+    get_buffer_string,
+)
+from langchain_core.runnables import RunnableConfig
+from langgraph.constants import TAG_NOSTREAM
+from langgraph.graph.message import REMOVE_ALL_MESSAGES
+
+from assistant_core.builder import BaseBuilder, BuilderContext
+from assistant_core.cache import LRUCache
+from assistant_core.models import GPT_5_NANO, load_summary_model
+from assistant_core.nodes import BaseNode
+from assistant_core.nodes.history import (
+    DEFAULT_MAX_COUNTED_MESSAGES,
+    TokenBudget,
+    TokenCounter,
+)
+from assistant_core.nodes.mixins import UsesModel
+from assistant_core.state import USAGE_KEY
+from assistant_core.usage import UsageRecord
+
+_logger = logging.getLogger(__name__)
+
+SUMMARY_MESSAGE_ID = "conversation_summary"
+SUMMARY_PREFIX = "Summary of the earlier conversation:\n"
+SUMMARY_PROMPT = (
+    "Summarize the conversation below for an assistant that will continue it. "
+    "Keep facts, decisions, user preferences, open questions and tool results "
+    "that may be needed later. Be concise. Answer with the summary only."
+)
+DEFAULT_MAX_TOKENS = 8000
+DEFAULT_KEEP_TOKENS = 2000
+DEFAULT_MAX_THREADS = 10_000
+
+
+def is_summary(message: BaseMessage) -> bool:
+    return message.id == SUMMARY_MESSAGE_ID
+
+
+class SummarizationNode(BaseNode, UsesModel):
+    """Replaces older messages with a rolling summary."""
+
+    def __init__(
+        self,
+        name: str = "summarization_node",
+        *args,
+        max_tokens: int = DEFAULT_MAX_TOKENS,
+        keep_tokens: int = DEFAULT_KEEP_TOKENS,
+        background: bool = False,
+        token_counter: TokenCounter | None = None,
+        max_counted_messages: int | None = DEFAULT_MAX_COUNTED_MESSAGES,
+        prompt: str = SUMMARY_PROMPT,
+        max_threads: int | None = DEFAULT_MAX_THREADS,
+        **kwargs,
+    ):
+        if keep_tokens >= max_tokens:
+            raise ValueError("keep_tokens must be lower than max_tokens.")
+        super().__init__(name, *args, **kwargs)
+        self.max_tokens = max_tokens
+        self.token_counter = token_counter or TokenCounter(
+            max_size=max_counted_messages
+        )
+        self.keep = TokenBudget(keep_tokens, token_counter=self.token_counter)
+        self.background = background
+        self.prompt = prompt
+        # Evicted threads lose their pending summary, it is recomputed later
+        self._pending = LRUCache(
+            max_size=max_threads, on_evict=lambda _, task: task.cancel()
+        )
+
+    async def __call__(self, state: dict, config: RunnableConfig) -> dict:
+        messages = state["messages"]
+        thread_id = (config or {}).get("configurable", {}).get("thread_id")
+        if self.background and thread_id is not None:
+            return self._background_update(thread_id, messages)
+
+        older = self.select_older(messages)
+        if not older:
+            return {}
+        summary, usage = await self._summarize(older, config)
+        return self.summary_update(messages, older, summary, usage)
+
+    async def schedule(self, state: dict, config: RunnableConfig) -> dict:
+        """Start the background summary of the thread, after the reply.
+
+        Added by ``SummarizationBuilder`` as a deferred node. A thread with a
+        summary in progress or not applied yet is skipped.
+        """
+        configurable = (config or {}).get("configurable") or {}
+        thread_id = configurable.get("thread_id")
+        if thread_id is None or thread_id in self._pending:
+            return {}
+        older = self.select_older(state["messages"])
+        if older:
+            task = asyncio.create_task(self._run(older, _background_config(config)))
+            task.add_done_callback(functools.partial(self._finished, thread_id))
+            self._pending.set(thread_id, task)
+        return {}
+
+    def select_older(self, messages: list[BaseMessage]) -> list[BaseMessage]:
+        """Return the messages to summarize, empty while under the threshold.
+
+        The current summary is included first so it is folded into the new one.
+        """
+        total = sum(self.token_counter(message) for message in messages)
+        if total <= self.max_tokens:
+            return []
+        recent = self.keep.select(messages)
+        return messages[: len(messages) - len(recent)]
+
+    async def summarize(
+        self, messages: list[BaseMessage], config: RunnableConfig = None
+    ) -> str:
+        summary, _ = await self._summarize(messages, config)
+        return summary
+
+    async def _summarize(
+        self, messages: list[BaseMessage], config: RunnableConfig = None
+    ) -> tuple[str, UsageRecord | None]:
+        transcript = get_buffer_string(
+            [
+                (
+                    HumanMessage(m.content.removeprefix(SUMMARY_PREFIX))
+                    if is_summary(m)
+                    else m
+                )
+                for m in messages
+            ]
+        )
+        response, usage = await self.ainvoke_model_with_usage(
+            [SystemMessage(self.prompt), HumanMessage(transcript)],
+            config=config,
+            agent=self.name,
+        )
+        return response.text, usage
+
+    def summary_update(
+        self,
+        messages: list[BaseMessage],
+        older: list[BaseMessage],
+        summary: str,
+        usage: UsageRecord | None = None,
+    ) -> dict:
+        """Return the state update replacing ``older`` with ``summary``.
+
+        Messages added since ``older`` was selected are kept.
+        """
+        removed = {message.id for message in older}
+        kept = [
+            message
+            for message in messages
+            if message.id not in removed and not is_summary(message)
+        ]
+        summary_message = SystemMessage(SUMMARY_PREFIX + summary, id=SUMMARY_MESSAGE_ID)
+        _logger.debug("%s: summarized %s messages", self.name, len(older))
+        update = {
+            "messages": [
+                RemoveMessage(id=REMOVE_ALL_MESSAGES),
+                summary_message,
+                *kept,
+            ]
+        }
+        if usage is not None:
+            # Kept by graphs whose state has the channel (UsageState)
+            update[USAGE_KEY] = {self.name: usage.totals()}
+        return update
+
+    def _background_update(self, thread_id: str, messages: list[BaseMessage]) -> dict:
+        task = self._pending.get(thread_id)
+        if task is None or not task.done():
+            return {}
+        self._pending.pop(thread_id)
+        if task.cancelled() or task.exception() is not None:
+            # Logged by _finished
+            return {}
+        older, summary, usage = task.result()
+        return self.summary_update(messages, older, summary, usage)
+
+    def _finished(self, thread_id: str, task: asyncio.Task) -> None:
+        if task.cancelled() or task.exception() is not None:
+            if self._pending.get(thread_id) is task:
+                self._pending.pop(thread_id)
+            if not task.cancelled():
+                _logger.warning(
+                    "%s: background summarization failed",
+                    self.name,
+                    exc_info=task.exception(),
+                )
+
+    async def _run(
+        self, older: list[BaseMessage], config: RunnableConfig
+    ) -> tuple[list, str, UsageRecord | None]:
+        return older, *await self._summarize(older, config)
+
+
+def _background_config(config: RunnableConfig) -> RunnableConfig:
+    """Config of a summary call that outlives the graph run.
+
+    Keeps the callbacks (tracing), tags, metadata and thread id, without the
+    graph internals, and is excluded from ``stream_mode="messages"``.
+    """
+    config = config or {}
+    return {
+        "callbacks": config.get("callbacks"),
+        "tags": [*(config.get("tags") or []), TAG_NOSTREAM],
+        "metadata": dict(config.get("metadata") or {}),
+        "configurable": {
+            "thread_id": (config.get("configurable") or {}).get("thread_id")
+        },
+    }
+
+
+class SummarizationBuilder(BaseBuilder):
+    """Builder for the summarization node.
+
+    ``model`` should be a cheap model; ``GPT_5_NANO`` is used when omitted.
+    """
+
+    def __init__(
+        self,
+        model: BaseChatModel | None = None,
+        max_tokens: int = DEFAULT_MAX_TOKENS,
+        keep_tokens: int = DEFAULT_KEEP_TOKENS,
+        background: bool = False,
+        **kwargs,
+    ):
+        super().__init__()
+        self.model = model
+        self.max_tokens = max_tokens
+        self.keep_tokens = keep_tokens
+        self.background = background
+        self.kwargs = kwargs
+
+    def build(self, context: BuilderContext):
+        """Build the summarization node and add it to the entrypoint chain.
+
+        In background mode a deferred ``<name>_schedule`` node, which runs
+        after the reply, starts the summary of the thread.
+        """
+        summarization_node = SummarizationNode(
+            model=self.model or default_summary_model(context),
+            max_tokens=self.max_tokens,
+            keep_tokens=self.keep_tokens,
+            background=self.background,
+            **self.kwargs,
+        )
+
+        context.graph_builder.add_node(
+            summarization_node.name,
+            summarization_node,
+        )
+        if self.background:
+            schedule_name = f"{summarization_node.name}_schedule"
+            context.graph_builder.add_node(
+                schedule_name, summarization_node.schedule, defer=True
+            )
+            context.graph_builder.add_edge(summarization_node.name, schedule_name)
+
+        context.entrypoint = summarization_node.name
+
+
+def default_summary_model(context: BuilderContext) -> BaseChatModel:
+    """Return the ``GPT_5_NANO`` model pooled in the context's model registry."""
+    factory = context.context_factory
+    config = factory.config
+    return factory.model_registry.get(
+        load_summary_model,
+        config,
+        lambda: load_summary_model(config["OPENAI_API_KEY"]),
+        model_name=GPT_5_NANO,
+    )
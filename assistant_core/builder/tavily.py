@@ -19,6 +19,11 @@ Contract (inputs/outputs):
 - get_tavily_tool(tavily_api_key: str, max_results: int, **kwargs) -> TavilySearch
 - TavilyBuilder.build(context: BuilderContext) -> None
     - side-effect: appends the created tool to `context.tools`
+    - when a `ToolResultCache` is given, the tool is wrapped in a
+        `CachedTool` so identical searches (same tool configuration,
+        normalized query and parameters) are served from the cache and
+        concurrent identical searches share one API call. Error results
+        are not cached.
 
 Error handling / edge cases:
 - If no API key is available the builder raises ``BuilderError``. This
@@ -30,6 +35,7 @@ Error handling / edge cases:
 from langchain_tavily import TavilySearch
 
 from assistant_core.builder import BaseBuilder, BuilderContext
+from assistant_core.tools import CachedTool, ToolResultCache
 
 
 def get_tavily_tool(*, tavily_api_key, max_results=2, **kwargs):
@@ -60,10 +66,14 @@ class TavilyBuilder(BaseBuilder):
     provided `BuilderContext` during `build`.
     """
 
-    def __init__(self, tavily_api_key: str, **kwargs):
+    def __init__(
+        self, tavily_api_key: str, cache: ToolResultCache | None = None, **kwargs
+    ):
         super().__init__()
         # prefer explicit key passed to constructor; fall back to settings
         self.tavily_api_key = tavily_api_key
+        # optional result cache, share one instance across builds
+        self.cache = cache
         # additional keyword arguments forwarded to TavilySearch
         self.kwargs = kwargs
 
@@ -76,4 +86,6 @@ class TavilyBuilder(BaseBuilder):
         """
 
         tavily_tool = get_tavily_tool(tavily_api_key=self.tavily_api_key, **self.kwargs)
+        if self.cache is not None:
+            tavily_tool = CachedTool.wrap(tavily_tool, self.cache)
         context.tools.append(tavily_tool)
@@ -0,0 +1,147 @@
+"""Compact serializer for LangGraph checkpointers.
+
+``CompactSerializer`` wraps the default msgpack serializer and makes
+``MessagesState`` checkpoints smaller:
+
+- repeated system prompts in a message list (for example the same prompt
+  appended every turn by a ``PromptNode``) are stored once and restored on
+  load;
+- payloads above ``min_size`` are compressed with zlib (default) or zstd.
+
+The codec is appended to the serialization type (``msgpack:compact.zlib``),
+so checkpoints written by the wrapped serializer keep loading. The separator
+is not ``+``, so ``EncryptedSerializer(cipher, CompactSerializer())``
+compresses before encrypting.
+
+Usage::
+
+    MemorySaver(serde=CompactSerializer(compression="zstd"))
+
+zstd needs the ``zstandard`` package (the ``zstd`` extra:
+``pip install assistant-core[zstd]``).
+"""
+
+import zlib
+from typing import Any
+
+import ormsgpack
+from langchain_core.messages import SystemMessage
+from langgraph.checkpoint.serde.base import SerializerProtocol
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+SEPARATOR = ":"
+COMPACT_TAG = "compact"
+DEDUP_TAG = "dedup"
+RAW = "raw"
+COMPRESSIONS = (None, "zlib", "zstd")
+DEFAULT_LEVELS = {"zlib": 6, "zstd": 3}
+DEFAULT_MIN_SIZE = 512
+DEFAULT_MIN_DEDUP_LENGTH = 64
+
+
+def _zstd():
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError(
+            "zstandard is not installed. Please install it with "
+            "`pip install zstandard`."
+        ) from None
+    return zstandard
+
+
+def compress(codec: str, data: bytes, level: int) -> bytes:
+    if codec == "zlib":
+        return zlib.compress(data, level)
+    if codec == "zstd":
+        return _zstd().compress(data, level)
+    return data
+
+
+def decompress(codec: str, data: bytes) -> bytes:
+    if codec == "zlib":
+        return zlib.decompress(data)
+    if codec == "zstd":
+        return _zstd().decompress(data)
+    if codec == RAW:
+        return data
+    raise ValueError(f"Unknown compression: {codec}")
+
+
+class CompactSerializer(SerializerProtocol):
+    """Checkpoint serializer with prompt deduplication and compression."""
+
+    def __init__(
+        self,
+        serde: SerializerProtocol | None = None,
+        *,
+        compression: str | None = "zlib",
+        level: int | None = None,
+        min_size: int = DEFAULT_MIN_SIZE,
+        dedup: bool = True,
+        min_dedup_length: int = DEFAULT_MIN_DEDUP_LENGTH,
+    ):
+        if compression not in COMPRESSIONS:
+            raise ValueError(f"compression must be one of {COMPRESSIONS}.")
+        if compression == "zstd":
+            _zstd()
+        self.serde = serde or JsonPlusSerializer()
+        self.compression = compression
+        self.level = level if level is not None else DEFAULT_LEVELS.get(compression)
+        self.min_size = min_size
+        self.dedup = dedup
+        self.min_dedup_length = min_dedup_length
+
+    def dumps_typed(self, obj: Any) -> tuple[str, bytes]:
+        refs = []
+        if self.dedup and isinstance(obj, list):
+            obj, refs = self._deduplicate(obj)
+        typ, data = self.serde.dumps_typed(obj)
+        if refs:
+            data = ormsgpack.packb([refs, data])
+
+        codec = RAW
+        if self.compression and len(data) >= self.min_size:
+            codec = self.compression
+            data = compress(codec, data, self.level)
+        if codec == RAW and not refs:
+            return typ, data
+        tags = [COMPACT_TAG, codec] + ([DEDUP_TAG] if refs else [])
+        return f"{typ}{SEPARATOR}{'.'.join(tags)}", data
+
+    def loads_typed(self, data: tuple[str, bytes]) -> Any:
+        typ, payload = data
+        if SEPARATOR not in typ:
+            return self.serde.loads_typed(data)
+        inner, suffix = typ.rsplit(SEPARATOR, 1)
+        tags = suffix.split(".")
+        if tags[0] != COMPACT_TAG:
+            return self.serde.loads_typed(data)
+
+        payload = decompress(tags[1], payload)
+        refs = []
+        if DEDUP_TAG in tags[2:]:
+            refs, payload = ormsgpack.unpackb(payload)
+        obj = self.serde.loads_typed((inner, payload))
+        for index, source in refs:
+            obj[index].content = obj[source].content
+        return obj
+
+    def _deduplicate(self, values: list) -> tuple[list, list[list[int]]]:
+        """Blank repeated system prompts, returning ``[index, source]`` refs."""
+        first: dict[str, int] = {}
+        refs = []
+        result = values
+        for index, value in enumerate(values):
+            if not isinstance(value, SystemMessage):
+                continue
+            content = value.content
+            if not isinstance(content, str) or len(content) < self.min_dedup_length:
+                continue
+            source = first.setdefault(content, index)
+            if source != index:
+                if result is values:
+                    result = list(values)
+                result[index] = value.model_copy(update={"content": ""})
+                refs.append([index, source])
+        return result, refs
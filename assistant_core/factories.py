@@ -1,18 +1,23 @@
 import warnings
-from typing import Callable, Self, TypedDict
+from typing import TYPE_CHECKING, Callable, Self, TypedDict
 
-from langchain_core.language_models.chat_models import BaseChatModel
-from langchain_core.tools import BaseTool
-from langgraph.graph import MessagesState, StateGraph
+from assistant_core.models import DEFAULT_MODEL, load_default_model
+from assistant_core.registry import ModelRegistry, get_model_registry
 
-from assistant_core.models import load_default_model
-from assistant_core.nodes import AgentNode, ResolverNode
+if TYPE_CHECKING:
+    from langchain_core.language_models.chat_models import BaseChatModel
+    from langchain_core.tools import BaseTool
+    from langgraph.graph import StateGraph
 
-AgentFactory = Callable[[BaseChatModel], AgentNode] | None
-GraphFactory = Callable[[], StateGraph] | None
-ModelFactory = Callable[["ContextFactory.FactoryConfig"], BaseChatModel] | None
-ResolverFactory = Callable[[], ResolverNode] | None
-BaseToolsFactory = Callable[[], list[BaseTool]] | None
+    from assistant_core.nodes import AgentNode, ResolverNode
+
+# Third-party types are forward references so importing this module does not
+# load langchain/langgraph until a component is created.
+AgentFactory = Callable[["BaseChatModel"], "AgentNode"] | None
+GraphFactory = Callable[[], "StateGraph"] | None
+ModelFactory = Callable[["ContextFactory.FactoryConfig"], "BaseChatModel"] | None
+ResolverFactory = Callable[[], "ResolverNode"] | None
+BaseToolsFactory = Callable[[], list["BaseTool"]] | None
 
 
 class ContextFactory:
@@ -28,8 +33,10 @@ class ContextFactory:
         model_factory: ModelFactory = None,
         resolver_factory: ResolverFactory = None,
         base_tools_factory: BaseToolsFactory = None,
+        model_registry: ModelRegistry | None = None,
     ):
-        self._model: BaseChatModel | None = None
+        self._model: "BaseChatModel | None" = None
+        self._model_registry = model_registry
         self.config = config
         self._agent_factory = agent_factory
         self._graph_factory = graph_factory
@@ -61,30 +68,46 @@ class ContextFactory:
             model_factory=model_factory,
             resolver_factory=resolver_factory,
             base_tools_factory=base_tools_factory,
+            model_registry=self._model_registry,
         )
-
         return new_factory
 
     @property
-    def model(self) -> BaseChatModel:
+    def model_registry(self) -> ModelRegistry:
+        """The registry this factory pools models in (the global by default)."""
+        if self._model_registry is None:
+            return get_model_registry()
+        return self._model_registry
+
+    @property
+    def model(self) -> "BaseChatModel":
         """
         Get the model instance.
-        If not already created, it will create one using the factory method.
+        If not already created, it will be taken from the model registry,
+        which shares one instance per model factory and config across all
+        factories and clones.
         """
         if self._model is None:
-            self._model = self.create_model()
+            self._model = self.model_registry.get(
+                self._model_factory or type(self).create_model,
+                self.config,
+                self.create_model,
+                model_name=None if self._model_factory else DEFAULT_MODEL,
+            )
         return self._model
 
-    def create_graph_builder(self) -> StateGraph:
+    def create_graph_builder(self) -> "StateGraph":
         """
         Create a graph builder instance.
         """
         if self._graph_factory:
             return self._graph_factory()
 
+        from langgraph.graph import MessagesState, StateGraph
+
         return StateGraph(MessagesState)
 
-    def create_agent_node(self) -> AgentNode:
+    def create_agent_node(self) -> "AgentNode":
         """
         Create an agent instance.
         """
@@ -93,7 +116,7 @@ class ContextFactory:
 
         raise NotImplementedError("Agent factory must be provided")
 
-    def create_model(self) -> BaseChatModel:
+    def create_model(self) -> "BaseChatModel":
         """
         Create a model instance.
         """
@@ -102,16 +125,18 @@ class ContextFactory:
 
         return load_default_model(openai_api_key=self.config["OPENAI_API_KEY"])
 
-    def create_resolver_node(self) -> ResolverNode:
+    def create_resolver_node(self) -> "ResolverNode":
         """
         Create a resolver instance.
         """
         if self._resolver_factory:
             return self._resolver_factory()
 
+        from assistant_core.nodes import ResolverNode
+
         return ResolverNode(name="resolver")
 
-    def create_base_tools(self) -> list[BaseTool]:
+    def create_base_tools(self) -> list["BaseTool"]:
         """
         Create a set of base tools for the agent.
         """
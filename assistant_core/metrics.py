@@ -0,0 +1,253 @@
+"""Opt-in latency instrumentation of graph nodes.
+
+``NodeInstrumentation`` records, per node and agent, a latency histogram,
+call and error counts and an in-flight gauge. Once an instance is installed
+with ``set_instrumentation`` every ``BaseNode`` subclass reports to it; the
+agent label is the ``active_agent`` of the state (empty in single agent
+graphs). Without an instance nodes only pay one global lookup per call.
+
+The tool node wired by ``AgentBuilder`` is not a ``BaseNode``: when an
+instance is installed at build time each of its tool calls is recorded under
+the tool node name.
+
+Metrics are rendered in the Prometheus text format with ``prometheus_text``.
+With a ``tracer`` (``otel_tracer()`` for OpenTelemetry, an optional
+dependency) a span is opened per node call and exported by whatever the
+application configured, no collector is required.
+"""
+
+import contextlib
+import contextvars
+import functools
+import threading
+import time
+from typing import Any, Awaitable, Callable, Iterator
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+METRIC_PREFIX = "assistant_core_node"
+
+Labels = tuple[str, str]
+
+# Node whose call is being recorded, so super().__call__ is not counted twice
+_active_node: contextvars.ContextVar = contextvars.ContextVar(
+    "assistant_core_active_node", default=None
+)
+
+
+def otel_tracer(name: str = "assistant_core") -> Any:
+    """Return an OpenTelemetry tracer for ``NodeInstrumentation(tracer=...)``."""
+    try:
+        from opentelemetry import trace
+    except ImportError:
+        raise ImportError(
+            "opentelemetry-api is not installed. "
+            "Please install it with `pip install opentelemetry-api`."
+        ) from None
+    return trace.get_tracer(name)
+
+
+class _Series:
+    __slots__ = ("counts", "total", "calls", "errors", "in_flight", "max")
+
+    def __init__(self, buckets: int):
+        self.counts = [0] * buckets
+        self.total = 0.0
+        self.calls = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.max = 0.0
+
+
+class NodeInstrumentation:
+    """Per node and agent latency histograms, error counts and gauges."""
+
+    def __init__(
+        self,
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+        tracer: Any = None,
+        clock: Callable[[], float] = time.perf_counter,
+    ):
+        """Create the instrumentation.
+
+        :param buckets: Upper bounds (seconds) of the latency histogram.
+        :param tracer: Optional tracer with ``start_as_current_span``, such as
+            ``otel_tracer()``.
+        """
+        self.buckets = tuple(sorted(buckets))
+        self.tracer = tracer
+        self.clock = clock
+        self._series: dict[Labels, _Series] = {}
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def track(
+        self, node: str, agent: str = "", attributes: dict | None = None
+    ) -> Iterator[_Series]:
+        """Record one call of ``node`` around the ``with`` block.
+
+        Exceptions raised in the block count as errors, except LangGraph
+        control flow (interrupts and ``Command`` bubbling).
+        """
+        with self._lock:
+            series = self._series.get((node, agent))
+            if series is None:
+                series = self._series[node, agent] = _Series(len(self.buckets))
+            series.in_flight += 1
+        span = contextlib.nullcontext()
+        if self.tracer is not None:
+            span = self.tracer.start_as_current_span(
+                node,
+                attributes={
+                    "assistant_core.node": node,
+                    "assistant_core.agent": agent,
+                    **(attributes or {}),
+                },
+            )
+        start = self.clock()
+        try:
+            with span:
+                yield series
+        except Exception as exc:
+            if not _is_control_flow(exc):
+                with self._lock:
+                    series.errors += 1
+            raise
+        finally:
+            elapsed = self.clock() - start
+            with self._lock:
+                series.in_flight -= 1
+                series.calls += 1
+                series.total += elapsed
+                series.max = max(series.max, elapsed)
+                for i, bound in enumerate(self.buckets):
+                    if elapsed <= bound:
+                        series.counts[i] += 1
+                        break
+
+    def tool_call_wrapper(self, node: str, inner: Callable | None = None) -> Callable:
+        """Return a ``ToolNode`` ``awrap_tool_call`` recording calls as ``node``.
+
+        ``inner`` is an existing interceptor (for example a ``ToolExecutor``)
+        called inside the measurement.
+        """
+
+        async def wrapper(request, execute: Callable[..., Awaitable]):
+            state = getattr(request, "state", None)
+            name = request.tool_call["name"]
+            with self.track(node, _agent(state), {"assistant_core.tool": name}) as s:
+                if inner is None:
+                    result = await execute(request)
+                else:
+                    result = await inner(request, execute)
+                # ToolNode turns handled exceptions into error messages
+                if getattr(result, "status", None) == "error":
+                    with self._lock:
+                        s.errors += 1
+                return result
+
+        return wrapper
+
+    def stats(self) -> dict[Labels, dict[str, float]]:
+        """Return calls, errors, in-flight calls and timings per (node, agent)."""
+        with self._lock:
+            return {
+                labels: {
+                    "calls": series.calls,
+                    "errors": series.errors,
+                    "in_flight": series.in_flight,
+                    "total_time": series.total,
+                    "max_time": series.max,
+                }
+                for labels, series in self._series.items()
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+    def prometheus_text(self) -> str:
+        """Render the metrics in the Prometheus text exposition format."""
+        duration = f"{METRIC_PREFIX}_duration_seconds"
+        lines = [
+            f"# HELP {duration} Node call latency in seconds.",
+            f"# TYPE {duration} histogram",
+        ]
+        errors = [
+            f"# HELP {METRIC_PREFIX}_errors_total Failed node calls.",
+            f"# TYPE {METRIC_PREFIX}_errors_total counter",
+        ]
+        in_flight = [
+            f"# HELP {METRIC_PREFIX}_in_flight Node calls in progress.",
+            f"# TYPE {METRIC_PREFIX}_in_flight gauge",
+        ]
+        with self._lock:
+            for (node, agent), series in sorted(self._series.items()):
+                labels = f'node="{_escape(node)}",agent="{_escape(agent)}"'
+                cumulative = 0
+                for bound, count in zip(self.buckets, series.counts):
+                    cumulative += count
+                    lines.append(
+                        f'{duration}_bucket{{{labels},le="{bound:g}"}} {cumulative}'
+                    )
+                lines.append(f'{duration}_bucket{{{labels},le="+Inf"}} {series.calls}')
+                lines.append(f"{duration}_sum{{{labels}}} {series.total:.6f}")
+                lines.append(f"{duration}_count{{{labels}}} {series.calls}")
+                errors.append(
+                    f"{METRIC_PREFIX}_errors_total{{{labels}}} {series.errors}"
+                )
+                in_flight.append(
+                    f"{METRIC_PREFIX}_in_flight{{{labels}}} {series.in_flight}"
+                )
+        return "\n".join(lines + errors + in_flight) + "\n"
+
+
+def instrument(call: Callable[..., Awaitable]) -> Callable[..., Awaitable]:
+    """Wrap a node ``__call__`` so it reports to the installed instrumentation."""
+
+    @functools.wraps(call)
+    async def wrapper(self, state, *args, **kwargs):
+        instrumentation = _instrumentation
+        if instrumentation is None or _active_node.get() is self:
+            return await call(self, state, *args, **kwargs)
+        token = _active_node.set(self)
+        try:
+            with instrumentation.track(self.name, _agent(state)):
+                return await call(self, state, *args, **kwargs)
+        finally:
+            _active_node.reset(token)
+
+    return wrapper
+
+
+def _agent(state: Any) -> str:
+    getter = getattr(state, "get", None)
+    return (getter("active_agent") if getter else None) or ""
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _is_control_flow(exc: Exception) -> bool:
+    try:
+        from langgraph.errors import GraphBubbleUp
+    except ImportError:
+        return False
+    return isinstance(exc, GraphBubbleUp)
+
+
+_instrumentation: NodeInstrumentation | None = None
+
+
+def get_instrumentation() -> NodeInstrumentation | None:
+    """Return the process-wide node instrumentation, if any."""
+    return _instrumentation
+
+
+def set_instrumentation(
+    instrumentation: NodeInstrumentation | None,
+) -> NodeInstrumentation | None:
+    """Install the process-wide node instrumentation and return the previous."""
+    global _instrumentation
+    previous, _instrumentation = _instrumentation, instrumentation
+    return previous
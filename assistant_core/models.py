@@ -1,6 +1,8 @@
 import warnings
+from typing import TYPE_CHECKING
 
-from langchain_openai import ChatOpenAI
+if TYPE_CHECKING:
+    from langchain_openai import ChatOpenAI
 
 GPT_5_NANO = "gpt-5-nano"
 GPT_5_MINI = "gpt-5-mini"
@@ -8,10 +10,45 @@ GPT_5 = "gpt-5"
 
 DEFAULT_MODEL = GPT_5_NANO
 
+# List prices in USD per million tokens, used to estimate the cost of calls
+MODEL_COSTS: dict[str, dict[str, float]] = {
+    GPT_5_NANO: {"input": 0.05, "cached_input": 0.005, "output": 0.40},
+    GPT_5_MINI: {"input": 0.25, "cached_input": 0.025, "output": 2.00},
+    GPT_5: {"input": 1.25, "cached_input": 0.125, "output": 10.00},
+}
+
+
+def estimate_cost(
+    model_name: str | None,
+    input_tokens: int,
+    output_tokens: int,
+    cached_tokens: int = 0,
+) -> float | None:
+    """Return the estimated cost in USD of a call, or None for unknown models.
+
+    Dated snapshots (``gpt-5-mini-2025-08-07``) use the price of their base
+    model. Reasoning tokens are part of ``output_tokens``.
+    """
+    if not model_name:
+        return None
+    prices = MODEL_COSTS.get(model_name)
+    if prices is None:
+        # Longest matching base name, so gpt-5-mini-... is not priced as gpt-5
+        matches = [name for name in MODEL_COSTS if model_name.startswith(name + "-")]
+        if not matches:
+            return None
+        prices = MODEL_COSTS[max(matches, key=len)]
+    uncached = max(input_tokens - cached_tokens, 0)
+    return (
+        uncached * prices["input"]
+        + cached_tokens * prices["cached_input"]
+        + output_tokens * prices["output"]
+    ) / 1_000_000
+
 
 def load_openai_model(
     openai_api_key: str, model_name: str = DEFAULT_MODEL
-) -> ChatOpenAI:
+) -> "ChatOpenAI":
     warnings.warn(
         "load_openai_model is deprecated and will be removed in a future version. "
         "Please use load_default_model instead "
@@ -19,6 +56,8 @@ def load_openai_model(
         DeprecationWarning,
         stacklevel=2,
     )
+    from langchain_openai import ChatOpenAI
+
     return ChatOpenAI(
         api_key=openai_api_key,
         model=model_name,
@@ -26,12 +65,25 @@ def load_openai_model(
     )
 
 
-def load_default_model(
-    openai_api_key: str,
-) -> ChatOpenAI:
+def load_default_model(openai_api_key: str, **kwargs) -> "ChatOpenAI":
+    """Return the default chat model.
+
+    ``kwargs`` are passed to ``ChatOpenAI``, for example ``base_url``.
+    """
+    # Deferred so importing assistant_core does not load langchain_openai
+    from langchain_openai import ChatOpenAI
+
     return ChatOpenAI(
         api_key=openai_api_key,
         model=DEFAULT_MODEL,
         verbosity="low",
         use_previous_response_id=True,
+        **kwargs,
     )
+
+
+def load_summary_model(openai_api_key: str) -> "ChatOpenAI":
+    """Return the cheap model used for conversation summaries."""
+    from langchain_openai import ChatOpenAI
+
+    return ChatOpenAI(api_key=openai_api_key, model=GPT_5_NANO, verbosity="low")
@@ -1,9 +1,44 @@
-from .base import BaseNode
-from .nodes import (
-    AgentNode,
-    DataNode,
-    ProcessDataNode,
-    PromptNode,
-    QuestionNode,
-    ResolverNode,
-)
+"""Graph nodes.
+
+Exports are resolved on first access so importing the package stays cheap.
+"""
+
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+_EXPORTS = {
+    "BaseNode": ".base",
+    "AgentNode": ".nodes",
+    "DataNode": ".nodes",
+    "ProcessDataNode": ".nodes",
+    "PromptNode": ".nodes",
+    "QuestionNode": ".nodes",
+    "ResolverNode": ".nodes",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+if TYPE_CHECKING:
+    from .base import BaseNode
+    from .nodes import (
+        AgentNode,
+        DataNode,
+        ProcessDataNode,
+        PromptNode,
+        QuestionNode,
+        ResolverNode,
+    )
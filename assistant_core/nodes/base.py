@@ -1,16 +1,32 @@
 """Define node objects for graph"""
 
 import abc
+import inspect
 
 from langchain_core.runnables import RunnableConfig
 
+from assistant_core.metrics import instrument
+from assistant_core.profiling import profiled
+
 
 class BaseNode(abc.ABC):
     """Base class for nodes in the graph.
 
     Nodes should be callable objects that will be added to a graph.
+    Every ``__call__`` defined by a subclass is wrapped so it reports to the
+    installed ``NodeInstrumentation`` (see ``assistant_core.metrics``) and is
+    sampled in invocations run with the profile flag (see
+    ``assistant_core.profiling``).
     """
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        call = cls.__dict__.get("__call__")
+        if inspect.iscoroutinefunction(call) and not getattr(
+            call, "__isabstractmethod__", False
+        ):
+            cls.__call__ = instrument(profiled(call))
+
     def __init__(self, name: str = "", *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.name = name
@@ -0,0 +1,122 @@
+"""Track chained responses so agents can send only the new messages.
+
+With ``use_previous_response_id`` the provider keeps the conversation of the
+previous response, so only the messages added after it need to be sent.
+Responses are stamped with the name of the agent that produced them
+(``response_metadata["agent"]``), so the chain is read from the checkpointed
+history and holds across graph rebuilds, restarts and workers.
+``ResponseChain`` also remembers, per thread, the last response of its agent
+and where it sits in the history, to notice edited histories.
+"""
+
+from typing import NamedTuple
+
+from langchain_core.messages import AIMessage, BaseMessage
+
+from assistant_core.cache import LRUCache
+
+RESPONSE_ID_PREFIX = "resp_"
+AGENT_KEY = "agent"
+DEFAULT_MAX_THREADS = 10_000
+
+
+class ChainLink(NamedTuple):
+    response_id: str
+    position: int
+
+
+def response_id(message: BaseMessage) -> str | None:
+    """Return the provider response id of a chained AI message."""
+    if not isinstance(message, AIMessage):
+        return None
+    value = (message.response_metadata or {}).get("id")
+    if isinstance(value, str) and value.startswith(RESPONSE_ID_PREFIX):
+        return value
+    return None
+
+
+def last_response(messages: list[BaseMessage]) -> tuple[int, str | None]:
+    """Return the index and id of the latest chained AI message."""
+    for index in range(len(messages) - 1, -1, -1):
+        found = response_id(messages[index])
+        if found:
+            return index, found
+    return -1, None
+
+
+def unchain(messages: list[BaseMessage]) -> list[BaseMessage]:
+    """Copy AI messages without response ids so the full history is sent."""
+    result = []
+    for message in messages:
+        if response_id(message):
+            metadata = {k: v for k, v in message.response_metadata.items()}
+            metadata.pop("id")
+            message = message.model_copy(update={"response_metadata": metadata})
+        result.append(message)
+    return result
+
+
+def written_by(message: BaseMessage) -> str | None:
+    """Return the agent that stamped a chained AI message."""
+    return (getattr(message, "response_metadata", None) or {}).get(AGENT_KEY)
+
+
+class ResponseChain:
+    """Chain state of one agent: stamps its responses and checks histories."""
+
+    def __init__(self, agent: str, max_threads: int | None = DEFAULT_MAX_THREADS):
+        self.agent = agent
+        self._links = LRUCache(max_size=max_threads)
+        self.deltas = 0
+        self.full = 0
+        self.broken = 0
+
+    def record(self, thread_id: str, position: int, response: BaseMessage) -> None:
+        """Stamp ``response``, which will be stored at ``position``."""
+        found = response_id(response)
+        if found:
+            response.response_metadata[AGENT_KEY] = self.agent
+            self._links.set(thread_id, ChainLink(found, position))
+
+    def select(
+        self, thread_id: str, history: list[BaseMessage]
+    ) -> tuple[list[BaseMessage] | None, bool]:
+        """Return ``(delta, broken)`` for the thread history.
+
+        ``delta`` starts at the latest response when this agent wrote it.
+        ``broken`` is true when the latest response comes from another agent
+        or model, or the history was edited around the last response this
+        chain recorded; callers should then send the unchained full history,
+        as the client would otherwise chain off that response and drop this
+        agent's prompts. Without any response there is nothing to chain off.
+        """
+        index, latest = last_response(history)
+        if latest is None:
+            self.full += 1
+            return None, False
+        if written_by(history[index]) != self.agent or self._edited(
+            thread_id, history, index, latest
+        ):
+            self.broken += 1
+            self._links.pop(thread_id)
+            return None, True
+        self.deltas += 1
+        return history[index:], False
+
+    def _edited(
+        self, thread_id: str, history: list[BaseMessage], index: int, latest: str
+    ) -> bool:
+        link = self._links.get(thread_id)
+        if link is None:
+            # New node, restarted process or a thread served elsewhere so far
+            return False
+        if link.response_id == latest:
+            return link.position != index
+        # A later response written elsewhere, the recorded one must be in place
+        return (
+            link.position >= index
+            or response_id(history[link.position]) != link.response_id
+        )
+
+    def stats(self) -> dict[str, int]:
+        return {"deltas": self.deltas, "full": self.full, "broken": self.broken}
@@ -0,0 +1,113 @@
+"""History strategies that select which messages an agent sends to the model.
+
+Windows only start at safe boundaries: a tool result is never separated from
+the AI message that requested it.
+"""
+
+import abc
+from typing import Callable
+
+from langchain_core.messages import BaseMessage, HumanMessage, ToolMessage
+from langchain_core.messages.utils import count_tokens_approximately
+
+from assistant_core.cache import LRUCache
+
+DEFAULT_MAX_COUNTED_MESSAGES = 4096
+
+
+class TokenCounter:
+    """Per-message token counter with a cache keyed by message id.
+
+    Messages without an id are keyed by object identity. Only messages not
+    seen before are tokenized, so trimming a long thread is incremental.
+    """
+
+    def __init__(
+        self,
+        count: Callable[[BaseMessage], int] | None = None,
+        max_size: int | None = DEFAULT_MAX_COUNTED_MESSAGES,
+    ):
+        self.count = count or (lambda message: count_tokens_approximately([message]))
+        self._counts = LRUCache(max_size=max_size)
+
+    def __call__(self, message: BaseMessage) -> int:
+        message_id = getattr(message, "id", None)
+        content = getattr(message, "content", message)
+        # Content length guards against a message replaced under the same id
+        key = (message_id or id(message), len(str(content)))
+        cached = self._counts.get(key)
+        if cached is not None and (message_id or cached[0] is message):
+            return cached[1]
+        tokens = self.count(message)
+        self._counts.set(key, (message, tokens))
+        return tokens
+
+    def stats(self) -> dict[str, int]:
+        return self._counts.stats()
+
+
+class HistoryStrategy(abc.ABC):
+    """Select the part of the conversation sent to the model."""
+
+    @abc.abstractmethod
+    def select(self, messages: list[BaseMessage]) -> list[BaseMessage]:
+        raise NotImplementedError("Subclasses must implement this method.")
+
+
+class LastTurns(HistoryStrategy):
+    """Keep the last ``turns`` user turns (each starting at a human message)."""
+
+    def __init__(self, turns: int):
+        if turns < 1:
+            raise ValueError("turns must be at least 1.")
+        self.turns = turns
+
+    def select(self, messages: list[BaseMessage]) -> list[BaseMessage]:
+        seen = 0
+        for index in range(len(messages) - 1, -1, -1):
+            if isinstance(messages[index], HumanMessage):
+                seen += 1
+                if seen == self.turns:
+                    return messages[index:]
+        return messages
+
+
+class TokenBudget(HistoryStrategy):
+    """Keep the most recent messages that fit in ``max_tokens``.
+
+    The budget applies to the history only, not to the agent prompts. The
+    latest safe window is always kept even if it exceeds the budget.
+
+    Each budget has its own ``TokenCounter``, shared by every thread of the
+    node: ``max_counted_messages`` should cover the windows of the threads
+    served concurrently (about threads x messages per window), otherwise
+    counts are evicted and recomputed on every turn.
+    """
+
+    def __init__(
+        self,
+        max_tokens: int,
+        token_counter: TokenCounter | None = None,
+        *,
+        max_counted_messages: int | None = DEFAULT_MAX_COUNTED_MESSAGES,
+    ):
+        self.max_tokens = max_tokens
+        self.token_counter = token_counter or TokenCounter(
+            max_size=max_counted_messages
+        )
+
+    def select(self, messages: list[BaseMessage]) -> list[BaseMessage]:
+        total = 0
+        start = len(messages)
+        for index in range(len(messages) - 1, -1, -1):
+            total += self.token_counter(messages[index])
+            if total > self.max_tokens and start < len(messages):
+                break
+            if is_safe_start(messages, index):
+                start = index
+        return messages[start:]
+
+
+def is_safe_start(messages: list[BaseMessage], index: int) -> bool:
+    """Return whether a window may start at ``messages[index]``."""
+    return not isinstance(messages[index], ToolMessage)
@@ -1,11 +1,31 @@
 """Mixins that add additional functionality to nodes in the graph."""
 
+import functools
 import logging
+import time
+from typing import TYPE_CHECKING
 
 from langchain_core.language_models.chat_models import BaseChatModel
-from langchain_core.messages import SystemMessage
+from langchain_core.messages import (
+    AIMessage,
+    BaseMessage,
+    SystemMessage,
+    message_chunk_to_message,
+)
+from langchain_core.runnables import Runnable, RunnableConfig
 from langgraph.graph import END
 
+from assistant_core.state import CONTEXT_KEY
+from assistant_core.tools import bind_tools
+from assistant_core.usage import UsageRecord, usage_record
+
+if TYPE_CHECKING:
+    from langgraph.graph import StateGraph
+
+    from assistant_core.usage import UsageTracker
+
+    from .response_cache import ResponseCache
+
 _logger = logging.getLogger(__name__)
 
 
@@ -17,6 +37,8 @@ class UsesModel:
         *args,
         model: BaseChatModel,
         tools: list = None,
+        response_cache: "ResponseCache | None" = None,
+        usage_tracker: "UsageTracker | None" = None,
         **kwargs,
     ):
         super().__init__(*args, **kwargs)
@@ -25,13 +47,135 @@ class UsesModel:
         self._base_model = model
         self.model = model
         self.tools = tools or []
+        self.response_cache = response_cache
+        self.usage_tracker = usage_tracker
         if tools:
-            self.model = self.model.bind_tools(tools)
+            self.model = bind_tools(self.model, tools)
 
     def rebind_tools(self, tools: list):
-        """Rebind tools to the model."""
+        """Rebind tools to the model.
+
+        Tool schemas and bound models are memoized, rebinding the same tools
+        does not convert them again.
+        """
         self.tools = tools
-        self.model = self._base_model.bind_tools(tools)
+        self.model = bind_tools(self._base_model, tools)
+
+    async def ainvoke_model(
+        self,
+        messages: list[BaseMessage],
+        config: RunnableConfig = None,
+        stream: bool = False,
+        *,
+        tools: list | None = None,
+        agent: str = "",
+        **kwargs,
+    ) -> BaseMessage:
+        """Invoke the model, serving identical requests from the response cache.
+
+        With ``stream=True`` the response is consumed through ``astream`` so
+        LangGraph can forward each chunk (``stream_mode="messages"``) as it
+        arrives; the assembled message is returned. ``tools`` binds a subset
+        of the node tools for this call only. ``agent`` labels the usage
+        recorded in the ``usage_tracker``. Extra keyword arguments are passed
+        to the model call.
+        """
+        response, _ = await self.ainvoke_model_with_usage(
+            messages, config, stream, tools=tools, agent=agent, **kwargs
+        )
+        return response
+
+    async def ainvoke_model_with_usage(
+        self,
+        messages: list[BaseMessage],
+        config: RunnableConfig = None,
+        stream: bool = False,
+        *,
+        tools: list | None = None,
+        agent: str = "",
+        **kwargs,
+    ) -> tuple[BaseMessage, UsageRecord | None]:
+        """Like ``ainvoke_model``, also returning the usage it recorded.
+
+        The usage is None without a ``usage_tracker``, for responses without
+        usage metadata and for responses served from the response cache.
+        """
+        model = self.model
+        if tools is not None and tools is not self.tools:
+            model = bind_tools(self._base_model, tools)
+        else:
+            tools = self.tools
+        if stream:
+            call = functools.partial(self.astream_model, model=model)
+        else:
+            call = model.ainvoke
+        if self.response_cache is None:
+            return await self._tracked_call(call, agent, messages, config, **kwargs)
+
+        key = self.response_cache.make_key(messages, tools, self._base_model)
+        response = await self.response_cache.aget(key)
+        if response is not None:
+            return response, None
+        response, record = await self._tracked_call(
+            call, agent, messages, config, **kwargs
+        )
+        await self.response_cache.aset(key, response)
+        return response, record
+
+    async def _tracked_call(
+        self, call, agent: str, messages, config, **kwargs
+    ) -> tuple[BaseMessage, UsageRecord | None]:
+        if self.usage_tracker is None:
+            return await call(messages, config=config, **kwargs), None
+        start = time.perf_counter()
+        response = await call(messages, config=config, **kwargs)
+        record = self.usage_of(
+            response, config, agent=agent, duration=time.perf_counter() - start
+        )
+        if record is not None:
+            self.usage_tracker.record(record)
+        return response, record
+
+    def usage_of(
+        self,
+        response: BaseMessage,
+        config: RunnableConfig = None,
+        *,
+        agent: str = "",
+        duration: float = 0.0,
+    ) -> UsageRecord | None:
+        """Return the ``UsageRecord`` of a model response of this node."""
+        thread_id = ((config or {}).get("configurable") or {}).get("thread_id")
+        model = getattr(self._base_model, "model_name", None)
+        return usage_record(
+            response,
+            node=getattr(self, "name", type(self).__name__),
+            agent=agent,
+            thread_id=thread_id,
+            model=model if isinstance(model, str) else None,
+            duration=duration,
+        )
+
+    async def astream_model(
+        self,
+        messages: list[BaseMessage],
+        config: RunnableConfig = None,
+        *,
+        model: Runnable | None = None,
+        **kwargs,
+    ) -> BaseMessage:
+        """Stream the model response and return the assembled message.
+
+        Chunks are merged with ``+`` so tool call chunks are combined into
+        complete tool calls.
+        """
+        model = self.model if model is None else model
+        response = None
+        async for chunk in model.astream(messages, config=config, **kwargs):
+            response = chunk if response is None else response + chunk
+        if response is None:
+            return AIMessage("")
+        return message_chunk_to_message(response)
 
 
 class UsesJsonModel(UsesModel):
@@ -54,6 +198,50 @@ class UsesSystemMessage:
         return SystemMessage(message)
 
 
+class WritesContext:
+    """Mixin for nodes that can write to the ephemeral context channel.
+
+    With ``ephemeral=True`` the node messages go to the ``context`` channel
+    of ``EphemeralContextState`` (used by the agent for the current turn and
+    never checkpointed) instead of being appended to ``messages``.
+    """
+
+    def __init__(self, *args, ephemeral: bool = False, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.ephemeral = ephemeral
+
+    def context_update(self, messages: list[BaseMessage]) -> dict:
+        """Return the state update that publishes ``messages``."""
+        if self.ephemeral:
+            return {CONTEXT_KEY: {self.name: messages}}
+        return {"messages": messages}
+
+    @property
+    def writes_context(self) -> bool:
+        """Whether the node writes to the ephemeral context channel."""
+        return self.ephemeral
+
+
+def check_context_channel(graph_builder: "StateGraph") -> None:
+    """Raise when ephemeral nodes are added to a graph without ``context``.
+
+    Their messages would otherwise be dropped and never reach the agent.
+    """
+    if CONTEXT_KEY in graph_builder.channels:
+        return
+    writers = [
+        name
+        for name, spec in graph_builder.nodes.items()
+        if getattr(getattr(spec.runnable, "afunc", None), "writes_context", False)
+    ]
+    if writers:
+        raise ValueError(
+            f"Nodes {writers} write ephemeral context but the graph state has no "
+            f"'{CONTEXT_KEY}' channel. Use EphemeralContextState (or a subclass) "
+            "as the graph state, or create them with ephemeral=False."
+        )
+
+
 class IncludeQuestionNode:
     def __init__(
         self,
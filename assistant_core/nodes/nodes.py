@@ -1,17 +1,29 @@
+import hashlib
 import logging
 import warnings
+from typing import TYPE_CHECKING
 
 from langchain_core.messages import BaseMessage, SystemMessage
 from langchain_core.runnables import RunnableConfig
 from langgraph.graph import END, MessagesState
 from langgraph.types import Command, interrupt
 
-from ..state import NextProcessState, QuestionState
+from ..state import CONTEXT_KEY, USAGE_KEY, NextProcessState, QuestionState
 from .base import BaseNode
-from .mixins import IncludeNextNode, UsesModel, UsesSystemMessage
+from .chain import ResponseChain, unchain
+from .history import HistoryStrategy
+from .mixins import IncludeNextNode, UsesModel, UsesSystemMessage, WritesContext
+
+if TYPE_CHECKING:
+    from ..tools import ToolSelector
+    from .semantic_cache import SemanticCache
 
 _logger = logging.getLogger(__name__)
 
+DEFAULT_LAYOUT = "default"
+STABLE_LAYOUT = "stable"
+LAYOUTS = (DEFAULT_LAYOUT, STABLE_LAYOUT)
+
 
 class AgentNode(BaseNode, UsesModel):
     """Node for agent execution.
@@ -19,28 +31,175 @@ class AgentNode(BaseNode, UsesModel):
     This node is used to interact with the user.
     """
 
-    def __init__(self, prompts: list[str] = None, *args, **kwargs):
-        """Initialize the agent node with a prompt."""
+    def __init__(
+        self,
+        prompts: list[str] = None,
+        *args,
+        history: HistoryStrategy | None = None,
+        streaming: bool = False,
+        layout: str = DEFAULT_LAYOUT,
+        prompt_cache_key: str | None = None,
+        delta_messages: bool | None = None,
+        semantic_cache: "SemanticCache | None" = None,
+        tool_selector: "ToolSelector | None" = None,
+        **kwargs,
+    ):
+        """Initialize the agent node with a prompt.
+
+        ``history`` limits the conversation sent to the model (for example
+        ``LastTurns`` or ``TokenBudget``); the full history is sent by default.
+        ``streaming`` consumes the model with ``astream`` so graph callers
+        using ``stream_mode="messages"`` receive tokens as they are generated.
+        ``layout="stable"`` is meant for provider prompt caching: the
+        prompts and the append-only history form the cached prefix, the
+        ephemeral context (the only per-turn content) follows in writer
+        order and a per-agent ``prompt_cache_key`` is sent with every
+        request. Persisted system messages, such as the rolling summary,
+        stay where they are in the history.
+        ``delta_messages`` sends only the messages added since the last
+        response of this agent in the thread, found in the history through
+        the agent stamp on its responses; it defaults to on when the model
+        chains responses (``use_previous_response_id``).
+        ``semantic_cache`` answers near-duplicate questions with a cached
+        final answer, skipping the model call and the tool loop.
+        ``tool_selector`` binds only the tools relevant to the latest user
+        message and the answer it replies to (plus its always-on tools) on
+        each call.
+        """
+        if layout not in LAYOUTS:
+            raise ValueError(f"layout must be one of {LAYOUTS}.")
         super().__init__(*args, **kwargs)
         prompts = prompts or []
         self.prompts = [SystemMessage(prompt) for prompt in prompts]
+        self.history = history
+        self.streaming = streaming
+        self.layout = layout
+        if prompt_cache_key is None and layout == STABLE_LAYOUT:
+            prompt_cache_key = self._default_prompt_cache_key()
+        self.prompt_cache_key = prompt_cache_key
+        self.prompt_cache_usage = {"calls": 0, "input_tokens": 0, "cached_tokens": 0}
+        if delta_messages is None:
+            delta_messages = (
+                getattr(self._base_model, "use_previous_response_id", False) is True
+            )
+        self.delta_messages = delta_messages
+        self.response_chain = ResponseChain(self.name)
+        self.semantic_cache = semantic_cache
+        self.tool_selector = tool_selector
+
+    @property
+    def prompt_cache_hit_rate(self) -> float:
+        """Share of input tokens served from the provider prompt cache."""
+        input_tokens = self.prompt_cache_usage["input_tokens"]
+        if not input_tokens:
+            return 0.0
+        return self.prompt_cache_usage["cached_tokens"] / input_tokens
+
+    def _default_prompt_cache_key(self) -> str:
+        digest = hashlib.sha256(
+            "\n".join(prompt.content for prompt in self.prompts).encode()
+        ).hexdigest()
+        return f"{self.name}:{digest[:16]}"
+
+    def _context_messages(self, state: MessagesState) -> list[BaseMessage]:
+        context = state.get(CONTEXT_KEY) or {}
+        writers = sorted(context) if self.layout == STABLE_LAYOUT else context
+        return [message for writer in writers for message in context[writer]]
 
     def _get_messages(self, state: MessagesState) -> list[BaseMessage]:
-        """Get the messages to be sent to the model."""
-        return self.prompts + state["messages"]
+        """Get the messages to be sent to the model.
+
+        Ephemeral context written by pre-agent nodes goes after the history,
+        where per-turn system messages used to be appended.
+        """
+        messages = state["messages"]
+        if self.history is not None:
+            messages = self.history.select(messages)
+        return self.prompts + messages + self._context_messages(state)
+
+    def _get_chained_messages(
+        self, state: MessagesState, thread_id: str
+    ) -> list[BaseMessage]:
+        """Get the messages added since the last chained response.
+
+        The provider already holds the prompts and the conversation up to that
+        response, so only the response (used by the client as the chain
+        anchor), the following messages and the ephemeral context are sent.
+        A broken chain sends the full conversation without response ids.
+
+        The ``history`` strategy only applies to full requests: the earlier
+        conversation of a delta is already held by the provider, which
+        applies its own truncation to it.
+        """
+        delta, broken = self.response_chain.select(thread_id, state["messages"])
+        if delta is None:
+            messages = self._get_messages(state)
+            if broken:
+                _logger.debug("%s: response chain broken, sending history", self.name)
+                messages = unchain(messages)
+            return messages
+        return delta + self._context_messages(state)
+
+    def _record_prompt_cache_usage(self, response: BaseMessage) -> None:
+        usage = getattr(response, "usage_metadata", None)
+        if not isinstance(usage, dict):
+            return
+        cached = (usage.get("input_token_details") or {}).get("cache_read") or 0
+        self.prompt_cache_usage["calls"] += 1
+        self.prompt_cache_usage["input_tokens"] += usage.get("input_tokens", 0)
+        self.prompt_cache_usage["cached_tokens"] += cached
+        _logger.debug(
+            "%s: %s of %s input tokens served from prompt cache",
+            self.name,
+            cached,
+            usage.get("input_tokens", 0),
+        )
 
     async def __call__(self, state: dict, config: RunnableConfig) -> dict:
         """Execute the agent logic.
 
         Get a response from the model based on the provided prompts.
         """
-        messages = self._get_messages(state)
-        response = await self.model.ainvoke(messages, config=config)
+        if self.semantic_cache is not None:
+            cached = await self.semantic_cache.alookup(self, state, config)
+            if cached is not None:
+                return {"messages": [cached]}
+
+        thread_id = (config or {}).get("configurable", {}).get("thread_id")
+        chained = self.delta_messages and thread_id is not None
+        if chained:
+            messages = self._get_chained_messages(state, thread_id)
+        else:
+            messages = self._get_messages(state)
+        model_kwargs = {}
+        if self.prompt_cache_key:
+            model_kwargs["prompt_cache_key"] = self.prompt_cache_key
+        if self.tool_selector is not None and self.tools:
+            # Same question for the whole tool loop, so the selection is stable
+            model_kwargs["tools"] = await self.tool_selector.aselect(
+                self.tools, self.tool_selector.query(state["messages"])
+            )
+        response, usage = await self.ainvoke_model_with_usage(
+            messages,
+            config=config,
+            stream=self.streaming,
+            agent=state.get("active_agent") or self.name,
+            **model_kwargs,
+        )
+        self._record_prompt_cache_usage(response)
+        if chained:
+            self.response_chain.record(thread_id, len(state["messages"]), response)
+        if self.semantic_cache is not None:
+            await self.semantic_cache.aupdate(self, state, config, response)
 
-        return {"messages": [response]}
+        update = {"messages": [response]}
+        if usage is not None:
+            # Kept by graphs whose state has the channel (UsageState)
+            update[USAGE_KEY] = {self.name: usage.totals()}
+        return update
 
 
-class PromptNode(BaseNode, UsesSystemMessage):
+class PromptNode(BaseNode, WritesContext, UsesSystemMessage):
     """Node that adds a prompt to the state."""
 
     def __init__(self, prompt: str = "", state_values: dict = None, *args, **kwargs):
@@ -60,10 +219,10 @@ class PromptNode(BaseNode, UsesSystemMessage):
             prompt = self.prompt.format(**data)
         else:
             prompt = self.prompt
-        return {"messages": self.system_messages([prompt])}
+        return self.context_update(self.system_messages([prompt]))
 
 
-class DataNode(BaseNode, UsesSystemMessage):
+class DataNode(BaseNode, WritesContext, UsesSystemMessage):
     """Node that parses data from the state."""
 
 
@@ -0,0 +1,162 @@
+"""Exact-match cache of model responses for nodes that use a model.
+
+The key is a canonical hash of the messages sent to the model (without
+message or tool call ids), the bound tool schemas and the model parameters.
+A hit returns a copy detached from the thread that produced it: new message
+and tool call ids, no provider response id (so a chained thread does not
+continue another thread's server-side conversation) and no usage metadata,
+since no tokens were consumed.
+Storage is pluggable through ``CacheBackend``; ``InMemoryBackend`` is an LRU
+with TTL. Other backends (SQLite, Redis, ...) receive ``BaseMessage`` values
+and are responsible for serializing them, e.g. with ``langchain_core.load``.
+"""
+
+import abc
+import hashlib
+import json
+import logging
+import uuid
+from typing import Any
+
+from langchain_core.messages import AIMessage, BaseMessage
+
+from assistant_core.cache import LRUCache
+from assistant_core.tools import tool_schema
+
+from .chain import response_id
+
+_logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_RESPONSES = 1024
+
+
+class CacheBackend(abc.ABC):
+    """Async storage for cached responses."""
+
+    @abc.abstractmethod
+    async def aget(self, key: str) -> Any | None:
+        """Return the value stored under ``key`` or ``None``."""
+        raise NotImplementedError("Subclasses must implement this method.")
+
+    @abc.abstractmethod
+    async def aset(self, key: str, value: Any, ttl: float | None = None) -> None:
+        """Store ``value`` under ``key`` for ``ttl`` seconds (forever if None)."""
+        raise NotImplementedError("Subclasses must implement this method.")
+
+
+class InMemoryBackend(CacheBackend):
+    """Process-local LRU backend."""
+
+    def __init__(self, max_size: int | None = DEFAULT_MAX_RESPONSES):
+        self._entries = LRUCache(max_size=max_size)
+
+    async def aget(self, key: str) -> Any | None:
+        return self._entries.get(key)
+
+    async def aset(self, key: str, value: Any, ttl: float | None = None) -> None:
+        self._entries.set(key, value, ttl=ttl)
+
+
+class ResponseCache:
+    """Opt-in response cache shared by ``UsesModel`` nodes."""
+
+    def __init__(self, backend: CacheBackend | None = None, ttl: float | None = None):
+        self.backend = backend or InMemoryBackend()
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> dict[str, float]:
+        return {"hits": self.hits, "misses": self.misses, "hit_rate": self.hit_rate}
+
+    def make_key(
+        self, messages: list, tools: list | None = None, model: Any = None
+    ) -> str:
+        """Return the canonical hash of a model request."""
+        payload = {
+            "messages": [canonical_message(message) for message in messages],
+            "tools": [_tool_key(tool) for tool in tools or []],
+            "model": _model_params(model),
+        }
+        return hashlib.sha256(
+            json.dumps(payload, sort_keys=True, default=str).encode()
+        ).hexdigest()
+
+    async def aget(self, key: str) -> BaseMessage | None:
+        response = await self.backend.aget(key)
+        if response is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        if isinstance(response, BaseMessage):
+            response = detach(response)
+        return response
+
+    async def aset(self, key: str, response: Any) -> None:
+        await self.backend.aset(key, response, ttl=self.ttl)
+
+
+def detach(message: BaseMessage) -> BaseMessage:
+    """Return a copy of a cached response that can join another thread."""
+    # A fresh id so the reducer appends instead of replacing a message
+    update: dict[str, Any] = {"id": None}
+    if isinstance(message, AIMessage):
+        metadata = dict(message.response_metadata or {})
+        metadata.pop("id", None)
+        update["response_metadata"] = metadata
+        update["usage_metadata"] = None
+        ids = {call["id"]: _tool_call_id() for call in message.tool_calls}
+        if ids:
+            update["tool_calls"] = [
+                {**call, "id": ids[call["id"]]} for call in message.tool_calls
+            ]
+            raw_calls = message.additional_kwargs.get("tool_calls")
+            if raw_calls:
+                update["additional_kwargs"] = {
+                    **message.additional_kwargs,
+                    "tool_calls": [
+                        {**call, "id": ids.get(call.get("id"), call.get("id"))}
+                        for call in raw_calls
+                    ],
+                }
+    return message.model_copy(update=update)
+
+
+def _tool_call_id() -> str:
+    return f"call_{uuid.uuid4().hex[:24]}"
+
+
+def canonical_message(message: Any) -> Any:
+    """Return the id-free, JSON-friendly form of a message."""
+    if not isinstance(message, BaseMessage):
+        return message
+    return {
+        # Chained requests depend on the server-side conversation
+        "response_id": response_id(message),
+        "type": message.type,
+        "content": message.content,
+        "name": message.name,
+        "tool_calls": [
+            {"name": call["name"], "args": call["args"]}
+            for call in getattr(message, "tool_calls", None) or []
+        ],
+    }
+
+
+def _tool_key(tool: Any) -> str:
+    schema = tool_schema(tool)
+    return schema[1] if schema else repr(tool)
+
+
+def _model_params(model: Any) -> Any:
+    if model is None:
+        return None
+    try:
+        return {"type": type(model).__name__, **model._identifying_params}
+    except (AttributeError, TypeError):
+        return repr(model)
@@ -0,0 +1,224 @@
+"""Semantic cache of final agent answers for near-duplicate questions.
+
+The latest user message is embedded and looked up in an in-process
+``VectorIndex`` scoped per tenant and prompt version. Above ``threshold``
+the cached answer is returned and the model call and tool loop are skipped.
+Only answers of turns that made no tool calls are stored, since tool results
+may hold data of a single user or thread that must not be served to the rest
+of the tenant. Runs without a tenant are neither looked up nor stored.
+
+Entries are also keyed by a digest of the messages preceding the question,
+so a follow-up such as "and the second one?" only matches the same
+follow-up of the same conversation context.
+
+The prompt version is a hash of the agent prompts and tool names, so editing
+a prompt starts a new scope; ``invalidate`` drops old scopes.
+"""
+
+import hashlib
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Callable
+
+from langchain_core.embeddings import Embeddings
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
+from langchain_core.runnables import RunnableConfig
+
+from assistant_core.cache import LRUCache
+from assistant_core.vectors import EmbeddingCache, VectorIndex
+
+if TYPE_CHECKING:
+    from .nodes import AgentNode
+
+DEFAULT_THRESHOLD = 0.92
+DEFAULT_MAX_ENTRIES = 1000
+DEFAULT_MAX_SCOPES = 128
+DEFAULT_CONTEXT_MESSAGES = 2
+DEFAULT_TENANT_KEY = "organization_id"
+
+Scope = tuple[str, str]
+
+
+class SemanticCache:
+    """Similarity-based cache of agent answers."""
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        threshold: float = DEFAULT_THRESHOLD,
+        ttl: float | None = None,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_scopes: int | None = DEFAULT_MAX_SCOPES,
+        context_messages: int = DEFAULT_CONTEXT_MESSAGES,
+        tenant_key: str = DEFAULT_TENANT_KEY,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize the cache.
+
+        :param threshold: Minimum cosine similarity to serve a cached answer.
+        :param ttl: Seconds an answer is served (forever if None).
+        :param max_entries: Answers kept per scope, oldest are dropped first.
+        :param max_scopes: Scopes kept in memory, least recently used are
+            dropped first.
+        :param context_messages: Messages before the question that must match
+            for an answer to be served.
+        :param tenant_key: ``configurable`` key that identifies the tenant.
+        """
+        if not isinstance(embeddings, EmbeddingCache):
+            embeddings = EmbeddingCache(embeddings)
+        self.embeddings = embeddings
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.context_messages = context_messages
+        self.tenant_key = tenant_key
+        self.clock = clock
+        # Scope -> (index, insertion order of its keys)
+        self._indexes = LRUCache(max_size=max_scopes)
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> dict[str, float]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate,
+            "scopes": len(self._indexes),
+            "entries": sum(len(index) for index, _ in self._indexes.values()),
+        }
+
+    def prompt_hash(self, agent: "AgentNode") -> str:
+        """Return the prompt version of ``agent``."""
+        parts = [prompt.content for prompt in agent.prompts]
+        parts += sorted(getattr(tool, "name", repr(tool)) for tool in agent.tools)
+        return hashlib.sha256("\n".join(parts).encode()).hexdigest()[:16]
+
+    def scope(self, agent: "AgentNode", config: RunnableConfig | None) -> Scope | None:
+        """Return the scope of this run, None when it has no tenant."""
+        tenant = ((config or {}).get("configurable") or {}).get(self.tenant_key)
+        if tenant is None:
+            return None
+        return tenant, self.prompt_hash(agent)
+
+    def context_digest(self, messages: list[BaseMessage]) -> str:
+        """Return a digest of the conversation before the latest question."""
+        return context_digest(messages, self.context_messages)
+
+    async def alookup(
+        self, agent: "AgentNode", state: dict, config: RunnableConfig | None = None
+    ) -> AIMessage | None:
+        """Return the cached answer to the question that starts this turn."""
+        question = pending_question(state["messages"])
+        scope = self.scope(agent, config)
+        if question is None or scope is None:
+            return None
+        context = self.context_digest(state["messages"])
+        entry = self._indexes.get(scope)
+        if entry is not None and len(entry[0]):
+            index, order = entry
+            vector = await self.embeddings.aembed_query(normalize(question))
+            now = self.clock()
+            for key, score, (answer, expires_at, entry_context) in index.search(
+                vector, limit=len(index), min_score=self.threshold
+            ):
+                if expires_at is not None and expires_at <= now:
+                    index.remove(key)
+                    order.pop(key, None)
+                    continue
+                if entry_context != context:
+                    continue
+                self.hits += 1
+                return AIMessage(answer, response_metadata={"semantic_cache": score})
+        self.misses += 1
+        return None
+
+    async def aupdate(
+        self,
+        agent: "AgentNode",
+        state: dict,
+        config: RunnableConfig | None,
+        response: BaseMessage,
+    ) -> None:
+        """Store ``response`` when it is the final answer of a turn without tools."""
+        if getattr(response, "tool_calls", None) or not response.text:
+            return
+        messages = state["messages"]
+        question = pending_question(messages)
+        scope = self.scope(agent, config)
+        if question is None or scope is None:
+            # Answer built on tool results, or no tenant to scope it to
+            return
+        text = normalize(question)
+        context = self.context_digest(messages)
+        key = f"{context}:{text}"
+        vector = await self.embeddings.aembed_query(text)
+        index, order = self._indexes.get_or_create(
+            scope, lambda: (VectorIndex(), OrderedDict())
+        )
+        expires_at = None if self.ttl is None else self.clock() + self.ttl
+        index.upsert(key, vector, (response.text, expires_at, context))
+        order[key] = None
+        order.move_to_end(key)
+        while len(order) > self.max_entries:
+            oldest, _ = order.popitem(last=False)
+            index.remove(oldest)
+
+    def invalidate(
+        self, prompt_hash: str | None = None, tenant: str | None = None
+    ) -> int:
+        """Drop the scopes matching ``prompt_hash`` and/or ``tenant``.
+
+        Without arguments every scope is dropped. Returns the number dropped.
+        """
+        dropped = [
+            scope
+            for scope, _ in self._indexes.items()
+            if (tenant is None or scope[0] == tenant)
+            and (prompt_hash is None or scope[1] == prompt_hash)
+        ]
+        for scope in dropped:
+            self._indexes.pop(scope)
+        return len(dropped)
+
+
+def normalize(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+def pending_question(messages: list[BaseMessage]) -> str | None:
+    """Return the user message that starts the turn, if nothing answered it."""
+    for message in reversed(messages):
+        if isinstance(message, SystemMessage):
+            continue
+        if isinstance(message, HumanMessage):
+            return message.text
+        return None
+    return None
+
+
+def context_digest(messages: list[BaseMessage], limit: int) -> str:
+    """Hash the last ``limit`` user and answer messages before the question.
+
+    Tool calls and tool results are left out, an empty context (the first
+    question of a conversation) hashes to an empty string.
+    """
+    if limit <= 0:
+        return ""
+    start = len(messages)
+    for position in range(len(messages) - 1, -1, -1):
+        if isinstance(messages[position], HumanMessage):
+            start = position
+            break
+    texts = [
+        f"{message.type}:{normalize(message.text)}"
+        for message in messages[:start]
+        if isinstance(message, (HumanMessage, AIMessage)) and message.text
+    ][-limit:]
+    if not texts:
+        return ""
+    return hashlib.sha256("\n".join(texts).encode()).hexdigest()[:16]
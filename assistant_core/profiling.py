@@ -0,0 +1,302 @@
+"""On-demand sampling profiler for graph invocations.
+
+Profiling is off unless the server enables it::
+
+    set_profiler(Profiler(enabled=True, directory="/var/lib/app/profiles"))
+
+An invocation then requests it through the run config::
+
+    await graph.ainvoke(state, {"configurable": {"thread_id": "t1", "profile": True}})
+
+``True`` writes ``<directory>/<thread_id>.collapsed``; a string is a file
+name inside ``directory``. Both are sanitized and targets resolving outside
+``directory`` are rejected, so callers can't choose where files are written.
+While a ``BaseNode`` or a tool call of the agent tool node runs for that
+invocation, a background thread samples its asyncio task every ``interval``
+seconds:
+
+- when the task is running, the Python stack executing it is recorded
+  (framework, node, tool and client code);
+- when it is suspended the chain of awaited coroutines is recorded with an
+  ``[await]`` leaf (waiting for the model, a tool or the store), or
+  ``[ready]`` when the awaited result is there but the event loop is busy
+  with other work.
+
+Each stack starts with ``node:<name>`` or ``tool:<name>`` and frames are
+named ``module:qualname``, so time is attributed to assistant_core nodes,
+builders and tools. The output is in the collapsed-stack format read by
+``flamegraph.pl``, speedscope and similar tools; samples of later
+invocations with the same target are added to the file.
+
+Files are written by the sampling thread, not the event loop, once no
+profiled call has run for ``flush_delay`` seconds (usually once per
+invocation), and the written samples are dropped from memory.
+
+Without the flag nodes only pay one config lookup per call.
+"""
+
+import asyncio
+import contextlib
+import functools
+import logging
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+
+_logger = logging.getLogger(__name__)
+
+PROFILE_KEY = "profile"
+DEFAULT_INTERVAL = 0.005
+DEFAULT_FLUSH_DELAY = 1.0
+DEFAULT_DIRECTORY = "profiles"
+SUFFIX = ".collapsed"
+
+_UNSAFE_CHARS = re.compile(r"[^A-Za-z0-9._-]")
+
+
+class _Entry:
+    __slots__ = ("label", "target", "thread_id", "samples")
+
+    def __init__(self, label: str, target: Path):
+        self.label = label
+        self.target = target
+        self.thread_id = threading.get_ident()
+        self.samples: Counter = Counter()
+
+
+class Profiler:
+    """Sample the asyncio tasks of profiled invocations from a thread.
+
+    The sampling thread only runs while a profiled node or tool call is in
+    progress, and writes the collected samples once it has been idle for
+    ``flush_delay`` seconds.
+    """
+
+    def __init__(
+        self,
+        interval: float = DEFAULT_INTERVAL,
+        directory: str = DEFAULT_DIRECTORY,
+        *,
+        enabled: bool = False,
+        flush_delay: float = DEFAULT_FLUSH_DELAY,
+    ):
+        """Initialize the profiler.
+
+        :param directory: Directory every profile is written to.
+        :param enabled: Whether the profile flag of run configs is honoured.
+        :param flush_delay: Idle seconds before collected samples are written.
+        """
+        self.interval = interval
+        self.directory = Path(directory)
+        self.enabled = enabled
+        self.flush_delay = flush_delay
+        self._active: dict[asyncio.Task, _Entry] = {}
+        self._pending: dict[Path, Counter] = {}
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    def target(self, config: Any) -> Path | None:
+        """Return the output path requested by ``config``, if any.
+
+        None when profiling is disabled or the path would leave ``directory``.
+        """
+        configurable = (config or {}).get("configurable") or {}
+        value = configurable.get(PROFILE_KEY)
+        if not value or not self.enabled:
+            return None
+        if value is True:
+            name = str(configurable.get("thread_id") or "default") + SUFFIX
+        else:
+            name = str(value)
+        name = _UNSAFE_CHARS.sub("_", name)
+        directory = self.directory.resolve()
+        target = (directory / name).resolve()
+        if target.parent != directory or target.name in ("", ".", ".."):
+            _logger.warning("Rejected profile target %r", value)
+            return None
+        return target
+
+    @contextlib.contextmanager
+    def session(self, label: str, target: Path):
+        """Sample the current task while the block runs, for ``target``."""
+        task = asyncio.current_task()
+        entry = _Entry(label, target)
+        with self._lock:
+            if task is None or task in self._active:
+                # Nested call (super().__call__) of a task already sampled
+                entry = None
+            else:
+                self._active[task] = entry
+        if entry is None:
+            yield
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="assistant_core-profiler", daemon=True
+                )
+                self._thread.start()
+        try:
+            yield
+        finally:
+            with self._lock:
+                del self._active[task]
+                self._pending.setdefault(target, Counter()).update(entry.samples)
+
+    def flush(self) -> None:
+        """Add the samples collected so far to their files and drop them."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        with self._write_lock:
+            for target, samples in pending.items():
+                self._write(target, samples)
+
+    def sample(self) -> None:
+        """Take one sample of every profiled task."""
+        frames = sys._current_frames()
+        with self._lock:
+            for task, entry in self._active.items():
+                stack = _task_stack(task, frames.get(entry.thread_id))
+                if stack:
+                    entry.samples[";".join([entry.label, *stack])] += 1
+
+    def _run(self) -> None:
+        stop = threading.Event()
+        idle_since = None
+        while not stop.wait(self.interval):
+            self.sample()
+            with self._lock:
+                if self._active:
+                    idle_since = None
+                    continue
+                now = time.monotonic()
+                if idle_since is None:
+                    idle_since = now
+                if now - idle_since < self.flush_delay:
+                    continue
+                self._thread = None
+            self.flush()
+            return
+
+    def _write(self, target: Path, samples: Counter) -> None:
+        try:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            if target.exists():
+                samples = samples + _read_stacks(target)
+            target.write_text(
+                "".join(
+                    f"{stack} {count}\n" for stack, count in sorted(samples.items())
+                )
+            )
+        except OSError:
+            _logger.exception("Failed to write profile %s", target)
+
+
+def _read_stacks(path: Path) -> Counter:
+    stacks: Counter = Counter()
+    for line in path.read_text().splitlines():
+        stack, _, count = line.rpartition(" ")
+        if stack and count.isdigit():
+            stacks[stack] += int(count)
+    return stacks
+
+
+def _frame_name(frame) -> str:
+    module = frame.f_globals.get("__name__", "?")
+    return f"{module}:{frame.f_code.co_qualname}"
+
+
+def _task_stack(task: asyncio.Task, thread_frame) -> list[str]:
+    """Return the root-to-leaf frame names of ``task``."""
+    coro = task.get_coro()
+    root = getattr(coro, "cr_frame", None)
+    if root is None:
+        return []
+    if getattr(coro, "cr_running", False):
+        names = []
+        frame = thread_frame
+        while frame is not None:
+            names.append(_frame_name(frame))
+            if frame is root:
+                break
+            frame = frame.f_back
+        return names[::-1]
+
+    names = []
+    awaited = coro
+    while True:
+        frame = getattr(awaited, "cr_frame", None) or getattr(awaited, "gi_frame", None)
+        if frame is None:
+            break
+        names.append(_frame_name(frame))
+        awaited = getattr(awaited, "cr_await", None) or getattr(
+            awaited, "gi_yieldfrom", None
+        )
+    done = getattr(awaited, "done", None)
+    names.append("[ready]" if done is not None and done() else "[await]")
+    return names
+
+
+_profiler: Profiler | None = None
+
+
+def get_profiler() -> Profiler:
+    """Return the process-wide profiler, created (disabled) on first use."""
+    global _profiler
+    if _profiler is None:
+        _profiler = Profiler()
+    return _profiler
+
+
+def set_profiler(profiler: Profiler | None) -> Profiler | None:
+    """Replace the process-wide profiler and return the previous one."""
+    global _profiler
+    previous, _profiler = _profiler, profiler
+    return previous
+
+
+def profiled(call: Callable[..., Awaitable]) -> Callable[..., Awaitable]:
+    """Wrap a node ``__call__`` so profiled invocations are sampled."""
+
+    @functools.wraps(call)
+    async def wrapper(self, state, *args, **kwargs):
+        config = kwargs.get("config", args[0] if args else None)
+        if not ((config or {}).get("configurable") or {}).get(PROFILE_KEY):
+            return await call(self, state, *args, **kwargs)
+        profiler = get_profiler()
+        target = profiler.target(config)
+        if target is None:
+            return await call(self, state, *args, **kwargs)
+        with profiler.session(f"node:{self.name}", target):
+            return await call(self, state, *args, **kwargs)
+
+    return wrapper
+
+
+def profiled_tool_call(inner: Callable | None = None) -> Callable:
+    """Return a ``ToolNode`` ``awrap_tool_call`` sampling profiled tool calls.
+
+    ``inner`` is an existing interceptor called inside the session.
+    """
+
+    async def wrapper(request, execute: Callable[..., Awaitable]):
+        config = getattr(getattr(request, "runtime", None), "config", None)
+        target = None
+        if ((config or {}).get("configurable") or {}).get(PROFILE_KEY):
+            target = get_profiler().target(config)
+        if target is None:
+            if inner is None:
+                return await execute(request)
+            return await inner(request, execute)
+        label = f"tool:{request.tool_call['name']}"
+        with get_profiler().session(label, target):
+            if inner is None:
+                return await execute(request)
+            return await inner(request, execute)
+
+    return wrapper
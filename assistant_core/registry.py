@@ -0,0 +1,118 @@
+"""Process-wide registry of shared chat model instances.
+
+Chat models keep their own HTTP clients, so creating one per context (or per
+clone) multiplies sockets and TLS handshakes. ``ModelRegistry`` pools model
+instances by ``(model factory, config, model name)`` and hands the same
+instance back to every ``ContextFactory`` that asks for it.
+"""
+
+import inspect
+import logging
+import threading
+from typing import TYPE_CHECKING, Any, Callable, Hashable
+
+from assistant_core.cache import LRUCache, freeze
+
+if TYPE_CHECKING:
+    from langchain_core.language_models.chat_models import BaseChatModel
+
+_logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_MODELS = 32
+
+
+class ModelRegistry:
+    """Bounded pool of chat models shared by all factories and clones.
+
+    Models evicted by the LRU policy are only dropped from the registry, they
+    are not closed because nodes built earlier may still hold them. Use
+    ``close``/``aclose`` on shutdown to release the underlying clients.
+    """
+
+    def __init__(self, max_size: int | None = DEFAULT_MAX_MODELS):
+        self._models = LRUCache(max_size=max_size)
+
+    def __len__(self) -> int:
+        return len(self._models)
+
+    @staticmethod
+    def make_key(
+        factory: Callable, config: dict, model_name: str | None = None
+    ) -> Hashable:
+        """Build the registry key for a model factory and its configuration."""
+        return (factory, freeze(config), model_name)
+
+    def get(
+        self,
+        factory: Callable,
+        config: dict,
+        create: Callable[[], "BaseChatModel"],
+        model_name: str | None = None,
+    ) -> "BaseChatModel":
+        """Return the pooled model for the key, calling ``create`` on a miss."""
+        key = self.make_key(factory, config, model_name)
+        return self._models.get_or_create(key, create)
+
+    def discard(
+        self, factory: Callable, config: dict, model_name: str | None = None
+    ) -> "BaseChatModel | None":
+        """Remove a model from the registry without closing it."""
+        return self._models.pop(self.make_key(factory, config, model_name))
+
+    def stats(self) -> dict[str, int]:
+        return self._models.stats()
+
+    def clear(self) -> None:
+        """Forget every pooled model without closing it."""
+        self._models.clear()
+
+    def close(self) -> None:
+        """Close the synchronous clients of every pooled model and clear."""
+        for model in self._models.values():
+            _close_client(getattr(model, "root_client", None))
+        self.clear()
+
+    async def aclose(self) -> None:
+        """Close the sync and async clients of every pooled model and clear."""
+        for model in self._models.values():
+            _close_client(getattr(model, "root_client", None))
+            client = getattr(model, "root_async_client", None)
+            if client is not None and hasattr(client, "close"):
+                try:
+                    result = client.close()
+                    if inspect.isawaitable(result):
+                        await result
+                except Exception:
+                    _logger.exception("Failed to close async model client")
+        self.clear()
+
+
+def _close_client(client: Any) -> None:
+    if client is None or not hasattr(client, "close"):
+        return
+    try:
+        client.close()
+    except Exception:
+        _logger.exception("Failed to close model client")
+
+
+_registry: ModelRegistry | None = None
+_registry_lock = threading.Lock()
+
+
+def get_model_registry() -> ModelRegistry:
+    """Return the process-wide model registry."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = ModelRegistry()
+    return _registry
+
+
+def set_model_registry(registry: ModelRegistry | None) -> ModelRegistry | None:
+    """Replace the process-wide model registry and return the previous one."""
+    global _registry
+    with _registry_lock:
+        previous, _registry = _registry, registry
+    return previous
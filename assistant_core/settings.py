@@ -1,8 +1,28 @@
+"""Environment settings.
+
+Importing this module has no side effects: the ``.env`` file is loaded the
+first time a setting is read, or explicitly with ``load_settings()``.
+"""
+
 import os
 
-from dotenv import load_dotenv
+SETTINGS = ("OPENAI_API_KEY", "TAVILY_API_KEY")
+
+_loaded = False
+
+
+def load_settings(dotenv: bool = True) -> dict[str, str | None]:
+    """Load the ``.env`` file (once) and return the current settings."""
+    global _loaded
+    if dotenv and not _loaded:
+        from dotenv import load_dotenv
+
+        load_dotenv()
+        _loaded = True
+    return {name: os.getenv(name) for name in SETTINGS}
 
-load_dotenv()
 
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-TAVILY_API_KEY = os.getenv("TAVILY_API_KEY")
+def __getattr__(name: str):
+    if name in SETTINGS:
+        return load_settings()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
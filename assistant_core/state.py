@@ -1,12 +1,50 @@
-from typing import Annotated
+from typing import Annotated, Any, Sequence
 
+from langgraph.channels import UntrackedValue
 from langgraph.graph import MessagesState
 
+CONTEXT_KEY = "context"
+PREFETCH_KEY = "prefetched"
+USAGE_KEY = "usage"
+
 
 def replace(old, new):
     return new
 
 
+def add_usage(
+    left: dict[str, dict] | None, right: dict[str, dict] | None
+) -> dict[str, dict]:
+    """Sum per-node usage counters (tokens, calls, cost)."""
+    merged = {node: dict(values) for node, values in (left or {}).items()}
+    for node, values in (right or {}).items():
+        totals = merged.setdefault(node, {})
+        for key, value in values.items():
+            totals[key] = totals.get(key, 0) + value
+    return merged
+
+
+class EphemeralContext(UntrackedValue):
+    """Channel for per-turn context that is never checkpointed.
+
+    Each update is a mapping of writer name to messages; updates are merged
+    so every writer keeps only its latest entry. The channel starts empty on
+    every graph invocation.
+    """
+
+    def __init__(self, typ: type = dict, guard: bool = False):
+        super().__init__(typ, guard)
+
+    def update(self, values: Sequence[dict]) -> bool:
+        if not values:
+            return False
+        merged = dict(self.value) if self.is_available() else {}
+        for value in values:
+            merged.update(value)
+        self.value = merged
+        return True
+
+
 class QuestionState(MessagesState):
     question: str | None = None
     answer: str | None = None
@@ -24,3 +62,35 @@ class MultiAgentState(MessagesState):
     """
 
     active_agent: str | None = None
+
+
+class EphemeralContextState(MessagesState):
+    """State with an ephemeral ``context`` channel.
+
+    Pre-agent nodes created with ``ephemeral=True`` write their system
+    messages here instead of ``messages``; ``AgentNode`` adds them to the
+    model input of the current turn only.
+    """
+
+    context: Annotated[dict[str, list], EphemeralContext()]
+
+
+class PrefetchState(EphemeralContextState):
+    """State with a ``prefetched`` channel for store values loaded per turn.
+
+    Like ``context`` the channel is merged per key and never checkpointed.
+    """
+
+    prefetched: Annotated[dict[str, Any], EphemeralContext()]
+
+
+class UsageState(MessagesState):
+    """State with per-node token usage of the thread.
+
+    ``AgentNode`` and ``SummarizationNode`` with a ``UsageTracker`` add the
+    usage of their model calls here, so the totals are checkpointed with the
+    thread (a background summary is added when it is applied). Other
+    ``UsesModel`` nodes only report to the tracker.
+    """
+
+    usage: Annotated[dict[str, dict], add_usage]
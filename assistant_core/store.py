@@ -0,0 +1,444 @@
+"""Per-invocation read-through cache and write buffer for LangGraph stores.
+
+Nodes and tools usually call ``store.aget``/``store.aput`` one key at a time,
+each a round trip to Redis, and several tools often read the same key in one
+turn. ``CachedStore`` wraps the store for one graph invocation:
+
+- reads are memoized (and see the buffered writes);
+- writes are buffered and sent as a single batch by ``aflush``;
+- search and namespace listing flush pending writes and pass through.
+
+Usage::
+
+    async with CachedStore(store) as cached:
+        await graph.ainvoke(inputs, with_cached_store(config, cached))
+    cached.stats()
+
+Nodes and tools get it with ``get_store(config)``, which falls back to the
+graph store when the invocation has no ``CachedStore``.
+
+``IndexedStore`` mirrors small namespaces (FAQs) in an in-process
+``VectorIndex`` and answers their semantic searches locally::
+
+    store = IndexedStore(redis_store, embeddings, [("*", "faqs")])
+"""
+
+import json
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Iterable
+
+from langchain_core.embeddings import Embeddings
+from langchain_core.runnables import RunnableConfig
+from langgraph.store.base import (
+    BaseStore,
+    GetOp,
+    Item,
+    Op,
+    PutOp,
+    Result,
+    SearchItem,
+    SearchOp,
+)
+
+from assistant_core.cache import LRUCache
+from assistant_core.vectors import EmbeddingCache, VectorIndex
+
+_logger = logging.getLogger(__name__)
+
+CACHED_STORE_KEY = "cached_store"
+DEFAULT_PAGE_SIZE = 500
+DEFAULT_MAX_INDEXES = 128
+
+
+class CachedStore(BaseStore):
+    """Store wrapper that memoizes reads and batches writes.
+
+    Create one per graph invocation: the cache is never invalidated by writes
+    from other processes.
+    """
+
+    def __init__(self, store: BaseStore):
+        self.store = store
+        self._items: dict[tuple, Item | None] = {}
+        self._pending: dict[tuple, PutOp] = {}
+        self.operations = 0
+        self.round_trips = 0
+        self.hits = 0
+
+    @property
+    def supports_ttl(self) -> bool:
+        return self.store.supports_ttl
+
+    @property
+    def ttl_config(self):
+        return self.store.ttl_config
+
+    @property
+    def round_trips_saved(self) -> int:
+        return self.operations - self.round_trips
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "operations": self.operations,
+            "hits": self.hits,
+            "pending_writes": len(self._pending),
+            "round_trips": self.round_trips,
+            "round_trips_saved": self.round_trips_saved,
+        }
+
+    def batch(self, ops: Iterable[Op]) -> list[Result]:
+        ops = list(ops)
+        results, remote = self._prepare(ops)
+        if remote and any(not isinstance(ops[i], GetOp) for i in remote):
+            self.flush()
+        if remote:
+            self._complete(ops, results, remote, self._send([ops[i] for i in remote]))
+        return results
+
+    async def abatch(self, ops: Iterable[Op]) -> list[Result]:
+        ops = list(ops)
+        results, remote = self._prepare(ops)
+        if remote and any(not isinstance(ops[i], GetOp) for i in remote):
+            await self.aflush()
+        if remote:
+            fetched = await self._asend([ops[i] for i in remote])
+            self._complete(ops, results, remote, fetched)
+        return results
+
+    def flush(self) -> None:
+        """Write the buffered puts and deletes in one batch."""
+        if self._pending:
+            self._send(self._take_pending())
+
+    async def aflush(self) -> None:
+        """Write the buffered puts and deletes in one batch."""
+        if self._pending:
+            await self._asend(self._take_pending())
+
+    async def __aenter__(self) -> "CachedStore":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        # Writes made before a failure are kept, as with the plain store
+        await self.aflush()
+
+    def _prepare(self, ops: list[Op]) -> tuple[list[Any], list[int]]:
+        """Serve what can be served locally, return indexes to send."""
+        self.operations += len(ops)
+        results: list[Any] = [None] * len(ops)
+        remote = []
+        for index, op in enumerate(ops):
+            if isinstance(op, PutOp):
+                path = (op.namespace, op.key)
+                self._pending[path] = op
+                self._items[path] = _pending_item(op, self._items.get(path))
+            elif isinstance(op, GetOp) and (op.namespace, op.key) in self._items:
+                self.hits += 1
+                results[index] = self._items[(op.namespace, op.key)]
+            else:
+                remote.append(index)
+        return results, remote
+
+    def _complete(
+        self, ops: list[Op], results: list, remote: list[int], fetched: list
+    ) -> None:
+        for index, result in zip(remote, fetched):
+            op = ops[index]
+            path = (getattr(op, "namespace", None), getattr(op, "key", None))
+            # A put later in the same batch must not be hidden by the fetch
+            if isinstance(op, GetOp) and path not in self._pending:
+                self._items[path] = result
+            results[index] = result
+
+    def _take_pending(self) -> list[PutOp]:
+        pending = list(self._pending.values())
+        self._pending.clear()
+        _logger.debug("Flushing %s store writes", len(pending))
+        return pending
+
+    def _send(self, ops: list[Op]) -> list[Result]:
+        self.round_trips += 1
+        return self.store.batch(ops)
+
+    async def _asend(self, ops: list[Op]) -> list[Result]:
+        self.round_trips += 1
+        return await self.store.abatch(ops)
+
+
+def _pending_item(op: PutOp, current: Item | None) -> Item | None:
+    if op.value is None:
+        return None
+    now = datetime.now(timezone.utc)
+    return Item(
+        value=op.value,
+        key=op.key,
+        namespace=op.namespace,
+        created_at=current.created_at if current else now,
+        updated_at=now,
+    )
+
+
+def with_cached_store(config: RunnableConfig, store: CachedStore) -> RunnableConfig:
+    """Return ``config`` with ``store`` available to ``get_store``."""
+    configurable = {**config.get("configurable", {}), CACHED_STORE_KEY: store}
+    return {**config, "configurable": configurable}
+
+
+def get_store(config: RunnableConfig | None = None) -> BaseStore | None:
+    """Return the invocation ``CachedStore`` or the graph store.
+
+    Works in nodes and tools (through their ``config`` argument); returns
+    ``None`` when the graph was compiled without a store.
+    """
+    store = ((config or {}).get("configurable") or {}).get(CACHED_STORE_KEY)
+    if store is not None:
+        return store
+    from langgraph.config import get_store as get_graph_store
+
+    try:
+        return get_graph_store()
+    except (RuntimeError, KeyError, AttributeError):
+        return None
+
+
+class IndexedStore(BaseStore):
+    """Store wrapper with in-process vector search for mirrored namespaces.
+
+    ``namespaces`` are namespace prefixes to mirror, ``"*"`` matches any
+    segment (``("*", "faqs")`` mirrors the FAQs of every organization). A
+    prefix is loaded and embedded on its first semantic search, updated on
+    writes made through this wrapper and reloaded after ``refresh_interval``
+    seconds to pick up writes from other processes. Searches with operator
+    filters, and all other operations, go to the wrapped store.
+
+    ``fields`` selects the value fields that are embedded (the whole value as
+    JSON by default); it should match the index configuration of the store.
+    At most ``max_indexes`` mirrors are kept in memory, the least recently
+    searched are dropped and reloaded on their next search.
+    """
+
+    def __init__(
+        self,
+        store: BaseStore,
+        embeddings: Embeddings,
+        namespaces: list[tuple[str, ...]],
+        *,
+        fields: list[str] | None = None,
+        refresh_interval: float | None = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        max_indexes: int | None = DEFAULT_MAX_INDEXES,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.store = store
+        if not isinstance(embeddings, EmbeddingCache):
+            embeddings = EmbeddingCache(embeddings)
+        self.embeddings = embeddings
+        self.namespaces = [tuple(namespace) for namespace in namespaces]
+        self.fields = fields
+        self.refresh_interval = refresh_interval
+        self.page_size = page_size
+        self.clock = clock
+        # prefix -> (index, loaded at)
+        self._indexes = LRUCache(max_size=max_indexes)
+        self.local_searches = 0
+
+    @property
+    def supports_ttl(self) -> bool:
+        return self.store.supports_ttl
+
+    @property
+    def ttl_config(self):
+        return self.store.ttl_config
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "indexes": len(self._indexes),
+            "items": sum(len(index) for index, _ in self._indexes.values()),
+            "local_searches": self.local_searches,
+            "query_embeddings": self.embeddings.stats(),
+        }
+
+    def batch(self, ops: Iterable[Op]) -> list[Result]:
+        ops = list(ops)
+        results: list[Any] = [None] * len(ops)
+        remote = []
+        for index, op in enumerate(ops):
+            if self._is_local(op):
+                vector = self.embeddings.embed_query(op.query)
+                results[index] = self._search(self._index(op), op, vector)
+            else:
+                remote.append(index)
+        if remote:
+            fetched = self.store.batch([ops[i] for i in remote])
+            for index, result in zip(remote, fetched):
+                results[index] = result
+            puts = self._indexed_puts(ops)
+            texts = [self._text(op.value) for op in puts if op.value is not None]
+            self._apply(puts, self.embeddings.embed_documents(texts) if texts else [])
+        return results
+
+    async def abatch(self, ops: Iterable[Op]) -> list[Result]:
+        ops = list(ops)
+        results: list[Any] = [None] * len(ops)
+        remote = []
+        for index, op in enumerate(ops):
+            if self._is_local(op):
+                vector = await self.embeddings.aembed_query(op.query)
+                results[index] = self._search(await self._aindex(op), op, vector)
+            else:
+                remote.append(index)
+        if remote:
+            fetched = await self.store.abatch([ops[i] for i in remote])
+            for index, result in zip(remote, fetched):
+                results[index] = result
+            puts = self._indexed_puts(ops)
+            texts = [self._text(op.value) for op in puts if op.value is not None]
+            vectors = await self.embeddings.aembed_documents(texts) if texts else []
+            self._apply(puts, vectors)
+        return results
+
+    def invalidate(self, namespace: tuple[str, ...] | None = None) -> None:
+        """Drop the mirror of ``namespace`` (all mirrors by default)."""
+        if namespace is None:
+            self._indexes.clear()
+        else:
+            self._indexes.pop(tuple(namespace), None)
+
+    def _is_local(self, op: Op) -> bool:
+        if not isinstance(op, SearchOp) or not op.query:
+            return False
+        if any(isinstance(value, dict) for value in (op.filter or {}).values()):
+            return False
+        return any(
+            len(pattern) == len(op.namespace_prefix)
+            and all(p in ("*", s) for p, s in zip(pattern, op.namespace_prefix))
+            for pattern in self.namespaces
+        )
+
+    def _loaded(self, prefix: tuple[str, ...]) -> VectorIndex | None:
+        entry = self._indexes.get(prefix)
+        if entry is None:
+            return None
+        index, loaded_at = entry
+        if self.refresh_interval is not None:
+            if self.clock() - loaded_at >= self.refresh_interval:
+                return None
+        return index
+
+    def _index(self, op: SearchOp) -> VectorIndex:
+        prefix = op.namespace_prefix
+        index = self._loaded(prefix)
+        if index is None:
+            items, offset = [], 0
+            while True:
+                page = self.store.search(prefix, limit=self.page_size, offset=offset)
+                items += page
+                if len(page) < self.page_size:
+                    break
+                offset += self.page_size
+            texts = [self._text(item.value) for item in items]
+            vectors = self.embeddings.embed_documents(texts) if texts else []
+            index = self._build(prefix, items, vectors)
+        return index
+
+    async def _aindex(self, op: SearchOp) -> VectorIndex:
+        prefix = op.namespace_prefix
+        index = self._loaded(prefix)
+        if index is None:
+            items, offset = [], 0
+            while True:
+                page = await self.store.asearch(
+                    prefix, limit=self.page_size, offset=offset
+                )
+                items += page
+                if len(page) < self.page_size:
+                    break
+                offset += self.page_size
+            texts = [self._text(item.value) for item in items]
+            vectors = await self.embeddings.aembed_documents(texts) if texts else []
+            index = self._build(prefix, items, vectors)
+        return index
+
+    def _build(self, prefix: tuple, items: list[Item], vectors: list) -> VectorIndex:
+        index = VectorIndex(capacity=len(items))
+        for item, vector in zip(items, vectors):
+            index.upsert((item.namespace, item.key), vector, _as_item(item))
+        self._indexes.set(prefix, (index, self.clock()))
+        _logger.debug("Mirrored %s items of %s", len(items), prefix)
+        return index
+
+    def _search(self, index: VectorIndex, op: SearchOp, vector) -> list[SearchItem]:
+        if op.filter:
+            hits = [
+                hit
+                for hit in index.search(vector, limit=len(index))
+                if all(hit[2].value.get(k) == v for k, v in op.filter.items())
+            ]
+        else:
+            hits = index.search(vector, limit=op.offset + op.limit)
+        self.local_searches += 1
+        start, end = op.offset, op.offset + op.limit
+        return [
+            SearchItem(
+                namespace=item.namespace,
+                key=item.key,
+                value=item.value,
+                created_at=item.created_at,
+                updated_at=item.updated_at,
+                score=score,
+            )
+            for _, score, item in hits[start:end]
+        ]
+
+    def _indexed_puts(self, ops: list[Op]) -> list[PutOp]:
+        return [
+            op
+            for op in ops
+            if isinstance(op, PutOp)
+            and op.index is not False
+            and any(
+                op.namespace[: len(prefix)] == prefix
+                for prefix, _ in self._indexes.items()
+            )
+        ]
+
+    def _apply(self, puts: list[PutOp], vectors: list) -> None:
+        vectors = iter(vectors)
+        now = datetime.now(timezone.utc)
+        for op in puts:
+            vector = None if op.value is None else next(vectors)
+            for prefix, (index, _) in self._indexes.items():
+                if op.namespace[: len(prefix)] != prefix:
+                    continue
+                if vector is None:
+                    index.remove((op.namespace, op.key))
+                    continue
+                current = index.get((op.namespace, op.key))
+                item = Item(
+                    value=op.value,
+                    key=op.key,
+                    namespace=op.namespace,
+                    created_at=current.created_at if current else now,
+                    updated_at=now,
+                )
+                index.upsert((op.namespace, op.key), vector, item)
+
+    def _text(self, value: dict) -> str:
+        if self.fields is None:
+            return json.dumps(value, sort_keys=True, default=str)
+        return " ".join(
+            str(value[field]) for field in self.fields if value.get(field) is not None
+        )
+
+
+def _as_item(item: Item) -> Item:
+    # Search results carry a score, the mirror keeps plain items
+    return Item(
+        value=item.value,
+        key=item.key,
+        namespace=item.namespace,
+        created_at=item.created_at,
+        updated_at=item.updated_at,
+    )
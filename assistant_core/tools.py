@@ -0,0 +1,502 @@
+"""Tool helpers: memoized schema conversion/binding and bounded execution.
+
+``bind_tools`` converts every tool to an OpenAI function schema from scratch
+each time it is called. These helpers cache the conversion per tool object
+and the bound model per (model, tool schemas), so rebuilding a graph with the
+same tools does no schema work.
+
+``ToolExecutor`` limits how many tool calls run at once and how long each
+may take. ``CachedTool`` serves repeated calls from a ``ToolResultCache``.
+``ToolSelector`` picks the tools relevant to a question so only those are
+bound to the model.
+"""
+
+import asyncio
+import contextlib
+import hashlib
+import json
+import logging
+import time
+from typing import TYPE_CHECKING, Any, Awaitable, Callable
+
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForToolRun,
+    CallbackManagerForToolRun,
+)
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, ToolMessage
+from langchain_core.runnables import Runnable, RunnableConfig, patch_config
+from langchain_core.tools import BaseTool
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+from assistant_core.cache import LRUCache
+from assistant_core.vectors import EmbeddingCache
+
+if TYPE_CHECKING:
+    from langgraph.prebuilt import ToolNode
+
+    from assistant_core.vectors import VectorIndex
+
+_logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_SCHEMAS = 1024
+DEFAULT_MAX_BOUND_MODELS = 256
+
+# Entries keep a strong reference to the tool/model they were built for, so
+# the ``id()`` used in the key cannot be reused while the entry is cached.
+_schemas = LRUCache(max_size=DEFAULT_MAX_SCHEMAS)
+_bound_models = LRUCache(max_size=DEFAULT_MAX_BOUND_MODELS)
+
+
+def tool_schema(tool: Any) -> tuple[dict, str] | None:
+    """Return the OpenAI tool schema and its hash for ``tool``.
+
+    Returns ``None`` when the object cannot be converted; such tools are bound
+    as-is and disable memoization of the bound model.
+    """
+    cached = _schemas.get(id(tool))
+    if cached is not None and cached[0] is tool:
+        return cached[1]
+
+    try:
+        schema = convert_to_openai_tool(tool)
+    except (AttributeError, TypeError, ValueError):
+        _logger.debug("Could not convert %r to a tool schema", tool)
+        return None
+    digest = hashlib.sha256(
+        json.dumps(schema, sort_keys=True, default=str).encode()
+    ).hexdigest()
+    _schemas.set(id(tool), (tool, (schema, digest)))
+    return schema, digest
+
+
+def bind_tools(model: BaseChatModel, tools: list) -> Runnable:
+    """Bind ``tools`` to ``model`` reusing cached schemas and bound models."""
+    schemas = [tool_schema(tool) for tool in tools]
+    if any(schema is None for schema in schemas):
+        return model.bind_tools(tools)
+
+    key = (id(model), tuple(digest for _, digest in schemas))
+    cached = _bound_models.get(key)
+    if cached is not None and cached[0] is model:
+        return cached[1]
+
+    bound = model.bind_tools([schema for schema, _ in schemas])
+    _bound_models.set(key, (model, bound))
+    return bound
+
+
+def cache_stats() -> dict[str, dict[str, int]]:
+    """Return the counters of the schema and bound model caches."""
+    return {"schemas": _schemas.stats(), "bound_models": _bound_models.stats()}
+
+
+def clear_cache() -> None:
+    _schemas.clear()
+    _bound_models.clear()
+
+
+class ToolExecutor:
+    """Bounded-concurrency tool execution for ``ToolNode``.
+
+    Used as the node's ``awrap_tool_call`` interceptor: tool calls wait for a
+    global and a per-tool slot, run with an optional timeout and are timed
+    per tool. A call that times out returns an error ``ToolMessage`` with a
+    JSON payload the model can read instead of failing the turn.
+
+    Semaphores bind to the running event loop, use one executor per loop.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int | None = None,
+        *,
+        tool_concurrency: dict[str, int] | None = None,
+        timeout: float | None = None,
+        tool_timeouts: dict[str, float] | None = None,
+    ):
+        self.max_concurrency = max_concurrency
+        self.tool_concurrency = tool_concurrency or {}
+        self.timeout = timeout
+        self.tool_timeouts = tool_timeouts or {}
+        self.metrics: dict[str, dict[str, float]] = {}
+        self._semaphore = None
+        self._tool_semaphores: dict[str, asyncio.Semaphore] = {}
+
+    def tool_node(self, tools: list, **kwargs) -> "ToolNode":
+        """Return a ``ToolNode`` whose calls go through this executor."""
+        from langgraph.prebuilt import ToolNode
+
+        return ToolNode(tools, awrap_tool_call=self, **kwargs)
+
+    async def __call__(self, request, execute):
+        name = request.tool_call["name"]
+        timeout = self.tool_timeouts.get(name, self.timeout)
+        metrics = self.metrics.setdefault(
+            name,
+            {
+                "calls": 0,
+                "errors": 0,
+                "timeouts": 0,
+                "queue_time": 0.0,
+                "total_time": 0.0,
+                "max_time": 0.0,
+            },
+        )
+        queued_at = time.perf_counter()
+        async with contextlib.AsyncExitStack() as stack:
+            for semaphore in self._semaphores(name):
+                await stack.enter_async_context(semaphore)
+            started_at = time.perf_counter()
+            metrics["calls"] += 1
+            metrics["queue_time"] += started_at - queued_at
+            try:
+                result = await asyncio.wait_for(execute(request), timeout)
+            except asyncio.TimeoutError:
+                metrics["timeouts"] += 1
+                _logger.warning("Tool %s timed out after %ss", name, timeout)
+                return timeout_message(request.tool_call, timeout)
+            except Exception:
+                metrics["errors"] += 1
+                raise
+            else:
+                # ToolNode turns handled exceptions into error messages
+                if getattr(result, "status", None) == "error":
+                    metrics["errors"] += 1
+                return result
+            finally:
+                elapsed = time.perf_counter() - started_at
+                metrics["total_time"] += elapsed
+                metrics["max_time"] = max(metrics["max_time"], elapsed)
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        """Return per-tool call counts and timings (seconds)."""
+        return {name: dict(values) for name, values in self.metrics.items()}
+
+    def _semaphores(self, name: str) -> list[asyncio.Semaphore]:
+        # The per-tool slot is taken first so a call waiting on a busy tool
+        # does not hold a global slot.
+        semaphores = []
+        limit = self.tool_concurrency.get(name)
+        if limit:
+            if name not in self._tool_semaphores:
+                self._tool_semaphores[name] = asyncio.Semaphore(limit)
+            semaphores.append(self._tool_semaphores[name])
+        if self.max_concurrency:
+            if self._semaphore is None:
+                self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            semaphores.append(self._semaphore)
+        return semaphores
+
+
+def timeout_message(tool_call: dict, timeout: float | None) -> ToolMessage:
+    """Return the structured result sent to the model for a timed out call."""
+    content = {
+        "error": "timeout",
+        "tool": tool_call["name"],
+        "timeout_seconds": timeout,
+        "message": "The tool did not answer in time. Try again or continue "
+        "without this result.",
+    }
+    return ToolMessage(
+        content=json.dumps(content),
+        tool_call_id=tool_call["id"],
+        name=tool_call["name"],
+        status="error",
+    )
+
+
+class _Abandoned(Exception):
+    """The coalesced call was cancelled before producing a result."""
+
+
+DEFAULT_RESULT_TTL = 300
+DEFAULT_MAX_RESULTS = 1024
+
+
+class ToolResultCache:
+    """TTL cache of tool results with in-flight request coalescing.
+
+    Keys are built from the tool name, the identity of the tool
+    configuration (see ``tool_identity``), the normalized ``query`` (trimmed,
+    lowercased, single spaces) and the remaining non-empty arguments, so one
+    cache can be shared by differently configured tools. Concurrent calls
+    with the same key share one outbound call. Exceptions and error results
+    (a dict with an ``error`` key, as returned by ``TavilySearch``) are never
+    cached.
+    """
+
+    def __init__(
+        self,
+        ttl: float | None = DEFAULT_RESULT_TTL,
+        max_size: int | None = DEFAULT_MAX_RESULTS,
+    ):
+        self._results = LRUCache(max_size=max_size, ttl=ttl)
+        self._inflight: dict[str, asyncio.Future] = {}
+        self.coalesced = 0
+
+    def make_key(self, tool_name: str, args: dict, tool_key: str = "") -> str:
+        normalized = {
+            key: value for key, value in args.items() if value not in (None, [], {})
+        }
+        if isinstance(normalized.get("query"), str):
+            normalized["query"] = " ".join(normalized["query"].lower().split())
+        return json.dumps(
+            [tool_name, tool_key, normalized], sort_keys=True, default=str
+        )
+
+    def get_or_run(self, key: str, run: Callable[[], Any]) -> Any:
+        """Return the cached result for ``key`` or call ``run`` and cache it."""
+        result = self._results.get(key)
+        if result is None:
+            result = run()
+            if _cacheable(result):
+                self._results.set(key, result)
+        return result
+
+    async def aget_or_run(self, key: str, run: Callable[[], Awaitable]) -> Any:
+        """Async ``get_or_run`` that coalesces concurrent identical calls.
+
+        When the call that runs ``run`` is cancelled (client disconnect,
+        timeout) its waiters are not: one of them runs it instead.
+        """
+        while True:
+            result = self._results.get(key)
+            if result is not None:
+                return result
+
+            inflight = self._inflight.get(key)
+            if inflight is None:
+                break
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(inflight)
+            except _Abandoned:
+                continue
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await run()
+        except asyncio.CancelledError:
+            future.set_exception(_Abandoned())
+            future.exception()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            # Mark as retrieved, waiters (if any) get the exception anyway
+            future.exception()
+            raise
+        else:
+            if _cacheable(result):
+                self._results.set(key, result)
+            future.set_result(result)
+            return result
+        finally:
+            del self._inflight[key]
+
+    def stats(self) -> dict[str, int]:
+        return {**self._results.stats(), "coalesced": self.coalesced}
+
+    def clear(self) -> None:
+        self._results.clear()
+
+
+def _cacheable(result: Any) -> bool:
+    return not (isinstance(result, dict) and "error" in result)
+
+
+def tool_identity(tool: BaseTool) -> str:
+    """Return a digest of the configuration of ``tool``.
+
+    Covers the fields a tool class adds to ``BaseTool`` (for ``TavilySearch``
+    ``max_results``, ``topic``, domains, the API key and base URL), secrets
+    included as hashes.
+    """
+
+    def default(value: Any) -> str:
+        if hasattr(value, "get_secret_value"):
+            secret = value.get_secret_value().encode()
+            return hashlib.sha256(secret).hexdigest()
+        return repr(value)
+
+    try:
+        fields = tool.model_dump(exclude=set(BaseTool.model_fields))
+    except Exception:
+        return f"{type(tool).__qualname__}:{id(tool)}"
+    payload = json.dumps(
+        [type(tool).__qualname__, fields], sort_keys=True, default=default
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class CachedTool(BaseTool):
+    """Tool wrapper that serves results from a ``ToolResultCache``.
+
+    Exposes the wrapped tool name, description and arguments, so the model
+    sees the same tool. The run config and callbacks are passed to the
+    wrapped tool.
+    """
+
+    tool: BaseTool
+    cache: ToolResultCache
+    tool_key: str = ""
+
+    model_config = {"arbitrary_types_allowed": True}
+
+    @classmethod
+    def wrap(cls, tool: BaseTool, cache: ToolResultCache) -> "CachedTool":
+        return cls(
+            tool=tool,
+            cache=cache,
+            tool_key=tool_identity(tool),
+            name=tool.name,
+            description=tool.description,
+            args_schema=tool.args_schema,
+            response_format=tool.response_format,
+        )
+
+    def _run(
+        self,
+        *,
+        config: RunnableConfig,
+        run_manager: CallbackManagerForToolRun | None = None,
+        **kwargs,
+    ) -> Any:
+        key = self.cache.make_key(self.name, kwargs, self.tool_key)
+        config = _child_config(config, run_manager)
+        return self.cache.get_or_run(key, lambda: self.tool.invoke(kwargs, config))
+
+    async def _arun(
+        self,
+        *,
+        config: RunnableConfig,
+        run_manager: AsyncCallbackManagerForToolRun | None = None,
+        **kwargs,
+    ) -> Any:
+        key = self.cache.make_key(self.name, kwargs, self.tool_key)
+        config = _child_config(config, run_manager)
+        return await self.cache.aget_or_run(
+            key, lambda: self.tool.ainvoke(kwargs, config)
+        )
+
+
+def _child_config(config: RunnableConfig, run_manager: Any) -> RunnableConfig:
+    if run_manager is None:
+        return config
+    return patch_config(config, callbacks=run_manager.get_child())
+
+
+DEFAULT_TOP_K = 5
+DEFAULT_MAX_TOOL_SETS = 32
+
+
+class ToolSelector:
+    """Select the ``k`` tools most relevant to a question.
+
+    Tool names and descriptions are embedded once per tool set (``index``,
+    called at build time) into a ``VectorIndex``. Tools listed in ``always``
+    are always selected. The selection keeps the original tool order, so a
+    recurring subset reuses its cached bound model (see ``bind_tools``).
+
+    Query embeddings are memoized in an ``EmbeddingCache``, so the model
+    calls of one tool loop embed their (identical) query once.
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        k: int = DEFAULT_TOP_K,
+        always: list[str] | None = None,
+        min_score: float | None = None,
+    ):
+        if not isinstance(embeddings, EmbeddingCache):
+            embeddings = EmbeddingCache(embeddings)
+        self.embeddings = embeddings
+        self.k = k
+        self.always = set(always or [])
+        self.min_score = min_score
+        self._indexes = LRUCache(max_size=DEFAULT_MAX_TOOL_SETS)
+
+    def index(self, tools: list) -> "VectorIndex":
+        """Embed ``tools`` unless this tool set is already indexed."""
+        key = self._key(tools)
+        index = self._indexes.get(key)
+        if index is None:
+            texts = [self._text(tool) for tool in tools]
+            index = self._build(tools, self.embeddings.embed_documents(texts))
+            self._indexes.set(key, index)
+        return index
+
+    async def aindex(self, tools: list) -> "VectorIndex":
+        key = self._key(tools)
+        index = self._indexes.get(key)
+        if index is None:
+            texts = [self._text(tool) for tool in tools]
+            index = self._build(tools, await self.embeddings.aembed_documents(texts))
+            self._indexes.set(key, index)
+        return index
+
+    def query(self, messages: list[BaseMessage]) -> str | None:
+        """Return the text tools are selected for.
+
+        The latest user message, preceded by the answer it replies to, so
+        confirmations like "yes, do it" are matched with what they confirm.
+        """
+        question = None
+        for message in reversed(messages):
+            if question is None:
+                if isinstance(message, HumanMessage):
+                    question = message.text
+            elif isinstance(message, HumanMessage):
+                break
+            elif isinstance(message, AIMessage) and message.text:
+                return f"{message.text}\n{question}"
+        return question
+
+    def select(self, tools: list, query: str | None) -> list:
+        if not self._needs_selection(tools, query):
+            return tools
+        vector = self.embeddings.embed_query(query)
+        return self._select(tools, self.index(tools), vector)
+
+    async def aselect(self, tools: list, query: str | None) -> list:
+        if not self._needs_selection(tools, query):
+            return tools
+        vector = await self.embeddings.aembed_query(query)
+        return self._select(tools, await self.aindex(tools), vector)
+
+    def _needs_selection(self, tools: list, query: str | None) -> bool:
+        return bool(query) and len(tools) > self.k + len(self.always)
+
+    def _select(self, tools: list, index: "VectorIndex", vector) -> list:
+        hits = index.search(vector, limit=self.k, min_score=self.min_score)
+        selected = {position for _, _, position in hits}
+        return [
+            tool
+            for position, tool in enumerate(tools)
+            if position in selected or _tool_name(tool) in self.always
+        ]
+
+    def _build(self, tools: list, vectors: list) -> "VectorIndex":
+        from assistant_core.vectors import VectorIndex
+
+        index = VectorIndex(capacity=len(tools))
+        for position, vector in enumerate(vectors):
+            index.upsert(position, vector, position)
+        return index
+
+    def _key(self, tools: list) -> tuple:
+        schemas = [tool_schema(tool) for tool in tools]
+        return tuple(
+            schema[1] if schema else repr(tool) for tool, schema in zip(tools, schemas)
+        )
+
+    def _text(self, tool: Any) -> str:
+        description = getattr(tool, "description", "") or ""
+        return f"{_tool_name(tool)}: {description}"
+
+
+def _tool_name(tool: Any) -> str:
+    return getattr(tool, "name", None) or getattr(tool, "__name__", repr(tool))
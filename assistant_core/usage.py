@@ -0,0 +1,165 @@
+"""Token and cost accounting of model calls.
+
+``UsageTracker`` accumulates the ``usage_metadata`` of every model call made
+by ``UsesModel`` nodes that were given the tracker (``usage_tracker=``):
+input, output, cached and reasoning tokens, call count, model time and the
+cost estimated from ``MODEL_COSTS``. Totals are kept per node, per agent
+(the ``active_agent`` of multi-agent graphs, or the agent node name), per
+thread and per model. Each call is also passed to the ``sinks`` callbacks as
+a ``UsageRecord``.
+
+Responses served from the response cache are not counted, they cost nothing.
+"""
+
+import logging
+import threading
+from dataclasses import asdict, dataclass
+from typing import Any, Callable
+
+from assistant_core.cache import LRUCache
+from assistant_core.models import estimate_cost
+
+_logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_THREADS = 10_000
+USAGE_FIELDS = (
+    "calls",
+    "input_tokens",
+    "output_tokens",
+    "cached_tokens",
+    "reasoning_tokens",
+    "duration",
+    "cost",
+)
+
+
+@dataclass
+class UsageRecord:
+    """Usage of one model call."""
+
+    node: str
+    agent: str
+    thread_id: str | None
+    model: str | None
+    input_tokens: int
+    output_tokens: int
+    cached_tokens: int
+    reasoning_tokens: int
+    duration: float
+    cost: float | None
+
+    def totals(self) -> dict[str, float]:
+        """Return the record as counters that can be summed."""
+        values = asdict(self)
+        values["calls"] = 1
+        values["cost"] = self.cost or 0.0
+        return {field: values[field] for field in USAGE_FIELDS}
+
+
+def usage_record(
+    response: Any,
+    *,
+    node: str,
+    agent: str = "",
+    thread_id: str | None = None,
+    model: str | None = None,
+    duration: float = 0.0,
+) -> UsageRecord | None:
+    """Build the record of ``response``, None when it carries no usage."""
+    usage = getattr(response, "usage_metadata", None)
+    if not usage:
+        return None
+    metadata = getattr(response, "response_metadata", None) or {}
+    model = metadata.get("model_name") or metadata.get("model") or model
+    input_tokens = usage.get("input_tokens", 0)
+    output_tokens = usage.get("output_tokens", 0)
+    cached = (usage.get("input_token_details") or {}).get("cache_read", 0) or 0
+    reasoning = (usage.get("output_token_details") or {}).get("reasoning", 0) or 0
+    return UsageRecord(
+        node=node,
+        agent=agent,
+        thread_id=thread_id,
+        model=model,
+        input_tokens=input_tokens,
+        output_tokens=output_tokens,
+        cached_tokens=cached,
+        reasoning_tokens=reasoning,
+        duration=duration,
+        cost=estimate_cost(model, input_tokens, output_tokens, cached),
+    )
+
+
+class UsageTracker:
+    """Accumulate model usage per node, agent, thread and model."""
+
+    def __init__(
+        self,
+        sinks: list[Callable[[UsageRecord], Any]] | None = None,
+        max_threads: int | None = DEFAULT_MAX_THREADS,
+    ):
+        """Create the tracker.
+
+        :param sinks: Callbacks receiving every ``UsageRecord``; exceptions
+            raised by a sink are logged and ignored.
+        :param max_threads: Threads kept, least recently used are dropped.
+        """
+        self.sinks = list(sinks or [])
+        self._lock = threading.Lock()
+        self._total = _empty()
+        self._nodes: dict[str, dict] = {}
+        self._agents: dict[str, dict] = {}
+        self._models: dict[str, dict] = {}
+        self._threads = LRUCache(max_size=max_threads)
+
+    def record(self, record: UsageRecord) -> None:
+        totals = record.totals()
+        with self._lock:
+            _add(self._total, totals)
+            _add(self._nodes.setdefault(record.node, _empty()), totals)
+            _add(self._agents.setdefault(record.agent, _empty()), totals)
+            _add(self._models.setdefault(record.model or "", _empty()), totals)
+            if record.thread_id is not None:
+                thread = self._threads.get_or_create(record.thread_id, _empty)
+                _add(thread, totals)
+        for sink in self.sinks:
+            try:
+                sink(record)
+            except Exception:
+                _logger.exception("Usage sink %r failed", sink)
+
+    def thread(self, thread_id: str) -> dict[str, float]:
+        """Return the totals of one thread (zeros if unknown)."""
+        with self._lock:
+            return dict(self._threads.get(thread_id) or _empty())
+
+    def stats(self) -> dict[str, Any]:
+        """Return the totals overall and per node, agent, model and thread."""
+        with self._lock:
+            return {
+                "total": dict(self._total),
+                "nodes": _copy(self._nodes),
+                "agents": _copy(self._agents),
+                "models": _copy(self._models),
+                "threads": {key: dict(value) for key, value in self._threads.items()},
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._total = _empty()
+            self._nodes.clear()
+            self._agents.clear()
+            self._models.clear()
+            self._threads.clear()
+
+
+def _empty() -> dict[str, float]:
+    return dict.fromkeys(USAGE_FIELDS, 0)
+
+
+def _add(totals: dict, values: dict) -> None:
+    for field, value in values.items():
+        totals[field] += value
+
+
+def _copy(groups: dict[str, dict]) -> dict[str, dict]:
+    return {key: dict(values) for key, values in groups.items()}
@@ -0,0 +1,153 @@
+"""In-process vector index and embedding cache.
+
+``VectorIndex`` keeps L2-normalized vectors in a NumPy matrix and answers
+cosine top-k queries with one matrix product, so small, rarely changing
+collections (FAQs, cached answers, tool descriptions) are searched in
+microseconds instead of a network round trip. Rows are added and removed in
+place; the matrix grows geometrically.
+
+``EmbeddingCache`` memoizes query embeddings of a LangChain ``Embeddings``.
+
+NumPy is an optional dependency (the ``vectors`` extra:
+``pip install assistant-core[vectors]``), imported when an index is created.
+"""
+
+from typing import Any, Hashable, Sequence
+
+from langchain_core.embeddings import Embeddings
+
+from assistant_core.cache import LRUCache
+
+DEFAULT_CAPACITY = 64
+DEFAULT_MAX_QUERIES = 1024
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError(
+            "numpy is not installed. Please install it with `pip install numpy`."
+        ) from None
+    return numpy
+
+
+class VectorIndex:
+    """Cosine similarity index over ``key -> (vector, value)`` entries."""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        self.np = _numpy()
+        self._capacity = max(capacity, 1)
+        self._matrix = None
+        self._keys: list[Hashable] = []
+        self._values: list[Any] = []
+        self._rows: dict[Hashable, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._rows
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        row = self._rows.get(key)
+        return default if row is None else self._values[row]
+
+    def upsert(self, key: Hashable, vector: Sequence[float], value: Any = None):
+        """Add or replace the entry for ``key``."""
+        vector = self._normalize(vector)
+        if self._matrix is None:
+            self._matrix = self.np.zeros((self._capacity, len(vector)), "float32")
+        elif len(vector) != self._matrix.shape[1]:
+            raise ValueError(
+                f"Expected {self._matrix.shape[1]} dimensions, got {len(vector)}."
+            )
+
+        row = self._rows.get(key)
+        if row is None:
+            row = len(self._keys)
+            if row == len(self._matrix):
+                grown = self.np.zeros_like(self._matrix, shape=(2 * row, vector.size))
+                grown[:row] = self._matrix
+                self._matrix = grown
+            self._rows[key] = row
+            self._keys.append(key)
+            self._values.append(value)
+        else:
+            self._values[row] = value
+        self._matrix[row] = vector
+
+    def remove(self, key: Hashable) -> bool:
+        """Remove ``key``, moving the last row into its place."""
+        row = self._rows.pop(key, None)
+        if row is None:
+            return False
+        last = len(self._keys) - 1
+        if row != last:
+            self._matrix[row] = self._matrix[last]
+            self._keys[row] = self._keys[last]
+            self._values[row] = self._values[last]
+            self._rows[self._keys[row]] = row
+        self._keys.pop()
+        self._values.pop()
+        return True
+
+    def clear(self) -> None:
+        self._keys.clear()
+        self._values.clear()
+        self._rows.clear()
+
+    def search(
+        self, vector: Sequence[float], limit: int = 10, min_score: float | None = None
+    ) -> list[tuple[Hashable, float, Any]]:
+        """Return up to ``limit`` ``(key, score, value)`` by decreasing score."""
+        size = len(self._keys)
+        if not size or limit <= 0:
+            return []
+        scores = self._matrix[:size] @ self._normalize(vector)
+        if limit < size:
+            top = self.np.argpartition(-scores, limit - 1)[:limit]
+        else:
+            top = self.np.arange(size)
+        top = top[self.np.argsort(-scores[top], kind="stable")]
+        return [
+            (self._keys[row], float(scores[row]), self._values[row])
+            for row in top
+            if min_score is None or scores[row] >= min_score
+        ]
+
+    def _normalize(self, vector: Sequence[float]):
+        vector = self.np.asarray(vector, dtype="float32").ravel()
+        norm = self.np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+
+class EmbeddingCache(Embeddings):
+    """``Embeddings`` wrapper that caches query embeddings by text."""
+
+    def __init__(
+        self, embeddings: Embeddings, max_size: int | None = DEFAULT_MAX_QUERIES
+    ):
+        self.embeddings = embeddings
+        self._queries = LRUCache(max_size=max_size)
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return self.embeddings.embed_documents(texts)
+
+    async def aembed_documents(self, texts: list[str]) -> list[list[float]]:
+        return await self.embeddings.aembed_documents(texts)
+
+    def embed_query(self, text: str) -> list[float]:
+        return self._queries.get_or_create(
+            text, lambda: self.embeddings.embed_query(text)
+        )
+
+    async def aembed_query(self, text: str) -> list[float]:
+        vector = self._queries.get(text)
+        if vector is None:
+            vector = await self.embeddings.aembed_query(text)
+            self._queries.set(text, vector)
+        return vector
+
+    def stats(self) -> dict[str, int]:
+        return self._queries.stats()
@@ -0,0 +1,95 @@
+"""Compare checkpoint serializers on a growing support thread.
+
+Each turn appends a prompt, a question, a tool call with a large result and an
+answer; the messages channel is serialized after every turn, as a checkpointer
+does on every superstep. Reports total bytes written and encode/decode time.
+
+    python benchmarks/checkpoint_serializer.py [--turns 50] [--repeat 5]
+"""
+
+import argparse
+import time
+
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+from assistant_core.checkpoint import CompactSerializer
+
+PROMPT = (
+    "CONTEXT: You are the support agent of ACME. Answer in the language of the "
+    "user, keep answers short and ask before creating tickets. "
+) * 4
+
+
+def turn_messages(turn: int) -> list:
+    result = " ".join(f"result {turn}.{i}: ACME plan details" for i in range(80))
+    return [
+        SystemMessage(PROMPT),
+        HumanMessage(f"Question number {turn} about my subscription"),
+        AIMessage(
+            "",
+            tool_calls=[
+                {"name": "search", "args": {"query": f"plan {turn}"}, "id": f"c{turn}"}
+            ],
+        ),
+        ToolMessage(result, tool_call_id=f"c{turn}", name="search"),
+        AIMessage(f"Here is the answer to question {turn}."),
+    ]
+
+
+def snapshots(turns: int) -> list[list]:
+    messages, result = [], []
+    for turn in range(turns):
+        messages = messages + turn_messages(turn)
+        result.append(messages)
+    return result
+
+
+def measure(serde, values: list, repeat: int) -> tuple[int, float, float]:
+    written = [serde.dumps_typed(value) for value in values]
+    size = sum(len(data) for _, data in written)
+    encode = decode = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for value in values:
+            serde.dumps_typed(value)
+        encode = min(encode, time.perf_counter() - start)
+        start = time.perf_counter()
+        for data in written:
+            serde.loads_typed(data)
+        decode = min(decode, time.perf_counter() - start)
+    return size, encode, decode
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--turns", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    serializers = {
+        "default (msgpack)": JsonPlusSerializer,
+        "compact, no compression": lambda: CompactSerializer(compression=None),
+        "compact, zlib": CompactSerializer,
+        "compact, zstd": lambda: CompactSerializer(compression="zstd"),
+    }
+    values = snapshots(args.turns)
+    baseline = None
+    print(
+        f"{'serializer':<26}{'bytes':>12}{'ratio':>8}{'encode ms':>12}{'decode ms':>12}"
+    )
+    for name, create in serializers.items():
+        try:
+            size, encode, decode = measure(create(), values, args.repeat)
+        except ImportError as exc:
+            print(f"{name:<26}skipped: {exc}")
+            continue
+        baseline = baseline or size
+        print(
+            f"{name:<26}{size:>12}{size / baseline:>8.2f}"
+            f"{encode * 1000:>12.1f}{decode * 1000:>12.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
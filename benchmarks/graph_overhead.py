@@ -0,0 +1,277 @@
+"""Measure the framework overhead of building and running an agent graph.
+
+Runs offline with a deterministic fake chat model and fake tools:
+
+- ``context``: eager and lazy ``BuilderContext`` construction.
+- ``build``: ``make()`` + ``compile()`` as builder and tool counts grow, for
+  ``SingleAgent`` and ``MultiAgent``.
+- ``turn``: time per turn minus the time spent in the model, for a direct
+  answer and for a turn with one tool round trip, the latter also through a
+  ``MultiAgent`` graph (conditional entry point).
+- ``memory``: bytes allocated per thread kept in ``MemorySaver``.
+
+Timings are the best of ``--repeat`` runs. Results are compared with the
+stored baseline, a metric more than ``--threshold`` above it is a regression
+(exit status 1). Baselines are machine dependent; refresh them with
+``--save`` on the machine that runs the comparison.
+
+    python benchmarks/graph_overhead.py [--repeat 5] [--threshold 0.3] [--save]
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.tools import StructuredTool
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.graph import StateGraph
+
+from assistant_core.builder import (
+    BaseBuilder,
+    BuilderContext,
+    MultiAgent,
+    MultiAgentContext,
+    SingleAgent,
+)
+from assistant_core.factories import ContextFactory
+from assistant_core.nodes import AgentNode, PromptNode
+from assistant_core.state import NextProcessState
+
+BASELINE = Path(__file__).with_name("baselines") / "graph_overhead.json"
+CONFIG = ContextFactory.FactoryConfig(OPENAI_API_KEY="benchmark")
+# director -> (director class, context class, metric name prefix)
+DIRECTORS = {
+    "single": (SingleAgent, BuilderContext, ""),
+    "multi": (MultiAgent, MultiAgentContext, "multi_"),
+}
+# (director, builders, tools)
+BUILD_SIZES = [
+    ("single", 0, 0),
+    ("single", 5, 10),
+    ("single", 20, 50),
+    ("multi", 5, 10),
+    ("multi", 20, 50),
+]
+# (metric name, director, tools)
+TURN_CASES = [
+    ("answer", "single", 0),
+    ("tool", "single", 5),
+    ("multi_tool", "multi", 5),
+]
+
+
+class FakeChatModel(BaseChatModel):
+    """Chat model answering instantly and deterministically.
+
+    With tools bound, a new question gets a call to the first tool and the
+    tool result gets the final answer. ``elapsed`` is the time spent inside
+    the model so it can be subtracted from the turn time.
+    """
+
+    elapsed: float = 0.0
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake"
+
+    def bind_tools(self, tools: list, **kwargs):
+        return self.bind(tools=[convert_to_openai_tool(tool) for tool in tools])
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        start = time.perf_counter()
+        tools = kwargs.get("tools")
+        last = [m for m in messages if isinstance(m, (HumanMessage, ToolMessage))]
+        if tools and isinstance(last[-1], HumanMessage):
+            name = tools[0]["function"]["name"]
+            call = {"name": name, "args": {"query": "q"}, "id": f"call_{len(messages)}"}
+            message = AIMessage("", tool_calls=[call])
+        else:
+            message = AIMessage(f"Answer {len(messages)}")
+        self.elapsed += time.perf_counter() - start
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+class PromptBuilder(BaseBuilder):
+    """Pre-agent builder adding one prompt node, like most repo builders."""
+
+    def __init__(self, name: str):
+        super().__init__()
+        self.name = name
+
+    def build(self, context: BuilderContext):
+        node = PromptNode(name=self.name, prompt=f"Context from {self.name}")
+        context.graph_builder.add_node(node.name, node)
+        context.entrypoint = node.name
+
+
+def make_tools(count: int) -> list:
+    def lookup(query: str) -> str:
+        return f"result for {query}"
+
+    return [
+        StructuredTool.from_function(
+            lookup, name=f"tool_{i}", description=f"Look up topic {i}."
+        )
+        for i in range(count)
+    ]
+
+
+def make_context(
+    model, tools: list, lazy: bool = False, context_class=BuilderContext
+) -> BuilderContext:
+    return context_class.create(
+        CONFIG,
+        agent_factory=lambda model: AgentNode(
+            name="agent", model=model, prompts=["You are a support agent."]
+        ),
+        model_factory=lambda _: model,
+        graph_factory=lambda: StateGraph(NextProcessState),
+        base_tools_factory=lambda: list(tools),
+        lazy=lazy,
+    )
+
+
+def make_graph(
+    model, builders: int, tools: list, checkpointer=None, director: str = "single"
+):
+    director_class, context_class, _ = DIRECTORS[director]
+    graph_director = director_class()
+    for i in range(builders):
+        graph_director.add_builder(PromptBuilder(f"prompt_{i}"))
+    context = make_context(model, tools, context_class=context_class)
+    return graph_director.make(context).compile(checkpointer=checkpointer)
+
+
+def best(function, repeat: int, number: int = 1) -> float:
+    """Best time in seconds of ``number`` calls, over ``repeat`` runs."""
+    result = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        result = min(result, (time.perf_counter() - start) / number)
+    return result
+
+
+def bench_context(model, repeat: int) -> dict[str, float]:
+    tools = make_tools(10)
+    return {
+        "context.eager_us": best(lambda: make_context(model, tools), repeat, 200) * 1e6,
+        "context.lazy_us": best(
+            lambda: make_context(model, tools, lazy=True), repeat, 200
+        )
+        * 1e6,
+    }
+
+
+def bench_build(model, repeat: int) -> dict[str, float]:
+    results = {}
+    for director, builders, count in BUILD_SIZES:
+        tools = make_tools(count)
+        prefix = DIRECTORS[director][2]
+        results[f"build.{prefix}b{builders}_t{count}_ms"] = (
+            best(
+                lambda: make_graph(model, builders, tools, director=director), repeat, 5
+            )
+            * 1e3
+        )
+    return results
+
+
+async def run_turns(model, graph, turns: int, thread: str) -> float:
+    """Return the seconds per turn spent outside the model."""
+    config = {"configurable": {"thread_id": thread}}
+    model.elapsed = 0.0
+    start = time.perf_counter()
+    for turn in range(turns):
+        await graph.ainvoke({"messages": [HumanMessage(f"question {turn}")]}, config)
+    return (time.perf_counter() - start - model.elapsed) / turns
+
+
+async def bench_turn(model, repeat: int, turns: int = 20) -> dict[str, float]:
+    results = {}
+    for name, director, count in TURN_CASES:
+        graph = make_graph(model, 3, make_tools(count), MemorySaver(), director)
+        overhead = float("inf")
+        for run in range(repeat):
+            thread = f"{name}-{run}"
+            overhead = min(overhead, await run_turns(model, graph, turns, thread))
+        results[f"turn.{name}_ms"] = overhead * 1e3
+    return results
+
+
+async def bench_memory(model, threads: int = 50, turns: int = 3) -> dict[str, float]:
+    graph = make_graph(model, 3, make_tools(5), MemorySaver())
+    # Warm up caches so they are not attributed to the threads
+    await run_turns(model, graph, turns, "warmup")
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for thread in range(threads):
+        await run_turns(model, graph, turns, f"thread-{thread}")
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return {"memory.thread_kb": (after - before) / threads / 1024}
+
+
+def compare(results: dict[str, float], baseline: dict[str, float], threshold: float):
+    """Print results against the baseline and return the regressed metrics."""
+    regressions = []
+    print(f"{'metric':<24}{'value':>12}{'baseline':>12}{'change':>10}")
+    for name, value in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            print(f"{name:<24}{value:>12.2f}{'-':>12}{'-':>10}")
+            continue
+        change = value / reference - 1 if reference else 0.0
+        flag = ""
+        if change > threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<24}{value:>12.2f}{reference:>12.2f}{change:>+10.0%}{flag}")
+    return regressions
+
+
+async def run(repeat: int) -> dict[str, Any]:
+    model = FakeChatModel()
+    results = bench_context(model, repeat)
+    results.update(bench_build(model, repeat))
+    results.update(await bench_turn(model, repeat))
+    results.update(await bench_memory(model))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--threshold", type=float, default=0.3)
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument("--save", action="store_true", help="store as baseline")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args.repeat))
+    baseline = {}
+    if args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text())
+    regressions = compare(results, baseline, args.threshold)
+
+    if args.save:
+        args.baseline.parent.mkdir(exist_ok=True)
+        rounded = {name: round(value, 3) for name, value in results.items()}
+        args.baseline.write_text(json.dumps(rounded, indent=2) + "\n")
+        print(f"Baseline saved to {args.baseline}")
+    elif regressions:
+        print(f"Regressions above {args.threshold:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
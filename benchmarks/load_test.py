@@ -0,0 +1,519 @@
+"""Drive many concurrent threads through a compiled agent graph.
+
+A local stand-in for the OpenAI chat completions and responses APIs and the
+Tavily search API runs in a background thread with configurable latency
+distributions, tool-call rate and error rate. ``--threads`` workers then send
+turns, each on its own ``thread_id``, through a ``SingleAgent`` or
+``MultiAgent`` graph built with ``ChatOpenAI`` and the Tavily tool for
+``--duration`` seconds.
+
+``--api responses`` (the default) uses the default model settings
+(``load_default_model``: Responses API with ``previous_response_id``, so
+agents send delta messages); the stand-in keeps the conversations and
+rejects unknown previous response ids like the real API. ``--api chat``
+uses Chat Completions.
+
+Reports throughput, p50/p95/p99 turn latency, errors, event-loop lag and
+memory growth; use it to size worker pools before changing them.
+
+Latencies are given as ``fixed:MS``, ``uniform:LOW:HIGH``, ``exp:MEAN`` or
+``lognormal:MEDIAN:SIGMA`` (milliseconds)::
+
+    python benchmarks/load_test.py --threads 200 --duration 30 \\
+        --model-latency lognormal:800:0.6 --search-latency uniform:200:600 \\
+        --tool-call-rate 0.4 --error-rate 0.01
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import resource
+import statistics
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from langchain_core.messages import HumanMessage
+from langchain_openai import ChatOpenAI
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.graph import StateGraph
+
+from assistant_core.builder import (
+    BaseBuilder,
+    BuilderContext,
+    MultiAgent,
+    MultiAgentContext,
+    SingleAgent,
+)
+from assistant_core.builder.tavily import TavilyBuilder
+from assistant_core.factories import ContextFactory
+from assistant_core.models import load_default_model
+from assistant_core.nodes import AgentNode, PromptNode
+from assistant_core.state import MultiAgentState, NextProcessState
+
+AGENTS = ("sales", "support")
+QUESTIONS = [
+    "What plans do you offer?",
+    "Where is my order?",
+    "How do I reset my password?",
+    "Can I get a refund for last month?",
+]
+REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    500: "Internal Server Error",
+}
+
+
+class LoadTestState(MultiAgentState, NextProcessState):
+    pass
+
+
+class Latency:
+    """Latency distribution parsed from ``kind:param[:param]`` (ms)."""
+
+    def __init__(self, spec: str):
+        kind, *params = spec.split(":")
+        self.spec = spec
+        self.kind = kind
+        self.params = [float(param) / 1000 for param in params]
+        if kind == "lognormal":
+            # The sigma is not a duration
+            self.params[1] *= 1000
+        expected = {"fixed": 1, "uniform": 2, "exp": 1, "lognormal": 2}
+        if expected.get(kind) != len(params):
+            raise ValueError(f"Invalid latency {spec!r}.")
+
+    def sample(self, rng: random.Random) -> float:
+        """Return a latency in seconds."""
+        if self.kind == "fixed":
+            return self.params[0]
+        if self.kind == "uniform":
+            return rng.uniform(*self.params)
+        if self.kind == "exp":
+            return rng.expovariate(1 / self.params[0]) if self.params[0] else 0.0
+        median, sigma = self.params
+        return median * rng.lognormvariate(0, sigma)
+
+
+@dataclass
+class StandInConfig:
+    model_latency: Latency = field(default_factory=lambda: Latency("fixed:200"))
+    search_latency: Latency = field(default_factory=lambda: Latency("fixed:300"))
+    tool_call_rate: float = 0.3
+    error_rate: float = 0.0
+    seed: int = 0
+
+
+class StandInServer:
+    """OpenAI- and Tavily-compatible HTTP server with simulated behavior.
+
+    Runs its own event loop in a daemon thread so it does not add lag to the
+    loop under test. Use as a context manager; ``base_url`` is set on enter.
+    """
+
+    def __init__(self, config: StandInConfig):
+        self.config = config
+        self.rng = random.Random(config.seed)
+        self.requests = Counter()
+        # Response id -> number of conversation items, like the server-side
+        # conversation state kept by the responses API
+        self.conversations: dict[str, int] = {}
+        self.base_url = None
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._server = None
+        self._connections = set()
+
+    def __enter__(self):
+        self._thread.start()
+        future = asyncio.run_coroutine_threadsafe(
+            asyncio.start_server(self._handle, "127.0.0.1", 0), self._loop
+        )
+        self._server = future.result()
+        port = self._server.sockets[0].getsockname()[1]
+        self.base_url = f"http://127.0.0.1:{port}"
+        return self
+
+    def __exit__(self, *exc_info):
+        asyncio.run_coroutine_threadsafe(self._shutdown(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    async def _shutdown(self):
+        self._server.close()
+        for task in self._connections:
+            task.cancel()
+        await asyncio.gather(*self._connections, return_exceptions=True)
+
+    async def _handle(self, reader, writer):
+        task = asyncio.current_task()
+        self._connections.add(task)
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                _, path, _ = request_line.decode().split(" ", 2)
+                headers = {}
+                while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    name, _, value = line.decode().partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+                status, payload = await self.route(path, json.loads(body or b"{}"))
+                data = json.dumps(payload).encode()
+                writer.write(
+                    f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+                    "Content-Type: application/json\r\n"
+                    f"Content-Length: {len(data)}\r\n\r\n".encode() + data
+                )
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+            self._connections.discard(task)
+
+    async def route(self, path: str, request: dict) -> tuple[int, dict]:
+        if path.endswith("/chat/completions"):
+            kind, latency = "chat", self.config.model_latency
+        elif path.endswith("/responses"):
+            kind, latency = "responses", self.config.model_latency
+        elif path.endswith("/search"):
+            kind, latency = "search", self.config.search_latency
+        else:
+            return 404, {"error": {"message": f"Unknown path {path}"}}
+        self.requests[kind] += 1
+        await asyncio.sleep(latency.sample(self.rng))
+        if self.rng.random() < self.config.error_rate:
+            self.requests[f"{kind}_errors"] += 1
+            return 500, {"error": {"message": "Simulated failure", "type": "server"}}
+        if kind == "search":
+            return 200, self.search(request)
+        if kind == "responses":
+            return self.response(request)
+        return 200, self.chat_completion(request)
+
+    def chat_completion(self, request: dict) -> dict:
+        messages = request["messages"]
+        # Pre-agent prompts are system messages after the question
+        last = [m for m in messages if m["role"] in ("user", "tool")][-1]
+        message = {"role": "assistant", "content": f"Answer to {len(messages)}."}
+        tools = request.get("tools")
+        if (
+            tools
+            and last["role"] == "user"
+            and self.rng.random() < self.config.tool_call_rate
+        ):
+            call_id = f"call_{self.requests['chat']}"
+            arguments = json.dumps({"query": str(last["content"])[:100]})
+            message = {
+                "role": "assistant",
+                "content": None,
+                "tool_calls": [
+                    {
+                        "id": call_id,
+                        "type": "function",
+                        "function": {
+                            "name": tools[0]["function"]["name"],
+                            "arguments": arguments,
+                        },
+                    }
+                ],
+            }
+        prompt_tokens = sum(len(str(m.get("content") or "")) for m in messages) // 4
+        return {
+            "id": f"chatcmpl-{self.requests['chat']}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request["model"],
+            "choices": [
+                {
+                    "index": 0,
+                    "message": message,
+                    "finish_reason": (
+                        "tool_calls" if message["content"] is None else "stop"
+                    ),
+                }
+            ],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": 10,
+                "total_tokens": prompt_tokens + 10,
+            },
+        }
+
+    def response(self, request: dict) -> tuple[int, dict]:
+        items = request["input"]
+        previous = request.get("previous_response_id")
+        history = 0
+        if previous:
+            if previous not in self.conversations:
+                message = f"Previous response with id '{previous}' not found."
+                return 400, {"error": {"message": message, "type": "invalid_request"}}
+            self.requests["responses_chained"] += 1
+            history = self.conversations[previous]
+        response_id = f"resp_{self.requests['responses']}"
+        inputs = [
+            item
+            for item in items
+            if item.get("role") == "user" or item.get("type") == "function_call_output"
+        ]
+        tools = request.get("tools")
+        if (
+            tools
+            and inputs
+            and inputs[-1].get("role") == "user"
+            and self.rng.random() < self.config.tool_call_rate
+        ):
+            content = inputs[-1]["content"]
+            if isinstance(content, list):
+                content = " ".join(str(part.get("text", "")) for part in content)
+            output = {
+                "type": "function_call",
+                "id": f"fc_{self.requests['responses']}",
+                "call_id": f"call_{self.requests['responses']}",
+                "name": tools[0]["name"],
+                "arguments": json.dumps({"query": str(content)[:100]}),
+                "status": "completed",
+            }
+        else:
+            output = {
+                "type": "message",
+                "id": f"msg_{self.requests['responses']}",
+                "role": "assistant",
+                "status": "completed",
+                "content": [
+                    {
+                        "type": "output_text",
+                        "text": f"Answer to {history + len(items)}.",
+                        "annotations": [],
+                    }
+                ],
+            }
+        self.conversations[response_id] = history + len(items) + 1
+        input_tokens = sum(len(json.dumps(item)) for item in items) // 4
+        return 200, {
+            "id": response_id,
+            "object": "response",
+            "created_at": int(time.time()),
+            "status": "completed",
+            "model": request["model"],
+            "output": [output],
+            "parallel_tool_calls": True,
+            "tool_choice": "auto",
+            "tools": [],
+            "usage": {
+                "input_tokens": input_tokens,
+                "input_tokens_details": {"cached_tokens": 0},
+                "output_tokens": 10,
+                "output_tokens_details": {"reasoning_tokens": 0},
+                "total_tokens": input_tokens + 10,
+            },
+        }
+
+    def search(self, request: dict) -> dict:
+        query = request.get("query", "")
+        results = [
+            {
+                "title": f"Result {i} for {query}",
+                "url": f"https://example.com/{i}",
+                "content": f"Content {i} about {query}. " * 10,
+                "score": 1 - i / 10,
+            }
+            for i in range(request.get("max_results", 2))
+        ]
+        return {"query": query, "results": results, "response_time": 0.1}
+
+
+class EntrypointBuilder(BaseBuilder):
+    """Pre-agent prompt node registered as the entrypoint of one agent."""
+
+    def __init__(self, agent: str):
+        super().__init__()
+        self.agent = agent
+
+    def build(self, context: BuilderContext):
+        node = PromptNode(name=f"prompt_{self.agent}", prompt=f"You do {self.agent}.")
+        context.graph_builder.add_node(node.name, node)
+        context.entrypoint = node.name
+        if isinstance(context, MultiAgentContext):
+            context.entrypoint_mapping[self.agent] = node.name
+
+
+def make_graph(base_url: str, multi: bool, api: str = "responses"):
+    def model_factory(config):
+        if api == "responses":
+            return load_default_model(
+                config["OPENAI_API_KEY"], base_url=f"{base_url}/v1", max_retries=0
+            )
+        return ChatOpenAI(
+            api_key=config["OPENAI_API_KEY"],
+            base_url=f"{base_url}/v1",
+            model="stand-in",
+            max_retries=0,
+        )
+
+    factory = ContextFactory(
+        ContextFactory.FactoryConfig(OPENAI_API_KEY="load-test"),
+        agent_factory=lambda model: AgentNode(
+            name="agent", model=model, prompts=["You are a support agent."]
+        ),
+        model_factory=model_factory,
+        graph_factory=lambda: StateGraph(LoadTestState),
+    )
+    director = MultiAgent() if multi else SingleAgent()
+    context = MultiAgentContext(factory) if multi else BuilderContext(factory)
+    director.add_builder(TavilyBuilder("load-test", api_base_url=base_url))
+    for agent in AGENTS if multi else AGENTS[:1]:
+        director.add_builder(EntrypointBuilder(agent))
+    return director.make(context).compile(checkpointer=MemorySaver())
+
+
+@dataclass
+class Results:
+    latencies: list[float] = field(default_factory=list)
+    errors: Counter = field(default_factory=Counter)
+    lags: list[float] = field(default_factory=list)
+
+
+async def worker(graph, worker_id: int, deadline: float, multi: bool, results):
+    config = {"configurable": {"thread_id": f"load-{worker_id}"}}
+    turn = 0
+    while time.perf_counter() < deadline:
+        state = {"messages": [HumanMessage(QUESTIONS[turn % len(QUESTIONS)])]}
+        if multi:
+            state["active_agent"] = AGENTS[worker_id % len(AGENTS)]
+        start = time.perf_counter()
+        try:
+            await graph.ainvoke(state, config)
+        except Exception as exc:
+            results.errors[type(exc).__name__] += 1
+        else:
+            results.latencies.append(time.perf_counter() - start)
+        turn += 1
+
+
+async def monitor_lag(results: Results, interval: float = 0.05):
+    """Record how late the event loop wakes up after each ``interval``."""
+    while True:
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        results.lags.append(time.perf_counter() - start - interval)
+
+
+def rss_mb() -> float:
+    """Current resident set size, or the peak where /proc is unavailable."""
+    statm = Path("/proc/self/statm")
+    if statm.exists():
+        pages = int(statm.read_text().split()[1])
+        return pages * resource.getpagesize() / 2**20
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def percentile(values: list[float], q: int) -> float:
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100, method="inclusive")[q - 1]
+
+
+async def run(args) -> dict:
+    config = StandInConfig(
+        model_latency=Latency(args.model_latency),
+        search_latency=Latency(args.search_latency),
+        tool_call_rate=args.tool_call_rate,
+        error_rate=args.error_rate,
+        seed=args.seed,
+    )
+    with StandInServer(config) as server:
+        graph = make_graph(server.base_url, args.graph == "multi", args.api)
+        results = Results()
+        memory_before = rss_mb()
+        monitor = asyncio.create_task(monitor_lag(results))
+        start = time.perf_counter()
+        deadline = start + args.duration
+        await asyncio.gather(
+            *(
+                worker(graph, i, deadline, args.graph == "multi", results)
+                for i in range(args.threads)
+            )
+        )
+        elapsed = time.perf_counter() - start
+        monitor.cancel()
+        memory_after = rss_mb()
+
+    latencies = results.latencies
+    return {
+        "threads": args.threads,
+        "duration_s": round(elapsed, 2),
+        "turns": len(latencies),
+        "errors": dict(results.errors),
+        "throughput_tps": round(len(latencies) / elapsed, 2),
+        "latency_ms": {
+            f"p{q}": round(percentile(latencies, q) * 1000, 1) for q in (50, 95, 99)
+        },
+        "loop_lag_ms": {
+            "p50": round(percentile(results.lags, 50) * 1000, 2),
+            "p99": round(percentile(results.lags, 99) * 1000, 2),
+            "max": round(max(results.lags, default=0.0) * 1000, 2),
+        },
+        "memory_mb": {
+            "before": round(memory_before, 1),
+            "after": round(memory_after, 1),
+            "growth_per_thread_kb": round(
+                (memory_after - memory_before) * 1024 / args.threads, 1
+            ),
+        },
+        "stand_in_requests": dict(server.requests),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--graph", choices=["single", "multi"], default="single")
+    parser.add_argument("--api", choices=["responses", "chat"], default="responses")
+    parser.add_argument("--model-latency", default="lognormal:500:0.5")
+    parser.add_argument("--search-latency", default="uniform:100:400")
+    parser.add_argument("--tool-call-rate", type=float, default=0.3)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="print JSON only")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    latency, lag = report["latency_ms"], report["loop_lag_ms"]
+    memory = report["memory_mb"]
+    print(
+        f"threads          {report['threads']} ({args.graph} agent graph, "
+        f"{args.api} API)"
+    )
+    print(f"turns            {report['turns']} in {report['duration_s']} s")
+    print(f"throughput       {report['throughput_tps']} turns/s")
+    print(
+        f"turn latency     p50 {latency['p50']} ms, p95 {latency['p95']} ms, "
+        f"p99 {latency['p99']} ms"
+    )
+    print(f"errors           {report['errors'] or 'none'}")
+    print(
+        f"event-loop lag   p50 {lag['p50']} ms, p99 {lag['p99']} ms, "
+        f"max {lag['max']} ms"
+    )
+    print(
+        f"memory (RSS)     {memory['before']} -> {memory['after']} MB, "
+        f"{memory['growth_per_thread_kb']} KB per thread"
+    )
+    print(f"stand-in         {report['stand_in_requests']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,21 @@
 from unittest import mock
 
 import pytest
+from langchain_core.embeddings import Embeddings
 from langchain_core.language_models.chat_models import BaseChatModel
 
 from assistant_core.builder import BuilderContext, MultiAgentContext
 from assistant_core.factories import ContextFactory
 from assistant_core.nodes import AgentNode
+from assistant_core.registry import ModelRegistry, set_model_registry
+
+
+@pytest.fixture(autouse=True)
+def model_registry():
+    registry = ModelRegistry()
+    previous = set_model_registry(registry)
+    yield registry
+    set_model_registry(previous)
 
 
 @pytest.fixture
@@ -13,6 +23,29 @@ def mock_model():
     return mock.Mock(spec=BaseChatModel)
 
 
+class KeywordEmbeddings(Embeddings):
+    """Deterministic embeddings counting vocabulary words, with call counts."""
+
+    VOCABULARY = ["refund", "money", "shipping", "delivery", "password", "account"]
+
+    def __init__(self):
+        self.calls = 0
+
+    def embed_documents(self, texts):
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text):
+        self.calls += 1
+        words = text.lower().replace("?", " ").split()
+        vector = [float(sum(w.startswith(v) for w in words)) for v in self.VOCABULARY]
+        return vector + [0.1]
+
+
+@pytest.fixture
+def embeddings():
+    return KeywordEmbeddings()
+
+
 @pytest.fixture
 def mock_config():
     return {"configurable": {"thread_id": "test"}}
@@ -173,3 +173,55 @@ def test_multi_agent_context_selector_behavior(context_factory):
     assert selector({"active_agent": "a1"}) == "node_a1"
     # Unknown active_agent → fallback to context.entrypoint (agent node)
     assert selector({"active_agent": "unknown"}) == "test_agent"
+
+
+def test_lazy_context_defers_components(context_factory):
+    with mock.patch.object(
+        context_factory, "create_agent_node", wraps=context_factory.create_agent_node
+    ) as create_agent_node:
+        ctx = BuilderContext(context_factory, lazy=True)
+        assert ctx.materialized == ()
+        create_agent_node.assert_not_called()
+
+        assert ctx.entrypoint == "test_agent"
+        assert ctx.agent_node is ctx.agent_node
+        create_agent_node.assert_called_once_with()
+
+    assert ctx.materialized == ("agent_node",)
+    assert ctx.construction_stats == {
+        "created": ("agent_node",),
+        "avoided": ("model", "graph_builder", "resolver_node", "tools"),
+    }
+
+
+def test_lazy_clone_shares_model_and_stays_lazy(context_factory, mock_model):
+    ctx = BuilderContext(context_factory, lazy=True)
+    model = ctx.model
+
+    cloned = ctx.clone()
+
+    assert cloned.materialized == ()
+    assert cloned.model is model
+    assert isinstance(cloned.graph_builder, StateGraph)
+    assert cloned.graph_builder is not ctx.graph_builder
+
+
+def test_lazy_clone_with_model_override(context_factory):
+    ctx = BuilderContext(context_factory, lazy=True)
+    new_model = mock.Mock(spec=BaseChatModel)
+
+    cloned = ctx.clone(model_factory=lambda _cfg: new_model)
+
+    assert cloned.model is new_model
+    assert ctx.model is not new_model
+
+
+def test_eager_context_materializes_everything(context_factory):
+    ctx = MultiAgentContext(context_factory)
+    assert set(ctx.materialized) == {
+        "model",
+        "graph_builder",
+        "agent_node",
+        "resolver_node",
+        "tools",
+    }
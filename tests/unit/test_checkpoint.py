@@ -0,0 +1,126 @@
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.checkpoint.serde.base import CipherProtocol
+from langgraph.checkpoint.serde.encrypted import EncryptedSerializer
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+from langgraph.graph import START, StateGraph
+
+from assistant_core.checkpoint import CompactSerializer
+from assistant_core.state import NextProcessState
+
+PROMPT = "CONTEXT: You are a support agent for ACME. " * 4
+
+
+def thread(turns=5):
+    messages = []
+    for turn in range(turns):
+        messages += [
+            SystemMessage(PROMPT),
+            HumanMessage(f"question {turn}"),
+            AIMessage(
+                "",
+                tool_calls=[{"name": "search", "args": {"q": turn}, "id": f"c{turn}"}],
+            ),
+            ToolMessage("result " * 200, tool_call_id=f"c{turn}", name="search"),
+            AIMessage(f"answer {turn}"),
+        ]
+    return messages
+
+
+VALUES = [
+    None,
+    b"raw bytes",
+    "next_node",
+    {"question": "Which plan?", "answer": None},
+    {"v": 4, "channel_values": {"next": "agent"}, "channel_versions": {"a": 1}},
+    [HumanMessage("hi")],
+    thread(),
+]
+
+
+@pytest.mark.parametrize("compression", [None, "zlib", "zstd"])
+@pytest.mark.parametrize("value", VALUES)
+def test_round_trip(compression, value):
+    if compression == "zstd":
+        pytest.importorskip("zstandard")
+    serde = CompactSerializer(compression=compression)
+
+    assert serde.loads_typed(serde.dumps_typed(value)) == value
+
+
+def test_loads_default_serializer_output():
+    default = JsonPlusSerializer()
+    serde = CompactSerializer()
+
+    for value in VALUES:
+        assert serde.loads_typed(default.dumps_typed(value)) == value
+
+
+def test_compact_is_smaller():
+    messages = thread(10)
+    default_size = len(JsonPlusSerializer().dumps_typed(messages)[1])
+
+    typ, data = CompactSerializer().dumps_typed(messages)
+
+    assert typ == "msgpack:compact.zlib.dedup"
+    assert len(data) < default_size / 4
+
+
+def test_small_values_are_not_wrapped():
+    serde = CompactSerializer()
+
+    assert serde.dumps_typed({"a": 1}) == JsonPlusSerializer().dumps_typed({"a": 1})
+    assert serde.dumps_typed(thread(1))[0] == "msgpack:compact.zlib"
+
+
+def test_dedup_without_compression():
+    serde = CompactSerializer(compression=None)
+    messages = thread(3)
+
+    typ, _ = serde.dumps_typed(messages)
+    loaded = serde.loads_typed((typ, _))
+
+    assert typ == "msgpack:compact.raw.dedup"
+    assert [m.content for m in loaded] == [m.content for m in messages]
+    # The value being checkpointed is not modified
+    assert all(m.content == PROMPT for m in messages if m.type == "system")
+
+
+def test_invalid_compression():
+    with pytest.raises(ValueError):
+        CompactSerializer(compression="lz4")
+
+
+class XorCipher(CipherProtocol):
+    def encrypt(self, plaintext):
+        return "xor", bytes(b ^ 42 for b in plaintext)
+
+    def decrypt(self, ciphername, ciphertext):
+        return bytes(b ^ 42 for b in ciphertext)
+
+
+def test_combines_with_encryption():
+    serde = EncryptedSerializer(XorCipher(), CompactSerializer())
+    messages = thread()
+
+    assert serde.loads_typed(serde.dumps_typed(messages)) == messages
+
+
+async def test_checkpointer_round_trip():
+    async def agent(state):
+        return {"messages": [SystemMessage(PROMPT), AIMessage("ok")], "next": "end"}
+
+    builder = StateGraph(NextProcessState)
+    builder.add_node("agent", agent)
+    builder.add_edge(START, "agent")
+    graph = builder.compile(checkpointer=MemorySaver(serde=CompactSerializer()))
+    config = {"configurable": {"thread_id": "compact"}}
+
+    for turn in range(3):
+        await graph.ainvoke({"messages": [HumanMessage(f"q{turn}")]}, config)
+
+    values = (await graph.aget_state(config)).values
+    assert values["next"] == "end"
+    assert [m.type for m in values["messages"]] == ["human", "system", "ai"] * 3
+    assert all(m.content == PROMPT for m in values["messages"] if m.type == "system")
@@ -2,6 +2,12 @@ import datetime
 from unittest import mock
 from zoneinfo import ZoneInfo
 
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.graph import MessagesState, StateGraph
+
+from assistant_core.builder import BuilderContext, SingleAgent
 from assistant_core.builder.datetime import (
     DateTimeBuilder,
     DateTimeNode,
@@ -9,6 +15,8 @@ from assistant_core.builder.datetime import (
     get_current_time,
     get_weekday,
 )
+from assistant_core.nodes import AgentNode
+from assistant_core.state import EphemeralContextState
 
 UTC = ZoneInfo("UTC")
 
@@ -82,3 +90,49 @@ async def test_datetime_prompt_refresh():
 
         system_message = messages["messages"][0]
         assert test_time.strftime("%Y-%m-%dT%H:%M:%S") in system_message.content
+
+
+async def test_ephemeral_prompt_is_not_checkpointed(mock_model, factory_config):
+    mock_model.ainvoke.side_effect = lambda *args, **kwargs: AIMessage("Hello!")
+    mock_model.bind_tools.return_value = mock_model
+    agent = AgentNode(name="agent", model=mock_model, prompts=["Be brief"])
+    context = BuilderContext.create(
+        factory_config,
+        agent_factory=lambda _: agent,
+        model_factory=lambda _: mock_model,
+        graph_factory=lambda: StateGraph(EphemeralContextState),
+    )
+    director = SingleAgent()
+    director.add_builder(DateTimeBuilder(TZ=UTC, ephemeral=True))
+    graph = director.make(context).compile(checkpointer=MemorySaver())
+    config = {"configurable": {"thread_id": "ephemeral"}}
+
+    for turn in range(3):
+        await graph.ainvoke({"messages": [HumanMessage(f"Hi {turn}")]}, config)
+
+    # The model saw the date prompt after the history on every turn
+    sent = mock_model.ainvoke.await_args.args[0]
+    assert sent[-1].content.startswith("CONTEXT: Today is")
+    # Only user and agent messages are persisted
+    persisted = (await graph.aget_state(config)).values
+    assert "context" not in persisted
+    assert [m.type for m in persisted["messages"]] == ["human", "ai"] * 3
+
+
+def test_ephemeral_prompt_requires_context_channel(mock_model, factory_config):
+    mock_model.bind_tools.return_value = mock_model
+
+    def make(ephemeral):
+        context = BuilderContext.create(
+            factory_config,
+            agent_factory=lambda model: AgentNode(name="agent", model=model),
+            model_factory=lambda _: mock_model,
+            graph_factory=lambda: StateGraph(MessagesState),
+        )
+        director = SingleAgent()
+        director.add_builder(DateTimeBuilder(TZ=UTC, ephemeral=ephemeral))
+        return director.make(context)
+
+    with pytest.raises(ValueError, match="date_time_node"):
+        make(ephemeral=True)
+    assert "date_time_node" in make(ephemeral=False).nodes
@@ -0,0 +1,169 @@
+from unittest import mock
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+
+from assistant_core.nodes import AgentNode
+from assistant_core.nodes.chain import (
+    ResponseChain,
+    response_id,
+    unchain,
+    written_by,
+)
+from assistant_core.nodes.response_cache import canonical_message
+
+
+def reply(content, rid):
+    return AIMessage(content, response_metadata={"id": rid})
+
+
+def sent(model):
+    return model.ainvoke.await_args.args[0]
+
+
+async def turn(agent, state, config):
+    update = await agent(state, config)
+    state["messages"] = state["messages"] + update["messages"]
+
+
+def test_delta_messages_follows_model(mock_model):
+    assert AgentNode(name="agent", model=mock_model).delta_messages is False
+
+    chained = mock.Mock(spec=BaseChatModel)
+    chained.use_previous_response_id = True
+    assert AgentNode(name="agent", model=chained).delta_messages is True
+    assert (
+        AgentNode(name="agent", model=chained, delta_messages=False).delta_messages
+        is False
+    )
+
+
+async def test_sends_only_new_messages(mock_model, mock_config):
+    mock_model.ainvoke.side_effect = [reply("one", "resp_1"), reply("two", "resp_2")]
+    agent = AgentNode(
+        name="agent", model=mock_model, prompts=["P"], delta_messages=True
+    )
+    state = {"messages": [HumanMessage("hi")]}
+
+    await turn(agent, state, mock_config)
+    assert [m.content for m in sent(mock_model)] == ["P", "hi"]
+
+    state["messages"].append(HumanMessage("again"))
+    state["context"] = {"datetime": [SystemMessage("now")]}
+    await turn(agent, state, mock_config)
+
+    assert [m.content for m in sent(mock_model)] == ["one", "again", "now"]
+    assert agent.response_chain.stats() == {"deltas": 1, "full": 1, "broken": 0}
+
+
+async def test_broken_chain_sends_full_history(mock_model, mock_config):
+    mock_model.ainvoke.side_effect = [
+        reply("one", "resp_1"),
+        reply("two", "resp_2"),
+        reply("three", "resp_3"),
+    ]
+    agent = AgentNode(
+        name="agent", model=mock_model, prompts=["P"], delta_messages=True
+    )
+    state = {"messages": [HumanMessage("hi")]}
+    await turn(agent, state, mock_config)
+
+    # An earlier message was removed, the server conversation is stale
+    state["messages"] = state["messages"][1:] + [HumanMessage("again")]
+    await turn(agent, state, mock_config)
+
+    messages = sent(mock_model)
+    assert [m.content for m in messages] == ["P", "one", "again"]
+    assert all(response_id(m) is None for m in messages)
+    assert agent.response_chain.broken == 1
+
+    # The new response starts a new chain
+    state["messages"].append(HumanMessage("more"))
+    await turn(agent, state, mock_config)
+    assert [m.content for m in sent(mock_model)] == ["two", "more"]
+
+
+def test_foreign_response_breaks_chain():
+    chain = ResponseChain("agent")
+    history = [HumanMessage("hi"), reply("one", "resp_1")]
+    chain.record("t", 1, history[1])
+
+    assert written_by(history[1]) == "agent"
+    assert chain.select("t", history) == (history[1:], False)
+    # The stamp holds without a recorded link (new node, restart, other worker)
+    assert chain.select("other-thread", history) == (history[1:], False)
+    # Answered by another agent or model
+    foreign = history + [HumanMessage("again"), reply("two", "resp_other")]
+    assert chain.select("t", foreign) == (None, True)
+    assert chain.select("t", [HumanMessage("hi")]) == (None, False)
+    assert chain.stats() == {"deltas": 2, "full": 1, "broken": 1}
+
+
+async def test_new_node_chains_off_checkpointed_history(mock_model, mock_config):
+    mock_model.ainvoke.side_effect = [reply("one", "resp_1"), reply("two", "resp_2")]
+    state = {"messages": [HumanMessage("hi")]}
+    await turn(
+        AgentNode(name="agent", model=mock_model, prompts=["P"], delta_messages=True),
+        state,
+        mock_config,
+    )
+
+    # Graph rebuilt per request: a new node continues the same thread
+    agent = AgentNode(
+        name="agent", model=mock_model, prompts=["P"], delta_messages=True
+    )
+    state["messages"].append(HumanMessage("again"))
+    await turn(agent, state, mock_config)
+
+    messages = sent(mock_model)
+    assert [m.content for m in messages] == ["one", "again"]
+    assert response_id(messages[0]) == "resp_1"
+    assert agent.response_chain.stats() == {"deltas": 1, "full": 0, "broken": 0}
+
+
+async def test_other_agent_response_sends_unchained_history(mock_model, mock_config):
+    mock_model.ainvoke.side_effect = [reply("one", "resp_1"), reply("two", "resp_2")]
+    agent = AgentNode(
+        name="agent", model=mock_model, prompts=["P"], delta_messages=True
+    )
+    state = {"messages": [HumanMessage("hi"), reply("other", "resp_other")]}
+
+    await turn(agent, state, mock_config)
+
+    messages = sent(mock_model)
+    assert [m.content for m in messages] == ["P", "hi", "other"]
+    assert all(response_id(m) is None for m in messages)
+
+    state["messages"].append(HumanMessage("again"))
+    await turn(agent, state, mock_config)
+    assert [m.content for m in sent(mock_model)] == ["one", "again"]
+
+    # A response stamped by another agent breaks the chain as well
+    other = reply("other", "resp_other")
+    other.response_metadata["agent"] = "billing"
+    state["messages"] += [other, HumanMessage("more")]
+    mock_model.ainvoke.side_effect = [reply("three", "resp_3")]
+    await turn(agent, state, mock_config)
+    assert all(response_id(m) is None for m in sent(mock_model))
+    assert agent.response_chain.broken == 2
+
+
+async def test_without_thread_sends_full_history(mock_model):
+    mock_model.ainvoke.side_effect = [reply("one", "resp_1"), reply("two", "resp_2")]
+    agent = AgentNode(name="agent", model=mock_model, delta_messages=True)
+    state = {"messages": [HumanMessage("hi")]}
+
+    await turn(agent, state, {})
+    state["messages"].append(HumanMessage("again"))
+    await turn(agent, state, {})
+
+    assert [m.content for m in sent(mock_model)] == ["hi", "one", "again"]
+
+
+def test_unchain_and_canonical_response_id():
+    message = reply("one", "resp_1")
+
+    assert response_id(unchain([message])[0]) is None
+    assert response_id(message) == "resp_1"
+    assert canonical_message(message)["response_id"] == "resp_1"
+    assert canonical_message(AIMessage("one"))["response_id"] is None
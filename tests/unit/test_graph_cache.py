@@ -0,0 +1,164 @@
+from unittest import mock
+
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.tools import StructuredTool
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.graph import StateGraph
+
+from assistant_core.builder import (
+    BaseBuilder,
+    BuilderContext,
+    GraphCache,
+    MultiAgent,
+    SingleAgent,
+)
+from assistant_core.builder.cache import fingerprint
+from assistant_core.nodes import AgentNode, PromptNode
+from assistant_core.state import NextProcessState
+
+
+class PromptBuilder(BaseBuilder):
+    def __init__(self, prompt: str):
+        self.prompt = prompt
+
+    def build(self, context):
+        node = PromptNode(name="prompt_node", prompt=self.prompt)
+        context.graph_builder.add_node(node.name, node)
+        context.entrypoint = node.name
+
+
+def make_lookup(tenant):
+    def lookup(query: str) -> str:
+        return f"{tenant}:{query}"
+
+    return StructuredTool.from_function(lookup, description="Look something up.")
+
+
+def make_graph_builder():
+    return StateGraph(NextProcessState)
+
+
+def make_director(prompt="hello", director_class=SingleAgent):
+    director = director_class()
+    director.add_builder(PromptBuilder(prompt))
+    return director
+
+
+def test_same_fingerprint_returns_compiled_graph(builder_context):
+    cache = GraphCache()
+
+    graph = cache.compile(make_director(), builder_context)
+    cached = cache.compile(make_director(), builder_context.clone())
+
+    assert cached is graph
+    assert cache.hits == 1
+    assert cache.misses == 1
+    assert "prompt_node" in graph.nodes
+
+
+def test_hit_skips_director(builder_context):
+    cache = GraphCache()
+    cache.compile(make_director(), builder_context)
+
+    director = make_director()
+    with mock.patch.object(director, "make") as make:
+        cache.compile(director, builder_context.clone())
+
+    make.assert_not_called()
+
+
+def test_fingerprint_changes_with_builders_and_tools(builder_context):
+    base = fingerprint(make_director(), builder_context)
+
+    assert base == fingerprint(make_director(), builder_context.clone())
+    assert base != fingerprint(make_director("bye"), builder_context)
+    assert base != fingerprint(
+        make_director(director_class=MultiAgent), builder_context
+    )
+
+    other = builder_context.clone()
+    other.tools.append(mock.Mock(name="tool"))
+    assert base != fingerprint(make_director(), other)
+
+    other_config = builder_context.clone()
+    other_config._factory.config = {"OPENAI_API_KEY": "other"}
+    assert base != fingerprint(make_director(), other_config)
+
+
+def test_compile_kwargs_are_part_of_the_key(builder_context):
+    cache = GraphCache()
+    checkpointer = MemorySaver()
+
+    graph = cache.compile(make_director(), builder_context, checkpointer=checkpointer)
+    other = cache.compile(
+        make_director(), builder_context.clone(), checkpointer=MemorySaver()
+    )
+
+    assert graph is not other
+    assert graph.checkpointer is checkpointer
+
+
+def test_lru_and_ttl_eviction(builder_context):
+    now = [0.0]
+    cache = GraphCache(max_size=1, ttl=10)
+    cache._graphs._clock = lambda: now[0]
+
+    cache.compile(make_director("a"), builder_context.clone())
+    cache.compile(make_director("b"), builder_context.clone())
+    assert cache.stats()["evictions"] == 1
+
+    now[0] = 11
+    cache.compile(make_director("b"), builder_context.clone())
+    assert cache.stats()["expirations"] == 1
+    assert cache.misses == 3
+    assert len(cache) == 1
+
+
+async def test_same_schema_tools_get_their_own_graph(mock_model, factory_config):
+    mock_model.bind_tools.return_value = mock_model
+
+    def agent_factory(model):
+        return AgentNode(name="agent", model=model)
+
+    def model_factory(_):
+        return mock_model
+
+    def context(tenant):
+        context = BuilderContext.create(
+            factory_config,
+            agent_factory=agent_factory,
+            model_factory=model_factory,
+            graph_factory=make_graph_builder,
+            lazy=True,
+        )
+        context.tools = [make_lookup(tenant)]
+        return context
+
+    cache = GraphCache()
+    cache.compile(SingleAgent(), context("tenant_a"))
+    graph = cache.compile(SingleAgent(), context("tenant_b"))
+    mock_model.ainvoke.side_effect = [
+        AIMessage(
+            "", tool_calls=[{"name": "lookup", "args": {"query": "x"}, "id": "1"}]
+        ),
+        AIMessage("done"),
+    ]
+
+    result = await graph.ainvoke({"messages": [HumanMessage("hi")]})
+
+    assert cache.misses == 2
+    assert result["messages"][-2].content == "tenant_b:x"
+
+
+def test_lazy_hit_creates_no_components(builder_context):
+    cache = GraphCache()
+    lazy = BuilderContext(builder_context._factory, lazy=True)
+    graph = cache.compile(make_director(), lazy)
+
+    other = BuilderContext(builder_context._factory.clone(), lazy=True)
+    assert cache.compile(make_director(), other) is graph
+    assert other.construction_stats["created"] == ()
+
+    # A per-request factory is a new input
+    fresh = other.clone(graph_factory=lambda: builder_context.graph_builder)
+    assert fingerprint(make_director(), fresh) != fingerprint(make_director(), other)
@@ -0,0 +1,91 @@
+from unittest import mock
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+from assistant_core.nodes import AgentNode
+from assistant_core.nodes.history import LastTurns, TokenBudget, TokenCounter
+
+
+def conversation():
+    return [
+        HumanMessage("first question", id="h1"),
+        AIMessage("first answer", id="a1"),
+        HumanMessage("search something", id="h2"),
+        AIMessage(
+            "",
+            id="a2",
+            tool_calls=[{"name": "search", "args": {"q": "x"}, "id": "call_1"}],
+        ),
+        ToolMessage("result " * 20, tool_call_id="call_1", id="t1"),
+        AIMessage("second answer", id="a3"),
+        HumanMessage("thanks", id="h3"),
+    ]
+
+
+def test_last_turns():
+    messages = conversation()
+
+    assert LastTurns(1).select(messages) == messages[6:]
+    assert LastTurns(2).select(messages) == messages[2:]
+    assert LastTurns(10).select(messages) == messages
+
+    with pytest.raises(ValueError):
+        LastTurns(0)
+
+
+def test_token_budget_keeps_tool_pairs():
+    messages = conversation()
+    budget = TokenBudget(max_tokens=1, token_counter=TokenCounter(lambda m: 1))
+
+    assert budget.select(messages) == messages[6:]
+
+    # A budget that ends inside the tool result moves the window past it
+    counter = TokenCounter(lambda m: 10 if isinstance(m, ToolMessage) else 1)
+    selected = TokenBudget(max_tokens=13, token_counter=counter).select(messages)
+    assert selected == messages[3:]
+    selected = TokenBudget(max_tokens=12, token_counter=counter).select(messages)
+    assert selected == messages[5:]
+
+
+def test_token_budget_always_keeps_latest_window():
+    messages = conversation()[3:6]
+    budget = TokenBudget(max_tokens=0, token_counter=TokenCounter(lambda m: 5))
+
+    assert budget.select(messages[:2]) == messages[:2]
+
+
+def test_token_counter_is_cached_per_message():
+    count = mock.Mock(return_value=3)
+    counter = TokenCounter(count)
+    messages = conversation()
+    budget = TokenBudget(max_tokens=1000, token_counter=counter)
+
+    budget.select(messages)
+    budget.select(messages + [AIMessage("new", id="a4")])
+
+    assert count.call_count == len(messages) + 1
+
+
+def test_token_budget_counter_is_sized_per_budget():
+    messages = conversation()
+    small = TokenBudget(max_tokens=1000, max_counted_messages=2)
+    large = TokenBudget(max_tokens=1000, max_counted_messages=len(messages))
+
+    small.select(messages)
+    large.select(messages)
+
+    assert small.token_counter is not large.token_counter
+    assert small.token_counter.stats()["size"] == 2
+    assert large.token_counter.stats()["size"] == len(messages)
+
+
+def test_agent_node_applies_history(mock_model):
+    node = AgentNode(
+        name="agent", model=mock_model, prompts=["prompt"], history=LastTurns(1)
+    )
+    messages = conversation()
+
+    selected = node._get_messages({"messages": messages})
+
+    assert selected == node.prompts + messages[6:]
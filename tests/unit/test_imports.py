@@ -0,0 +1,71 @@
+"""Cold-start guards: importing assistant_core must stay cheap."""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+# Generous default so slow CI machines don't flake; lower it locally to profile
+IMPORT_BUDGET = float(os.getenv("ASSISTANT_CORE_IMPORT_BUDGET", "0.5"))
+
+HEAVY_MODULES = ("langchain_openai", "openai", "langgraph", "dotenv")
+
+
+def run_isolated(code: str) -> dict:
+    script = (
+        "import json, sys, time\n"
+        "start = time.perf_counter()\n"
+        f"{code}\n"
+        "elapsed = time.perf_counter() - start\n"
+        "print(json.dumps({'elapsed': elapsed, 'modules': sorted(sys.modules)}))\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", script], check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+@pytest.mark.parametrize(
+    "code",
+    [
+        "import assistant_core.builder",
+        "import assistant_core.nodes",
+        "import assistant_core.settings",
+        "from assistant_core.builder import BuilderContext",
+        "from assistant_core.factories import ContextFactory",
+    ],
+)
+def test_import_does_not_load_heavy_modules(code):
+    result = run_isolated(code)
+
+    loaded = {name.split(".")[0] for name in result["modules"]}
+    assert not loaded & set(HEAVY_MODULES)
+
+
+def test_import_time_budget():
+    result = run_isolated("from assistant_core.builder import BuilderContext")
+
+    assert result["elapsed"] < IMPORT_BUDGET
+
+
+def test_lazy_exports_resolve():
+    result = run_isolated(
+        "from assistant_core.builder import SingleAgent\n"
+        "from assistant_core.nodes import AgentNode"
+    )
+
+    assert "assistant_core.builder.agent" in result["modules"]
+    assert "langchain_openai" not in result["modules"]
+
+
+def test_settings_are_loaded_on_access(monkeypatch):
+    from assistant_core import settings
+
+    monkeypatch.setenv("OPENAI_API_KEY", "from-env")
+    assert settings.OPENAI_API_KEY == "from-env"
+    assert settings.load_settings(dotenv=False)["OPENAI_API_KEY"] == "from-env"
+
+    with pytest.raises(AttributeError):
+        settings.UNKNOWN_SETTING
@@ -0,0 +1,117 @@
+import pytest
+from langgraph.store.memory import InMemoryStore
+
+pytest.importorskip("numpy")
+
+from assistant_core.store import IndexedStore  # noqa: E402
+
+FAQS = {
+    "refunds": {"question": "How do I get a refund?", "answer": "Within 30 days."},
+    "shipping": {"question": "When is delivery?", "answer": "In 3 days."},
+    "password": {"question": "I forgot my password", "answer": "Use the link."},
+}
+
+
+class CountingStore(InMemoryStore):
+    def __init__(self):
+        super().__init__()
+        self.searches = 0
+
+    def batch(self, ops):
+        ops = list(ops)
+        self.searches += sum(type(op).__name__ == "SearchOp" for op in ops)
+        return super().batch(ops)
+
+    async def abatch(self, ops):
+        ops = list(ops)
+        self.searches += sum(type(op).__name__ == "SearchOp" for op in ops)
+        return await super().abatch(ops)
+
+
+@pytest.fixture
+def faq_store():
+    store = CountingStore()
+    for key, value in FAQS.items():
+        store.put(("acme", "faqs"), key, value)
+    return store
+
+
+async def test_searches_mirrored_namespace_locally(faq_store, embeddings):
+    store = IndexedStore(faq_store, embeddings, [("*", "faqs")], fields=["question"])
+
+    first = await store.asearch(("acme", "faqs"), query="refund my money", limit=1)
+    again = await store.asearch(("acme", "faqs"), query="Refunds?", limit=2)
+
+    assert [item.key for item in first] == ["refunds"]
+    assert first[0].value == FAQS["refunds"]
+    assert first[0].score > 0.5
+    assert again[0].key == "refunds" and len(again) == 2
+    # One load of the namespace, then no round trips
+    assert faq_store.searches == 1
+    assert store.stats()["local_searches"] == 2
+
+
+async def test_writes_update_the_mirror(faq_store, embeddings):
+    store = IndexedStore(faq_store, embeddings, [("*", "faqs")], fields=["question"])
+    await store.asearch(("acme", "faqs"), query="refund")
+
+    await store.aput(("acme", "faqs"), "account", {"question": "Delete account"})
+    await store.adelete(("acme", "faqs"), "refunds")
+
+    hits = await store.asearch(("acme", "faqs"), query="account", limit=3)
+    assert hits[0].key == "account"
+    assert "refunds" not in [item.key for item in hits]
+    assert (await store.aget(("acme", "faqs"), "account")).value == {
+        "question": "Delete account"
+    }
+    assert faq_store.searches == 1
+
+
+def test_other_searches_pass_through(faq_store, embeddings):
+    store = IndexedStore(faq_store, embeddings, [("*", "faqs")])
+
+    store.search(("acme", "faqs"))
+    store.search(("acme", "faqs"), query="refund", filter={"answer": {"$ne": "x"}})
+    store.search(("acme",), query="refund")
+
+    assert faq_store.searches == 3
+    assert store.stats()["local_searches"] == 0
+
+
+def test_sync_search_filter_and_refresh(faq_store, embeddings):
+    now = [0.0]
+    store = IndexedStore(
+        faq_store,
+        embeddings,
+        [("acme", "faqs")],
+        fields=["question"],
+        refresh_interval=60,
+        clock=lambda: now[0],
+    )
+
+    hits = store.search(
+        ("acme", "faqs"), query="delivery", filter={"answer": "Use the link."}
+    )
+    assert [item.key for item in hits] == ["password"]
+
+    faq_store.put(("acme", "faqs"), "late", {"question": "Late delivery"})
+    assert "late" not in [i.key for i in store.search(("acme", "faqs"), query="x")]
+    now[0] = 61
+    assert "late" in [i.key for i in store.search(("acme", "faqs"), query="x")]
+    assert faq_store.searches == 2
+
+
+async def test_mirrors_are_bounded(faq_store, embeddings):
+    for key, value in FAQS.items():
+        faq_store.put(("globex", "faqs"), key, value)
+    store = IndexedStore(
+        faq_store, embeddings, [("*", "faqs")], fields=["question"], max_indexes=1
+    )
+
+    await store.asearch(("acme", "faqs"), query="refund")
+    await store.asearch(("globex", "faqs"), query="refund")
+    await store.asearch(("acme", "faqs"), query="refund")
+
+    assert store.stats()["indexes"] == 1
+    # The evicted mirror is loaded again
+    assert faq_store.searches == 3
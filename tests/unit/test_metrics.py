@@ -0,0 +1,170 @@
+import contextlib
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.tools import tool
+from langgraph.errors import GraphInterrupt
+from langgraph.graph import StateGraph
+
+from assistant_core.builder import BuilderContext, SingleAgent
+from assistant_core.metrics import NodeInstrumentation, set_instrumentation
+from assistant_core.nodes import AgentNode, BaseNode, PromptNode
+from assistant_core.state import NextProcessState
+
+
+class FakeClock:
+    def __init__(self, step=0.02):
+        self.now = 0.0
+        self.step = step
+
+    def __call__(self):
+        self.now += self.step
+        return self.now
+
+
+class RecordingTracer:
+    def __init__(self):
+        self.spans = []
+
+    @contextlib.contextmanager
+    def start_as_current_span(self, name, attributes=None):
+        self.spans.append((name, attributes))
+        yield
+
+
+class FailingNode(BaseNode):
+    async def __call__(self, state, config):
+        raise ValueError("boom")
+
+
+class InterruptingNode(BaseNode):
+    async def __call__(self, state, config):
+        raise GraphInterrupt()
+
+
+class ExtendedPromptNode(PromptNode):
+    async def __call__(self, state, config):
+        return await super().__call__(state, config)
+
+
+@pytest.fixture
+def instrumentation():
+    instrumentation = NodeInstrumentation(buckets=(0.01, 0.1), clock=FakeClock())
+    previous = set_instrumentation(instrumentation)
+    yield instrumentation
+    set_instrumentation(previous)
+
+
+async def test_records_calls_per_node_and_agent(instrumentation, mock_config):
+    node = PromptNode(name="prompt", prompt="Hi")
+
+    await node({"messages": []}, mock_config)
+    await node({"messages": [], "active_agent": "sales"}, mock_config)
+    await ExtendedPromptNode(name="extended", prompt="Hi")({"messages": []}, {})
+
+    stats = instrumentation.stats()
+    assert stats["prompt", ""]["calls"] == 1
+    assert stats["prompt", "sales"]["calls"] == 1
+    assert stats["prompt", ""]["total_time"] == pytest.approx(0.02)
+    # Overridden __call__ calling super() is counted once
+    assert stats["extended", ""]["calls"] == 1
+
+
+async def test_errors_and_in_flight(instrumentation):
+    with pytest.raises(ValueError):
+        await FailingNode(name="failing")({"messages": []}, {})
+    with pytest.raises(GraphInterrupt):
+        await InterruptingNode(name="question")({"messages": []}, {})
+
+    stats = instrumentation.stats()
+    assert stats["failing", ""] | {"total_time": 0} == {
+        "calls": 1,
+        "errors": 1,
+        "in_flight": 0,
+        "total_time": 0,
+        "max_time": pytest.approx(0.02),
+    }
+    assert stats["question", ""]["errors"] == 0
+
+
+async def test_prometheus_text(instrumentation):
+    await PromptNode(name="prompt", prompt="Hi")({"messages": []}, {})
+    with pytest.raises(ValueError):
+        await FailingNode(name='say "hi"')({"messages": []}, {})
+
+    text = instrumentation.prometheus_text()
+
+    assert "# TYPE assistant_core_node_duration_seconds histogram" in text
+    assert (
+        'assistant_core_node_duration_seconds_bucket{node="prompt",agent="",le="0.01"}'
+        " 0" in text
+    )
+    assert (
+        'assistant_core_node_duration_seconds_bucket{node="prompt",agent="",le="0.1"}'
+        " 1" in text
+    )
+    assert (
+        'assistant_core_node_duration_seconds_count{node="prompt",agent=""} 1' in text
+    )
+    assert 'assistant_core_node_errors_total{node="say \\"hi\\"",agent=""} 1' in text
+    assert 'assistant_core_node_in_flight{node="prompt",agent=""} 0' in text
+
+
+async def test_tracer_spans(instrumentation):
+    instrumentation.tracer = RecordingTracer()
+
+    await PromptNode(name="prompt", prompt="Hi")({"active_agent": "sales"}, {})
+
+    assert instrumentation.tracer.spans == [
+        (
+            "prompt",
+            {"assistant_core.node": "prompt", "assistant_core.agent": "sales"},
+        )
+    ]
+
+
+async def test_uninstalled_instrumentation_records_nothing():
+    instrumentation = NodeInstrumentation()
+    node = PromptNode(name="prompt", prompt="Hi")
+    previous = set_instrumentation(instrumentation)
+    try:
+        await node({"messages": []}, {})
+        recorded = instrumentation.stats()
+        assert recorded
+
+        assert set_instrumentation(None) is instrumentation
+        await node({"messages": []}, {})
+    finally:
+        set_instrumentation(previous)
+
+    assert instrumentation.stats() == recorded
+
+
+async def test_graph_nodes_and_tool_calls(instrumentation, mock_model, factory_config):
+    @tool
+    def lookup(query: str) -> str:
+        """Look something up."""
+        return "found"
+
+    mock_model.bind_tools.return_value = mock_model
+    mock_model.ainvoke.side_effect = [
+        AIMessage(
+            "", tool_calls=[{"name": "lookup", "args": {"query": "x"}, "id": "1"}]
+        ),
+        AIMessage("done"),
+    ]
+    context = BuilderContext.create(
+        factory_config,
+        agent_factory=lambda model: AgentNode(name="agent", model=model),
+        model_factory=lambda _: mock_model,
+        graph_factory=lambda: StateGraph(NextProcessState),
+        base_tools_factory=lambda: [lookup],
+    )
+    graph = SingleAgent().make(context).compile()
+
+    await graph.ainvoke({"messages": [HumanMessage("hi")]})
+
+    stats = instrumentation.stats()
+    assert stats["agent", ""]["calls"] == 2
+    assert stats["resolver", ""]["calls"] == 1
+    assert stats["tools_agent", ""]["calls"] == 1
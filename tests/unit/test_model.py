@@ -6,3 +6,11 @@ OPENAI_API_KEY = "test_key"
 def test_default_model():
     model = load_default_model(openai_api_key=OPENAI_API_KEY)
     assert model
+
+
+def test_default_model_extra_arguments():
+    model = load_default_model(
+        openai_api_key=OPENAI_API_KEY, base_url="http://localhost:8000/v1"
+    )
+    assert model.openai_api_base == "http://localhost:8000/v1"
+    assert model.use_previous_response_id is True
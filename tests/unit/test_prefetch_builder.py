@@ -0,0 +1,116 @@
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.graph import StateGraph
+from langgraph.store.memory import InMemoryStore
+
+from assistant_core.builder import BuilderContext, SingleAgent
+from assistant_core.builder.prefetch import StorePrefetchBuilder, StorePrefetchNode
+from assistant_core.nodes import AgentNode
+from assistant_core.state import PrefetchState
+from assistant_core.store import CachedStore, with_cached_store
+
+KEYS = {
+    "options": (("{organization_id}",), "available_options"),
+    "active_item": (("{thread_id}", "todos"), "active_item"),
+}
+
+
+class CountingStore(InMemoryStore):
+    def __init__(self):
+        super().__init__()
+        self.batches = 0
+
+    async def abatch(self, ops):
+        self.batches += 1
+        return await super().abatch(ops)
+
+
+async def seeded_store():
+    store = CountingStore()
+    await store.aput(("acme",), "available_options", {"plans": ["basic", "pro"]})
+    await store.aput(("t1", "todos"), "active_item", {"title": "Upgrade"})
+    store.batches = 0
+    return store
+
+
+def config(**configurable):
+    return {"configurable": {"thread_id": "t1", **configurable}}
+
+
+def test_resolve_formats_templates():
+    node = StorePrefetchNode(KEYS)
+
+    ops = node.resolve({"messages": []}, config(organization_id="acme"))
+    assert ops["options"].namespace == ("acme",)
+    assert ops["active_item"].namespace == ("t1", "todos")
+
+    # Keys whose template cannot be formatted are skipped
+    assert list(node.resolve({}, config())) == ["active_item"]
+
+
+async def test_prefetch_in_one_batch():
+    store = await seeded_store()
+    node = StorePrefetchNode({**KEYS, "missing": (("acme",), "missing")})
+
+    async with CachedStore(store) as cached:
+        run_config = with_cached_store(config(organization_id="acme"), cached)
+        update = await node({"messages": []}, run_config)
+        # Tools reading the same keys are served from the cached store
+        await cached.aget(("acme",), "available_options")
+
+    assert update == {
+        "prefetched": {
+            "options": {"plans": ["basic", "pro"]},
+            "active_item": {"title": "Upgrade"},
+            "missing": None,
+        }
+    }
+    assert store.batches == 1
+    assert cached.hits == 1
+
+
+async def test_without_store_values_are_none():
+    node = StorePrefetchNode(KEYS)
+
+    update = await node({"messages": []}, config(organization_id="acme"))
+
+    assert update == {"prefetched": {"options": None, "active_item": None}}
+
+
+async def test_prompt_with_missing_values_and_failed_fetch():
+    class FailingStore(InMemoryStore):
+        async def abatch(self, ops):
+            raise ConnectionError("store down")
+
+    node = StorePrefetchNode(
+        KEYS, prompt="Plans: {options}. Item: {active_item}. Extra: {unknown}."
+    )
+    run_config = with_cached_store(config(organization_id="acme"), FailingStore())
+
+    update = await node({"messages": []}, run_config)
+
+    assert update["prefetched"] == {"options": None, "active_item": None}
+    (message,) = update["messages"]
+    assert message.content == "Plans: None. Item: None. Extra: ."
+
+
+async def test_builder_prefetches_before_agent(mock_model, factory_config):
+    mock_model.ainvoke.side_effect = lambda *args, **kwargs: AIMessage("ok")
+    mock_model.bind_tools.return_value = mock_model
+    agent = AgentNode(name="agent", model=mock_model)
+    context = BuilderContext.create(
+        factory_config,
+        agent_factory=lambda _: agent,
+        model_factory=lambda _: mock_model,
+        graph_factory=lambda: StateGraph(PrefetchState),
+    )
+    director = SingleAgent()
+    director.add_builder(StorePrefetchBuilder(KEYS, prompt="Plans: {options}"))
+    graph = director.make(context).compile(store=await seeded_store())
+
+    result = await graph.ainvoke(
+        {"messages": [HumanMessage("hi")]}, config(organization_id="acme")
+    )
+
+    sent = mock_model.ainvoke.await_args.args[0]
+    assert sent[-1].content == "Plans: {'plans': ['basic', 'pro']}"
+    assert result["prefetched"]["active_item"] == {"title": "Upgrade"}
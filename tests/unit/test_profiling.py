@@ -0,0 +1,164 @@
+import asyncio
+import time
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.tools import tool
+from langgraph.graph import StateGraph
+
+from assistant_core.builder import BuilderContext, SingleAgent
+from assistant_core.nodes import AgentNode, BaseNode
+from assistant_core.profiling import Profiler, set_profiler
+from assistant_core.state import NextProcessState
+
+
+class SlowNode(BaseNode):
+    async def __call__(self, state, config):
+        await asyncio.sleep(0.05)
+        end = time.perf_counter() + 0.05
+        while time.perf_counter() < end:
+            pass
+        return {}
+
+
+class ExtendedSlowNode(SlowNode):
+    async def __call__(self, state, config):
+        return await super().__call__(state, config)
+
+
+@pytest.fixture
+def profiler(tmp_path):
+    profiler = Profiler(
+        interval=0.002, directory=str(tmp_path / "profiles"), enabled=True
+    )
+    previous = set_profiler(profiler)
+    yield profiler
+    set_profiler(previous)
+
+
+def read_stacks(path):
+    lines = path.read_text().splitlines()
+    return {line.rsplit(" ", 1)[0]: int(line.rsplit(" ", 1)[1]) for line in lines}
+
+
+async def test_profiled_node_writes_collapsed_stacks(profiler, tmp_path):
+    target = tmp_path / "profiles" / "run.collapsed"
+
+    await SlowNode(name="slow")(
+        {"messages": []}, {"configurable": {"profile": "run.collapsed"}}
+    )
+    # Nothing is written on the event loop, the sampling thread writes later
+    assert not target.exists()
+    profiler.flush()
+
+    stacks = read_stacks(target)
+    assert stacks
+    assert all(stack.startswith("node:slow;") for stack in stacks)
+    assert any(stack.endswith("[await]") for stack in stacks)
+    assert any("test_profiling:SlowNode.__call__" in stack for stack in stacks)
+    assert not profiler._pending
+
+
+async def test_idle_sampling_thread_writes_profile(tmp_path):
+    profiler = Profiler(
+        interval=0.002, directory=str(tmp_path), enabled=True, flush_delay=0.01
+    )
+    previous = set_profiler(profiler)
+    try:
+        await SlowNode(name="slow")(
+            {"messages": []}, {"configurable": {"profile": "a"}}
+        )
+        for _ in range(100):
+            if (tmp_path / "a").exists():
+                break
+            await asyncio.sleep(0.01)
+    finally:
+        set_profiler(previous)
+
+    assert read_stacks(tmp_path / "a")
+    assert profiler._thread is None
+    assert not profiler._pending
+
+
+async def test_nested_calls_and_thread_target(profiler, tmp_path):
+    config = {"configurable": {"thread_id": "t1", "profile": True}}
+
+    await ExtendedSlowNode(name="extended")({"messages": []}, config)
+    profiler.flush()
+    first = sum(read_stacks(tmp_path / "profiles" / "t1.collapsed").values())
+    await ExtendedSlowNode(name="extended")({"messages": []}, config)
+    profiler.flush()
+
+    stacks = read_stacks(tmp_path / "profiles" / "t1.collapsed")
+    # super().__call__ is sampled once, later runs add to the same file
+    assert all(stack.count("node:") == 1 for stack in stacks)
+    assert sum(stacks.values()) > first
+
+
+async def test_disabled_profiling_writes_nothing(profiler, tmp_path):
+    await SlowNode(name="slow")({"messages": []}, {"configurable": {"thread_id": "t1"}})
+    await SlowNode(name="slow")({"messages": []}, {})
+
+    assert not (tmp_path / "profiles").exists()
+
+
+async def test_profiling_requires_server_setting(tmp_path):
+    profiler = Profiler(directory=str(tmp_path))
+    previous = set_profiler(profiler)
+    try:
+        await SlowNode(name="slow")(
+            {"messages": []}, {"configurable": {"profile": True}}
+        )
+    finally:
+        set_profiler(previous)
+
+    assert profiler.target({"configurable": {"profile": True}}) is None
+    assert not profiler._pending
+    assert not list(tmp_path.iterdir())
+
+
+def test_targets_stay_inside_directory(profiler, tmp_path):
+    directory = (tmp_path / "profiles").resolve()
+
+    def target(**configurable):
+        return profiler.target({"configurable": configurable})
+
+    escaped = target(thread_id="../../x", profile=True)
+    assert escaped.parent == directory
+    assert escaped.name == ".._.._x.collapsed"
+    assert target(profile=str(tmp_path / "x")).parent == directory
+    assert target(profile="..") is None
+    assert target(profile=".") is None
+
+
+async def test_graph_tool_calls_are_profiled(
+    profiler, tmp_path, mock_model, factory_config
+):
+    @tool
+    async def lookup(query: str) -> str:
+        """Look something up."""
+        await asyncio.sleep(0.05)
+        return "found"
+
+    mock_model.bind_tools.return_value = mock_model
+    mock_model.ainvoke.side_effect = [
+        AIMessage(
+            "", tool_calls=[{"name": "lookup", "args": {"query": "x"}, "id": "1"}]
+        ),
+        AIMessage("done"),
+    ]
+    context = BuilderContext.create(
+        factory_config,
+        agent_factory=lambda model: AgentNode(name="agent", model=model),
+        model_factory=lambda _: mock_model,
+        graph_factory=lambda: StateGraph(NextProcessState),
+        base_tools_factory=lambda: [lookup],
+    )
+    graph = SingleAgent().make(context).compile()
+    await graph.ainvoke(
+        {"messages": [HumanMessage("hi")]}, {"configurable": {"profile": "graph"}}
+    )
+    profiler.flush()
+
+    stacks = read_stacks(tmp_path / "profiles" / "graph")
+    assert any(stack.startswith("tool:lookup;") for stack in stacks)
@@ -0,0 +1,76 @@
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+
+from assistant_core.nodes import AgentNode
+
+
+def usage(input_tokens, cached):
+    return {
+        "input_tokens": input_tokens,
+        "output_tokens": 5,
+        "total_tokens": input_tokens + 5,
+        "input_token_details": {"cache_read": cached},
+    }
+
+
+def test_stable_layout_keeps_history_in_place(mock_model):
+    agent = AgentNode(name="agent", model=mock_model, prompts=["P"], layout="stable")
+    history = [
+        SystemMessage("Summary of the conversation", id="summary"),
+        HumanMessage("hi"),
+        SystemMessage("Today is Monday"),
+        AIMessage("hello"),
+        HumanMessage("again"),
+    ]
+    context = {"time": [SystemMessage("ctx time")], "data": [SystemMessage("ctx")]}
+
+    messages = agent._get_messages({"messages": history, "context": context})
+
+    # Persisted messages are not moved, context follows in writer order
+    assert messages == agent.prompts + history + [
+        context["data"][0],
+        context["time"][0],
+    ]
+
+
+def test_default_layout_is_unchanged(mock_model):
+    agent = AgentNode(name="agent", model=mock_model, prompts=["P"])
+    history = [HumanMessage("hi"), SystemMessage("Today is Monday")]
+
+    assert agent._get_messages({"messages": history}) == agent.prompts + history
+    assert agent.prompt_cache_key is None
+
+    with pytest.raises(ValueError):
+        AgentNode(name="agent", model=mock_model, layout="unknown")
+
+
+def test_stable_prompt_cache_key(mock_model):
+    agent = AgentNode(name="agent", model=mock_model, prompts=["P"], layout="stable")
+    same = AgentNode(name="agent", model=mock_model, prompts=["P"], layout="stable")
+    other = AgentNode(name="agent", model=mock_model, prompts=["Q"], layout="stable")
+    custom = AgentNode(name="agent", model=mock_model, prompt_cache_key="tenant:v1")
+
+    assert agent.prompt_cache_key.startswith("agent:")
+    assert agent.prompt_cache_key == same.prompt_cache_key
+    assert agent.prompt_cache_key != other.prompt_cache_key
+    assert custom.prompt_cache_key == "tenant:v1"
+
+
+async def test_prompt_cache_key_sent_and_usage_recorded(mock_model, mock_config):
+    mock_model.ainvoke.side_effect = [
+        AIMessage("one", usage_metadata=usage(100, 0)),
+        AIMessage("two", usage_metadata=usage(100, 80)),
+    ]
+    agent = AgentNode(name="agent", model=mock_model, prompt_cache_key="key")
+    state = {"messages": [HumanMessage("hi")]}
+
+    await agent(state, mock_config)
+    await agent(state, mock_config)
+
+    assert mock_model.ainvoke.await_args.kwargs["prompt_cache_key"] == "key"
+    assert agent.prompt_cache_usage == {
+        "calls": 2,
+        "input_tokens": 200,
+        "cached_tokens": 80,
+    }
+    assert agent.prompt_cache_hit_rate == 0.4
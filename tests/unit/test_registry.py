@@ -0,0 +1,95 @@
+from unittest import mock
+
+from langchain_core.language_models.chat_models import BaseChatModel
+
+from assistant_core.factories import ContextFactory
+from assistant_core.registry import ModelRegistry, get_model_registry
+
+
+def test_clones_share_pooled_model(factory_config, model_registry):
+    created = []
+
+    def model_factory(cfg):
+        model = mock.Mock(spec=BaseChatModel)
+        created.append(model)
+        return model
+
+    factory = ContextFactory(factory_config, model_factory=model_factory)
+    clone = factory.clone()
+    other = ContextFactory(dict(factory_config), model_factory=model_factory)
+
+    assert factory.model is clone.model is other.model
+    assert len(created) == 1
+    assert model_registry.stats()["hits"] == 2
+
+
+def test_default_model_is_pooled(factory_config):
+    factory = ContextFactory(factory_config)
+    clone = factory.clone()
+
+    assert factory.model is clone.model
+    assert len(get_model_registry()) == 1
+
+
+def test_different_config_or_factory_is_not_shared(factory_config):
+    def model_factory(cfg):
+        return mock.Mock(spec=BaseChatModel)
+
+    factory = ContextFactory(factory_config, model_factory=model_factory)
+    other_config = ContextFactory(
+        {"OPENAI_API_KEY": "other"}, model_factory=model_factory
+    )
+    other_factory = factory.clone(model_factory=lambda cfg: mock.Mock())
+
+    assert factory.model is not other_config.model
+    assert factory.model is not other_factory.model
+
+
+def test_registry_is_bounded():
+    registry = ModelRegistry(max_size=2)
+    models = [mock.Mock() for _ in range(3)]
+
+    for i, model in enumerate(models):
+        registry.get("factory", {"i": i}, lambda model=model: model)
+
+    assert len(registry) == 2
+    assert registry.stats()["evictions"] == 1
+    # The oldest entry was evicted and is created again
+    new_model = mock.Mock()
+    assert registry.get("factory", {"i": 0}, lambda: new_model) is new_model
+
+
+def test_factory_with_private_registry(factory_config):
+    registry = ModelRegistry(max_size=0)
+    factory = ContextFactory(
+        factory_config,
+        model_factory=lambda cfg: mock.Mock(spec=BaseChatModel),
+        model_registry=registry,
+    )
+
+    assert factory.model is not factory.clone().model
+    assert len(registry) == 0
+
+
+def test_close_releases_clients():
+    registry = ModelRegistry()
+    model = mock.Mock()
+    registry.get("factory", {}, lambda: model)
+
+    registry.close()
+
+    model.root_client.close.assert_called_once_with()
+    assert len(registry) == 0
+
+
+async def test_aclose_releases_async_clients():
+    registry = ModelRegistry()
+    model = mock.Mock()
+    model.root_async_client.close = mock.AsyncMock()
+    registry.get("factory", {}, lambda: model)
+
+    await registry.aclose()
+
+    model.root_client.close.assert_called_once_with()
+    model.root_async_client.close.assert_awaited_once_with()
+    assert len(registry) == 0
@@ -0,0 +1,123 @@
+from unittest import mock
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+from assistant_core.nodes import AgentNode, ProcessDataNode
+from assistant_core.nodes.chain import response_id
+from assistant_core.nodes.response_cache import (
+    CacheBackend,
+    InMemoryBackend,
+    ResponseCache,
+)
+
+
+def make_agent(model, cache, prompts=("You are a helpful assistant",)):
+    return AgentNode(
+        name="agent", model=model, prompts=list(prompts), response_cache=cache
+    )
+
+
+async def test_identical_requests_hit_the_cache(mock_model, mock_config):
+    mock_model.ainvoke.return_value = AIMessage("Hi!", id="run-1")
+    cache = ResponseCache()
+    agent = make_agent(mock_model, cache)
+    other_agent = make_agent(mock_model, cache)
+
+    first = await agent({"messages": [HumanMessage("Hello", id="1")]}, mock_config)
+    second = await other_agent(
+        {"messages": [HumanMessage("Hello", id="2")]}, mock_config
+    )
+
+    mock_model.ainvoke.assert_awaited_once()
+    assert second["messages"][0].content == "Hi!"
+    # Cached responses get a fresh id so they are appended to the thread
+    assert first["messages"][0].id == "run-1"
+    assert second["messages"][0].id is None
+    assert cache.stats() == {"hits": 1, "misses": 1, "hit_rate": 0.5}
+
+
+async def test_key_depends_on_prompts_messages_and_tools(mock_model):
+    cache = ResponseCache()
+    messages = [HumanMessage("Hello")]
+
+    key = cache.make_key(messages, [], mock_model)
+
+    assert key == cache.make_key([HumanMessage("Hello", id="x")], [], mock_model)
+    assert key != cache.make_key([HumanMessage("Bye")], [], mock_model)
+    assert key != cache.make_key(messages, [mock.Mock(name="tool")], mock_model)
+    assert key != cache.make_key(messages, [], mock.Mock())
+
+
+async def test_ttl_expires_entries(mock_model, mock_config):
+    now = [0.0]
+    backend = InMemoryBackend()
+    backend._entries._clock = lambda: now[0]
+    mock_model.ainvoke.return_value = AIMessage("Hi!")
+    agent = make_agent(mock_model, ResponseCache(backend, ttl=10))
+    state = {"messages": [HumanMessage("Hello")]}
+
+    await agent(state, mock_config)
+    now[0] = 11
+    await agent(state, mock_config)
+
+    assert mock_model.ainvoke.await_count == 2
+
+
+async def test_custom_async_backend(mock_model, mock_config):
+    class DictBackend(CacheBackend):
+        def __init__(self):
+            self.data = {}
+
+        async def aget(self, key):
+            return self.data.get(key)
+
+        async def aset(self, key, value, ttl=None):
+            self.data[key] = value
+
+    class EchoNode(ProcessDataNode):
+        async def __call__(self, state, config):
+            return await self.ainvoke_model(state["messages"], config=config)
+
+    backend = DictBackend()
+    mock_model.ainvoke.return_value = "ok"
+    node = EchoNode(
+        name="echo", model=mock_model, response_cache=ResponseCache(backend)
+    )
+
+    assert await node({"messages": ["ping"]}, mock_config) == "ok"
+    assert await node({"messages": ["ping"]}, mock_config) == "ok"
+    mock_model.ainvoke.assert_awaited_once()
+    assert list(backend.data.values()) == ["ok"]
+
+
+async def test_hits_are_detached_from_the_original_thread(mock_model, mock_config):
+    mock_model.ainvoke.return_value = AIMessage(
+        "",
+        id="run-1",
+        response_metadata={"id": "resp_abc", "model_name": "gpt-5"},
+        tool_calls=[{"name": "search", "args": {"q": "x"}, "id": "call_1"}],
+        usage_metadata={
+            "input_tokens": 100,
+            "output_tokens": 10,
+            "total_tokens": 110,
+            "input_token_details": {"cache_read": 80},
+        },
+    )
+    agent = make_agent(mock_model, ResponseCache())
+    state = {"messages": [HumanMessage("Hello")]}
+
+    first = (await agent(state, mock_config))["messages"][0]
+    hit = (await agent(state, mock_config))["messages"][0]
+
+    assert first.response_metadata["id"] == "resp_abc"
+    assert hit.response_metadata == {"model_name": "gpt-5"}
+    assert hit.tool_calls[0]["id"] not in (None, "call_1")
+    assert hit.tool_calls[0]["args"] == {"q": "x"}
+    assert hit.usage_metadata is None
+    # The hit never reached the provider
+    assert agent.prompt_cache_usage == {
+        "calls": 1,
+        "input_tokens": 100,
+        "cached_tokens": 80,
+    }
+    assert response_id(hit) is None
@@ -0,0 +1,170 @@
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+from langgraph.checkpoint.memory import MemorySaver
+
+from assistant_core.builder import BuilderContext, SingleAgent
+from assistant_core.nodes import AgentNode
+
+pytest.importorskip("numpy")
+
+from assistant_core.builder.semantic_cache import SemanticCacheBuilder  # noqa: E402
+from assistant_core.nodes.semantic_cache import SemanticCache  # noqa: E402
+
+
+def config(tenant="acme", thread_id="t"):
+    return {"configurable": {"thread_id": thread_id, "organization_id": tenant}}
+
+
+@pytest.fixture
+def agent(mock_model):
+    mock_model.ainvoke.side_effect = lambda *args, **kwargs: AIMessage(
+        "Refunds take 30 days."
+    )
+    return AgentNode(name="agent", model=mock_model, prompts=["Support"])
+
+
+async def ask(agent, question, run_config=None, history=()):
+    state = {"messages": [*history, HumanMessage(question)]}
+    update = await agent(state, run_config or config())
+    return update["messages"][0]
+
+
+async def test_near_duplicate_is_served_from_cache(agent, mock_model, embeddings):
+    cache = SemanticCache(embeddings, threshold=0.9)
+    agent.semantic_cache = cache
+
+    await ask(agent, "What's your refund policy?")
+    answer = await ask(agent, "how do refunds work")
+
+    assert answer.content == "Refunds take 30 days."
+    assert answer.response_metadata["semantic_cache"] > 0.9
+    assert mock_model.ainvoke.await_count == 1
+    assert cache.stats() == {
+        "hits": 1,
+        "misses": 1,
+        "hit_rate": 0.5,
+        "scopes": 1,
+        "entries": 1,
+    }
+
+    # Unrelated question and other tenant miss
+    await ask(agent, "reset my password")
+    await ask(agent, "how do refunds work", config("other"))
+    assert mock_model.ainvoke.await_count == 3
+
+
+async def test_ttl_and_tool_calls(agent, mock_model, embeddings):
+    now = [0.0]
+    cache = SemanticCache(embeddings, ttl=10, clock=lambda: now[0])
+    agent.semantic_cache = cache
+    await ask(agent, "refund")
+
+    now[0] = 11
+    await ask(agent, "refund")
+    assert mock_model.ainvoke.await_count == 2
+
+    # Tool calling turns are not stored, not even their final answer
+    state = {"messages": [HumanMessage("shipping")]}
+    tool_call = AIMessage("", tool_calls=[{"name": "t", "args": {}, "id": "1"}])
+    await cache.aupdate(agent, state, config(), tool_call)
+    turn = {
+        "messages": [
+            HumanMessage("shipping"),
+            tool_call,
+            ToolMessage("Order 42 ships to Main St.", tool_call_id="1"),
+        ]
+    }
+    await cache.aupdate(agent, turn, config(), AIMessage("It ships to Main St."))
+    assert await cache.alookup(agent, state, config()) is None
+    assert cache.stats()["entries"] == 1
+
+
+async def test_runs_without_tenant_are_not_cached(agent, mock_model, embeddings):
+    cache = SemanticCache(embeddings)
+    agent.semantic_cache = cache
+    no_tenant = {"configurable": {"thread_id": "t"}}
+
+    await ask(agent, "refund", no_tenant)
+    await ask(agent, "refund", no_tenant)
+
+    assert mock_model.ainvoke.await_count == 2
+    assert cache.stats()["scopes"] == 0
+
+
+async def test_follow_ups_match_only_the_same_context(agent, mock_model, embeddings):
+    cache = SemanticCache(embeddings)
+    agent.semantic_cache = cache
+    first = [HumanMessage("list my orders"), AIMessage("Order 1, order 2.")]
+    other = [HumanMessage("list my invoices"), AIMessage("Invoice 7, invoice 8.")]
+
+    await ask(agent, "and the second one?", history=first)
+    await ask(agent, "and the second one?", history=other)
+    assert mock_model.ainvoke.await_count == 2
+
+    answer = await ask(agent, "and the second one?", history=first)
+    assert answer.response_metadata["semantic_cache"] > 0.9
+    assert mock_model.ainvoke.await_count == 2
+
+
+async def test_prompt_change_invalidates(agent, embeddings):
+    cache = SemanticCache(embeddings)
+    agent.semantic_cache = cache
+    await ask(agent, "refund")
+    old_hash = cache.prompt_hash(agent)
+
+    agent.prompts = [SystemMessage("Support v2")]
+    state = {"messages": [HumanMessage("refund")]}
+    assert await cache.alookup(agent, state, config()) is None
+
+    assert cache.invalidate(prompt_hash=old_hash) == 1
+    assert cache.stats()["scopes"] == 0
+
+
+async def test_only_pending_questions_are_looked_up(agent, embeddings):
+    cache = SemanticCache(embeddings)
+    agent.semantic_cache = cache
+    await ask(agent, "refund")
+
+    answered = {"messages": [HumanMessage("refund"), AIMessage("")]}
+    assert await cache.alookup(agent, answered, config()) is None
+
+
+async def test_max_entries(agent, embeddings):
+    cache = SemanticCache(embeddings, max_entries=1)
+    agent.semantic_cache = cache
+    await ask(agent, "refund")
+    await ask(agent, "password")
+
+    assert cache.stats()["entries"] == 1
+
+
+async def test_max_scopes(agent, embeddings):
+    cache = SemanticCache(embeddings, max_scopes=1)
+    agent.semantic_cache = cache
+    await ask(agent, "refund", config("acme"))
+    await ask(agent, "refund", config("other"))
+
+    assert cache.stats()["scopes"] == 1
+    assert cache.invalidate(tenant="acme") == 0
+
+
+async def test_builder_short_circuits_graph(
+    agent, mock_model, embeddings, factory_config
+):
+    mock_model.bind_tools.return_value = mock_model
+    context = BuilderContext.create(
+        factory_config,
+        agent_factory=lambda _: agent,
+        model_factory=lambda _: mock_model,
+    )
+    director = SingleAgent()
+    director.add_builder(SemanticCacheBuilder(SemanticCache(embeddings)))
+    graph = director.make(context).compile(checkpointer=MemorySaver())
+
+    await graph.ainvoke({"messages": [HumanMessage("refund please")]}, config())
+    result = await graph.ainvoke(
+        {"messages": [HumanMessage("Refund?")]}, config(thread_id="other")
+    )
+
+    assert result["messages"][-1].content == "Refunds take 30 days."
+    assert mock_model.ainvoke.await_count == 1
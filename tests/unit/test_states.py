@@ -4,7 +4,7 @@ from unittest.mock import Mock
 
 from langgraph.graph import MessagesState
 
-from assistant_core.state import NextProcessState, QuestionState
+from assistant_core.state import EphemeralContext, NextProcessState, QuestionState
 
 
 def assign_to_state(State, values):
@@ -48,3 +48,15 @@ def test_next_process_state():
     state = assign_to_state(NextProcessState, {"next": "test"})
 
     assert state["next"] == "test"
+
+
+def test_ephemeral_context_merges_writers():
+    channel = EphemeralContext()
+
+    assert channel.update([{"a": ["A1"]}])
+    channel.update([{"b": ["B"]}, {"a": ["A2"]}])
+
+    assert channel.get() == {"a": ["A2"], "b": ["B"]}
+    assert not channel.update([])
+    # Never checkpointed
+    assert not channel.from_checkpoint(channel.checkpoint()).is_available()
@@ -0,0 +1,137 @@
+from langchain_core.messages import HumanMessage
+from langchain_core.runnables import RunnableConfig
+from langgraph.graph import START, MessagesState, StateGraph
+from langgraph.store.memory import InMemoryStore
+
+from assistant_core.nodes import BaseNode
+from assistant_core.store import CachedStore, get_store, with_cached_store
+
+
+class CountingStore(InMemoryStore):
+    def __init__(self):
+        super().__init__()
+        self.batches = []
+
+    def batch(self, ops):
+        ops = list(ops)
+        self.batches.append(ops)
+        return super().batch(ops)
+
+    async def abatch(self, ops):
+        ops = list(ops)
+        self.batches.append(ops)
+        return await super().abatch(ops)
+
+
+async def test_reads_are_memoized():
+    store = CountingStore()
+    await store.aput(("t1", "todos"), "active_item", {"title": "milk"})
+    store.batches.clear()
+    cached = CachedStore(store)
+
+    for _ in range(3):
+        item = await cached.aget(("t1", "todos"), "active_item")
+        assert item.value == {"title": "milk"}
+    assert await cached.aget(("t1", "todos"), "missing") is None
+    assert await cached.aget(("t1", "todos"), "missing") is None
+
+    assert len(store.batches) == 2
+    assert cached.stats() == {
+        "operations": 5,
+        "hits": 3,
+        "pending_writes": 0,
+        "round_trips": 2,
+        "round_trips_saved": 3,
+    }
+
+
+async def test_writes_are_buffered_and_flushed_once():
+    store = CountingStore()
+
+    async with CachedStore(store) as cached:
+        await cached.aput(("t1", "todos"), "active_item", {"title": "milk"})
+        await cached.aput(("t1", "todos"), "active_item", {"title": "bread"})
+        await cached.aput(("t1", "notes"), "current", {"text": "call"})
+        await cached.adelete(("t1", "notes"), "current")
+
+        # Reads see the buffered writes without a round trip
+        item = await cached.aget(("t1", "todos"), "active_item")
+        assert item.value == {"title": "bread"}
+        assert await cached.aget(("t1", "notes"), "current") is None
+        assert store.batches == []
+
+    assert len(store.batches) == 1
+    assert len(store.batches[0]) == 2
+    assert (await store.aget(("t1", "todos"), "active_item")).value == {
+        "title": "bread"
+    }
+    assert await store.aget(("t1", "notes"), "current") is None
+    assert cached.round_trips_saved == 5
+
+
+async def test_search_sees_pending_writes():
+    store = CountingStore()
+    cached = CachedStore(store)
+    await cached.aput(("org",), "available_options", {"options": ["a"]})
+
+    items = await cached.asearch(("org",))
+
+    assert [item.key for item in items] == ["available_options"]
+    assert len(store.batches) == 2
+
+
+def test_sync_api():
+    store = CountingStore()
+    cached = CachedStore(store)
+    cached.put(("t1",), "key", {"a": 1})
+
+    assert cached.get(("t1",), "key").value == {"a": 1}
+    cached.flush()
+    assert len(store.batches) == 1
+    assert store.get(("t1",), "key").value == {"a": 1}
+
+
+class ReadNode(BaseNode):
+    async def __call__(self, state: dict, config: RunnableConfig) -> dict:
+        store = get_store(config)
+        item = await store.aget(("org",), "available_options")
+        await store.aput(("org", self.name), "seen", {"options": item.value})
+        return {}
+
+
+async def test_nodes_share_one_cached_store():
+    store = CountingStore()
+    await store.aput(("org",), "available_options", {"options": ["a"]})
+    store.batches.clear()
+    builder = StateGraph(MessagesState)
+    builder.add_node("first", ReadNode(name="first"))
+    builder.add_node("second", ReadNode(name="second"))
+    builder.add_edge(START, "first")
+    builder.add_edge("first", "second")
+    graph = builder.compile(store=store)
+
+    async with CachedStore(store) as cached:
+        config = with_cached_store({"configurable": {"thread_id": "t1"}}, cached)
+        await graph.ainvoke({"messages": [HumanMessage("hi")]}, config)
+
+    assert len(store.batches) == 2
+    assert (await store.aget(("org", "second"), "seen")).value == {
+        "options": {"options": ["a"]}
+    }
+
+
+async def test_get_store_falls_back_to_graph_store():
+    store = InMemoryStore()
+    seen = []
+
+    async def node(state, config):
+        seen.append(get_store(config))
+        return {}
+
+    builder = StateGraph(MessagesState)
+    builder.add_node("node", node)
+    builder.add_edge(START, "node")
+    await builder.compile(store=store).ainvoke({"messages": []})
+
+    assert seen == [store]
+    assert get_store({}) is None
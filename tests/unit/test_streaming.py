@@ -0,0 +1,63 @@
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, HumanMessage
+from langgraph.graph import END, START, MessagesState, StateGraph
+
+from assistant_core.nodes import AgentNode
+
+
+async def test_streaming_assembles_message(mock_config):
+    model = GenericFakeChatModel(messages=iter([AIMessage("Hello there friend")]))
+    agent = AgentNode(name="agent", model=model, streaming=True)
+
+    response = await agent({"messages": [HumanMessage("Hi")]}, mock_config)
+
+    message = response["messages"][0]
+    assert isinstance(message, AIMessage)
+    assert not isinstance(message, AIMessageChunk)
+    assert message.content == "Hello there friend"
+
+
+async def test_streaming_merges_tool_call_chunks(mock_model, mock_config):
+    async def astream(messages, config=None):
+        yield AIMessageChunk(
+            content="",
+            tool_call_chunks=[
+                {"name": "search", "args": '{"q": ', "id": "call_1", "index": 0}
+            ],
+        )
+        yield AIMessageChunk(
+            content="",
+            tool_call_chunks=[{"name": None, "args": '"x"}', "id": None, "index": 0}],
+        )
+
+    mock_model.astream = astream
+    agent = AgentNode(name="agent", model=mock_model, streaming=True)
+
+    response = await agent({"messages": [HumanMessage("Hi")]}, mock_config)
+
+    message = response["messages"][0]
+    assert message.tool_calls == [
+        {"name": "search", "args": {"q": "x"}, "id": "call_1", "type": "tool_call"}
+    ]
+    mock_model.ainvoke.assert_not_called()
+
+
+async def test_graph_streams_tokens_before_completion():
+    model = GenericFakeChatModel(messages=iter([AIMessage("one two three")]))
+    agent = AgentNode(name="agent", model=model, streaming=True)
+    workflow = StateGraph(MessagesState)
+    workflow.add_node(agent.name, agent)
+    workflow.add_edge(START, agent.name)
+    workflow.add_edge(agent.name, END)
+    graph = workflow.compile()
+
+    chunks = [
+        message.content
+        async for message, _ in graph.astream(
+            {"messages": [HumanMessage("Hi")]}, stream_mode="messages"
+        )
+        if isinstance(message, AIMessageChunk)
+    ]
+
+    assert len(chunks) > 1
+    assert "".join(chunks) == "one two three"
@@ -0,0 +1,253 @@
+import asyncio
+from unittest import mock
+
+import pytest
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.checkpoint.memory import MemorySaver
+
+from assistant_core.builder import BuilderContext, SingleAgent
+from assistant_core.builder.summarization import (
+    SUMMARY_MESSAGE_ID,
+    SummarizationBuilder,
+    SummarizationNode,
+    default_summary_model,
+)
+from assistant_core.factories import ContextFactory
+from assistant_core.models import GPT_5_NANO
+from assistant_core.nodes import AgentNode
+from assistant_core.nodes.history import TokenCounter
+from assistant_core.registry import ModelRegistry
+
+
+def counter():
+    return TokenCounter(count=lambda message: 10)
+
+
+def conversation(turns):
+    messages = []
+    for turn in range(turns):
+        messages.append(HumanMessage(f"q{turn}", id=f"h{turn}"))
+        messages.append(AIMessage(f"a{turn}", id=f"a{turn}"))
+    return messages
+
+
+@pytest.fixture
+def summary_model():
+    model = mock.Mock(spec=BaseChatModel)
+    model.ainvoke.return_value = AIMessage("the summary")
+    return model
+
+
+def test_keep_tokens_must_be_lower(summary_model):
+    with pytest.raises(ValueError):
+        SummarizationNode(model=summary_model, max_tokens=10, keep_tokens=10)
+
+
+async def test_under_threshold_does_nothing(summary_model, mock_config):
+    node = SummarizationNode(
+        model=summary_model, max_tokens=100, keep_tokens=20, token_counter=counter()
+    )
+
+    assert await node({"messages": conversation(3)}, mock_config) == {}
+    summary_model.ainvoke.assert_not_awaited()
+
+
+async def test_summarizes_older_messages(summary_model, mock_config):
+    node = SummarizationNode(
+        model=summary_model, max_tokens=50, keep_tokens=20, token_counter=counter()
+    )
+
+    update = await node({"messages": conversation(3)}, mock_config)
+
+    remove_all, summary, *kept = update["messages"]
+    assert remove_all.type == "remove"
+    assert summary.id == SUMMARY_MESSAGE_ID
+    assert summary.content.endswith("the summary")
+    assert [m.id for m in kept] == ["h2", "a2"]
+    transcript = summary_model.ainvoke.await_args.args[0][1].content
+    assert "q0" in transcript and "a1" in transcript and "q2" not in transcript
+
+
+async def test_previous_summary_is_folded(summary_model, mock_config):
+    node = SummarizationNode(
+        model=summary_model, max_tokens=50, keep_tokens=20, token_counter=counter()
+    )
+    first = await node({"messages": conversation(3)}, mock_config)
+    messages = first["messages"][1:] + conversation(5)[6:]
+
+    second = await node({"messages": messages}, mock_config)
+
+    transcript = summary_model.ainvoke.await_args.args[0][1].content
+    assert "the summary" in transcript
+    assert [m.id for m in second["messages"][1:]] == [
+        SUMMARY_MESSAGE_ID,
+        "h4",
+        "a4",
+    ]
+
+
+async def test_background_summary_applies_next_turn(summary_model, mock_config):
+    node = SummarizationNode(
+        model=summary_model,
+        max_tokens=50,
+        keep_tokens=20,
+        background=True,
+        token_counter=counter(),
+    )
+    messages = conversation(3)
+
+    assert await node({"messages": messages}, mock_config) == {}
+    summary_model.ainvoke.assert_not_awaited()
+    # Started after the reply by the deferred node
+    await node.schedule({"messages": messages}, mock_config)
+    await asyncio.sleep(0)
+    config = summary_model.ainvoke.await_args.kwargs["config"]
+    assert config["configurable"] == {"thread_id": "test"}
+    assert "nostream" in config["tags"]
+
+    messages = messages + conversation(4)[6:]
+    update = await node({"messages": messages}, mock_config)
+
+    assert [m.id for m in update["messages"][1:]] == [
+        SUMMARY_MESSAGE_ID,
+        "h2",
+        "a2",
+        "h3",
+        "a3",
+    ]
+    assert len(node._pending) == 0
+
+
+async def test_pending_summaries_are_bounded(summary_model):
+    node = SummarizationNode(
+        model=summary_model,
+        max_tokens=50,
+        keep_tokens=20,
+        background=True,
+        token_counter=counter(),
+        max_threads=2,
+    )
+    for thread in range(3):
+        config = {"configurable": {"thread_id": f"t{thread}"}}
+        await node.schedule({"messages": conversation(3)}, config)
+
+    assert [key for key, _ in node._pending.items()] == ["t1", "t2"]
+
+
+async def test_failed_background_summary_is_dropped(summary_model, mock_config):
+    summary_model.ainvoke.side_effect = RuntimeError("down")
+    node = SummarizationNode(
+        model=summary_model,
+        max_tokens=50,
+        keep_tokens=20,
+        background=True,
+        token_counter=counter(),
+    )
+
+    await node.schedule({"messages": conversation(3)}, mock_config)
+    await asyncio.sleep(0.01)
+
+    assert len(node._pending) == 0
+    assert await node({"messages": conversation(3)}, mock_config) == {}
+
+
+async def test_builder_compacts_thread(mock_model, summary_model, factory_config):
+    mock_model.ainvoke.side_effect = lambda *args, **kwargs: AIMessage("answer")
+    mock_model.bind_tools.return_value = mock_model
+    agent = AgentNode(name="agent", model=mock_model)
+    context = BuilderContext.create(
+        factory_config,
+        agent_factory=lambda _: agent,
+        model_factory=lambda _: mock_model,
+    )
+    director = SingleAgent()
+    director.add_builder(
+        SummarizationBuilder(
+            model=summary_model, max_tokens=50, keep_tokens=20, token_counter=counter()
+        )
+    )
+    graph = director.make(context).compile(checkpointer=MemorySaver())
+    config = {"configurable": {"thread_id": "summary"}}
+
+    for turn in range(6):
+        await graph.ainvoke({"messages": [HumanMessage(f"q{turn}")]}, config)
+
+    persisted = (await graph.aget_state(config)).values["messages"]
+    assert persisted[0].id == SUMMARY_MESSAGE_ID
+    assert len(persisted) <= 6
+    assert persisted[-1].content == "answer"
+
+
+async def test_background_builder_summarizes_after_reply(
+    mock_model, summary_model, factory_config
+):
+    calls = []
+
+    async def answer(*args, **kwargs):
+        calls.append("agent")
+        return AIMessage("answer")
+
+    async def summarize(*args, **kwargs):
+        calls.append("summary")
+        return AIMessage("the summary")
+
+    mock_model.ainvoke.side_effect = answer
+    mock_model.bind_tools.return_value = mock_model
+    summary_model.ainvoke.side_effect = summarize
+    context = BuilderContext.create(
+        factory_config,
+        agent_factory=lambda _: AgentNode(name="agent", model=mock_model),
+        model_factory=lambda _: mock_model,
+    )
+    director = SingleAgent()
+    director.add_builder(
+        SummarizationBuilder(
+            model=summary_model,
+            max_tokens=50,
+            keep_tokens=20,
+            background=True,
+            token_counter=counter(),
+        )
+    )
+    graph = director.make(context).compile(checkpointer=MemorySaver())
+    config = {"configurable": {"thread_id": "background"}}
+
+    for turn in range(3):
+        await graph.ainvoke({"messages": [HumanMessage(f"q{turn}")]}, config)
+    await asyncio.sleep(0)
+    # Over the threshold once the third reply is in, summarized after it
+    assert calls == ["agent", "agent", "agent", "summary"]
+
+    await graph.ainvoke({"messages": [HumanMessage("q3")]}, config)
+    persisted = (await graph.aget_state(config)).values["messages"]
+    assert persisted[0].id == SUMMARY_MESSAGE_ID
+
+
+def test_builder_defaults_to_nano(builder_context, model_registry):
+    builder = SummarizationBuilder()
+
+    builder.build(builder_context)
+
+    node = builder_context.graph_builder.nodes["summarization_node"].runnable
+    assert node.afunc._base_model.model_name == GPT_5_NANO
+
+
+def test_default_model_is_pooled_in_the_context_registry(
+    agent_node, mock_model, factory_config, model_registry
+):
+    registry = ModelRegistry()
+    factory = ContextFactory(
+        factory_config,
+        agent_factory=lambda _: agent_node,
+        model_factory=lambda _: mock_model,
+        model_registry=registry,
+    )
+    context = BuilderContext(factory)
+
+    model = default_summary_model(context)
+
+    assert context.context_factory.model_registry is registry
+    assert model.model_name == GPT_5_NANO
+    assert default_summary_model(BuilderContext(factory.clone())) is model
+    assert len(model_registry) == 0
@@ -1,6 +1,9 @@
 from unittest.mock import patch
 
+from langchain_core.tools import tool
+
 from assistant_core.builder.tavily import TavilyBuilder, get_tavily_tool
+from assistant_core.tools import CachedTool, ToolResultCache
 
 
 class DummyTavily:
@@ -27,3 +30,21 @@ def test_builder_appends_tool(builder_context):
         builder.build(ctx)
 
     assert sentinel in ctx.tools
+
+
+def test_builder_wraps_tool_with_cache(builder_context):
+    @tool
+    def tavily_search(query: str) -> dict:
+        """Search the web."""
+        return {"query": query}
+
+    cache = ToolResultCache()
+    with patch(
+        "assistant_core.builder.tavily.get_tavily_tool", lambda **kw: tavily_search
+    ):
+        TavilyBuilder(tavily_api_key="sk-ok", cache=cache).build(builder_context)
+
+    cached_tool = builder_context.tools[-1]
+    assert isinstance(cached_tool, CachedTool)
+    assert cached_tool.name == "tavily_search"
+    assert cached_tool.cache is cache
@@ -0,0 +1,101 @@
+import asyncio
+import json
+
+from langchain_core.messages import AIMessage
+from langchain_core.tools import tool
+from langgraph.graph import END, START, MessagesState, StateGraph
+
+from assistant_core.builder import AgentBuilder, SingleAgent
+from assistant_core.tools import ToolExecutor
+
+running = {"now": 0, "peak": 0}
+
+
+@tool
+async def slow_search(query: str) -> str:
+    """Search slowly."""
+    running["now"] += 1
+    running["peak"] = max(running["peak"], running["now"])
+    await asyncio.sleep(0.05 if query != "hang" else 1)
+    running["now"] -= 1
+    return f"result for {query}"
+
+
+@tool
+def failing_tool(query: str) -> str:
+    """Always fails."""
+    raise ValueError("boom")
+
+
+def tool_calls(*queries, name="slow_search"):
+    return AIMessage(
+        "",
+        tool_calls=[
+            {"name": name, "args": {"query": query}, "id": f"call_{i}"}
+            for i, query in enumerate(queries)
+        ],
+    )
+
+
+async def run_tools(executor, tools, message, **kwargs):
+    workflow = StateGraph(MessagesState)
+    workflow.add_node("tools", executor.tool_node(tools, **kwargs))
+    workflow.add_edge(START, "tools")
+    workflow.add_edge("tools", END)
+    result = await workflow.compile().ainvoke({"messages": [message]})
+    return result["messages"][1:]
+
+
+async def test_concurrency_is_bounded():
+    running.update(now=0, peak=0)
+    executor = ToolExecutor(max_concurrency=4, tool_concurrency={"slow_search": 2})
+    messages = await run_tools(
+        executor, [slow_search], tool_calls("a", "b", "c", "d", "e")
+    )
+
+    assert len(messages) == 5
+    assert running["peak"] == 2
+    stats = executor.stats()["slow_search"]
+    assert stats["calls"] == 5
+    assert stats["queue_time"] > 0
+    assert stats["max_time"] >= 0.05
+
+
+async def test_timeout_returns_structured_result():
+    executor = ToolExecutor(tool_timeouts={"slow_search": 0.1})
+    messages = await run_tools(executor, [slow_search], tool_calls("fast", "hang"))
+
+    fast, hung = messages
+    assert fast.content == "result for fast"
+    assert hung.status == "error"
+    assert json.loads(hung.content)["error"] == "timeout"
+    assert hung.tool_call_id == "call_1"
+    assert executor.stats()["slow_search"]["timeouts"] == 1
+
+
+async def test_handled_errors_are_counted():
+    executor = ToolExecutor()
+    messages = await run_tools(
+        executor,
+        [failing_tool],
+        tool_calls("x", name="failing_tool"),
+        handle_tool_errors=True,
+    )
+
+    assert messages[0].status == "error"
+    assert executor.stats()["failing_tool"]["errors"] == 1
+
+
+async def test_agent_builder_uses_executor(builder_context):
+    executor = ToolExecutor(max_concurrency=1)
+    builder_context.tools.append(slow_search)
+
+    workflow = SingleAgent(AgentBuilder(tool_executor=executor)).make(builder_context)
+
+    tool_node = workflow.nodes["tools_test_agent"].runnable
+    graph = StateGraph(MessagesState)
+    graph.add_node("tools", tool_node)
+    graph.add_edge(START, "tools")
+    graph.add_edge("tools", END)
+    await graph.compile().ainvoke({"messages": [tool_calls("a")]})
+    assert executor.stats()["slow_search"]["calls"] == 1
@@ -0,0 +1,153 @@
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langchain_core.tools import tool
+
+from assistant_core.builder import AgentBuilder, BuilderContext, SingleAgent
+from assistant_core.nodes import AgentNode
+from assistant_core.tools import ToolSelector, clear_cache, tool_schema
+
+pytest.importorskip("numpy")
+
+
+@tool
+def issue_refund(order_id: str) -> str:
+    """Send the money back for a refund."""
+    return "refunded"
+
+
+@tool
+def track_shipping(order_id: str) -> str:
+    """Track the shipping and delivery of an order."""
+    return "on its way"
+
+
+@tool
+def reset_password(email: str) -> str:
+    """Reset the account password."""
+    return "sent"
+
+
+@tool
+def escalate(reason: str) -> str:
+    """Hand the conversation to a human."""
+    return "escalated"
+
+
+TOOLS = [issue_refund, track_shipping, reset_password, escalate]
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    clear_cache()
+    yield
+    clear_cache()
+
+
+def names(tools):
+    return [tool.name for tool in tools]
+
+
+def test_selects_top_k_in_original_order(embeddings):
+    selector = ToolSelector(embeddings, k=2)
+
+    assert names(selector.select(TOOLS, "where is my delivery, refund me")) == [
+        "issue_refund",
+        "track_shipping",
+    ]
+    assert names(selector.select(TOOLS, "forgot my password"))[0] == "reset_password"
+
+
+def test_always_on_tools_and_small_tool_sets(embeddings):
+    selector = ToolSelector(embeddings, k=1, always=["escalate"])
+
+    assert names(selector.select(TOOLS, "refund")) == ["issue_refund", "escalate"]
+    # Nothing to select from, or no question
+    assert selector.select(TOOLS[:2], "refund") == TOOLS[:2]
+    assert selector.select(TOOLS, None) == TOOLS
+
+
+async def test_tools_are_indexed_once(embeddings):
+    selector = ToolSelector(embeddings, k=1)
+    selector.index(TOOLS)
+    calls = embeddings.calls
+
+    await selector.aselect(TOOLS, "refund")
+    await selector.aselect(TOOLS, "password")
+
+    # Only the two questions are embedded
+    assert embeddings.calls == calls + 2
+
+
+async def test_agent_binds_selected_tools(mock_model, embeddings):
+    mock_model.ainvoke.return_value = AIMessage("ok")
+    mock_model.bind_tools.return_value = mock_model
+    agent = AgentNode(
+        name="agent",
+        model=mock_model,
+        tools=TOOLS,
+        tool_selector=ToolSelector(embeddings, k=1),
+    )
+    mock_model.bind_tools.reset_mock()
+
+    for _ in range(2):
+        await agent({"messages": [HumanMessage("refund please")]}, {})
+
+    # The recurring subset reuses the cached bound model
+    mock_model.bind_tools.assert_called_once_with([tool_schema(issue_refund)[0]])
+    assert mock_model.ainvoke.await_count == 2
+
+
+async def test_tool_loop_embeds_the_question_once(mock_model, embeddings):
+    mock_model.ainvoke.return_value = AIMessage("ok")
+    mock_model.bind_tools.return_value = mock_model
+    agent = AgentNode(
+        name="agent",
+        model=mock_model,
+        tools=TOOLS,
+        tool_selector=ToolSelector(embeddings, k=1),
+    )
+    agent.tool_selector.index(TOOLS)
+    calls = embeddings.calls
+    question = HumanMessage("refund please")
+    tool_call = AIMessage(
+        "", tool_calls=[{"name": "issue_refund", "args": {"order_id": "1"}, "id": "1"}]
+    )
+
+    await agent({"messages": [question]}, {})
+    await agent(
+        {"messages": [question, tool_call, ToolMessage("ok", tool_call_id="1")]}, {}
+    )
+
+    assert embeddings.calls == calls + 1
+
+
+def test_confirmations_are_matched_with_the_previous_answer(embeddings):
+    selector = ToolSelector(embeddings, k=1)
+    messages = [
+        HumanMessage("I can't log in"),
+        AIMessage("Shall I reset your password?"),
+        HumanMessage("yes, do it"),
+    ]
+
+    assert selector.query(messages) == "Shall I reset your password?\nyes, do it"
+    assert names(selector.select(TOOLS, selector.query(messages))) == ["reset_password"]
+    assert selector.query([HumanMessage("refund")]) == "refund"
+    assert selector.query([]) is None
+
+
+def test_builder_indexes_tools(mock_model, embeddings, factory_config):
+    selector = ToolSelector(embeddings, k=1)
+    agent = AgentNode(name="agent", model=mock_model)
+    context = BuilderContext.create(
+        factory_config,
+        agent_factory=lambda _: agent,
+        model_factory=lambda _: mock_model,
+    )
+    context.tools = TOOLS
+
+    SingleAgent(AgentBuilder(tool_selector=selector)).make(context)
+
+    assert agent.tool_selector is selector
+    calls = embeddings.calls
+    selector.select(TOOLS, "refund")
+    assert embeddings.calls == calls + 1
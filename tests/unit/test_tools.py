@@ -0,0 +1,238 @@
+import asyncio
+from unittest import mock
+
+import pytest
+from langchain_core.callbacks import AsyncCallbackHandler
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.runnables import RunnableConfig
+from langchain_core.tools import tool
+
+from assistant_core import tools as tools_module
+from assistant_core.nodes import AgentNode
+from assistant_core.tools import (
+    CachedTool,
+    ToolResultCache,
+    bind_tools,
+    cache_stats,
+    clear_cache,
+    tool_schema,
+)
+
+
+@tool
+def add(a: int, b: int) -> int:
+    """Add two numbers."""
+    return a + b
+
+
+@tool
+def multiply(a: int, b: int) -> int:
+    """Multiply two numbers."""
+    return a * b
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    clear_cache()
+    yield
+    clear_cache()
+
+
+def test_tool_schema_is_cached():
+    with mock.patch.object(
+        tools_module,
+        "convert_to_openai_tool",
+        wraps=tools_module.convert_to_openai_tool,
+    ) as convert:
+        schema, digest = tool_schema(add)
+        assert tool_schema(add) == (schema, digest)
+
+    convert.assert_called_once_with(add)
+    assert schema["function"]["name"] == "add"
+    assert digest != tool_schema(multiply)[1]
+
+
+def test_bind_tools_memoizes_bound_model(mock_model):
+    bound = bind_tools(mock_model, [add, multiply])
+    hits = cache_stats()["bound_models"]["hits"]
+
+    assert bind_tools(mock_model, [add, multiply]) is bound
+    mock_model.bind_tools.assert_called_once_with(
+        [tool_schema(add)[0], tool_schema(multiply)[0]]
+    )
+    assert cache_stats()["bound_models"]["hits"] == hits + 1
+
+
+def test_bind_tools_different_tool_sets(mock_model):
+    bind_tools(mock_model, [add])
+    bind_tools(mock_model, [add, multiply])
+
+    assert mock_model.bind_tools.call_count == 2
+
+
+def test_unconvertible_tools_are_bound_as_is(mock_model):
+    raw_tool = mock.Mock(name="raw_tool")
+
+    bind_tools(mock_model, [raw_tool])
+    bind_tools(mock_model, [raw_tool])
+
+    assert mock_model.bind_tools.call_count == 2
+    mock_model.bind_tools.assert_called_with([raw_tool])
+
+
+def test_rebind_tools_uses_memoized_binding():
+    model = mock.Mock(spec=BaseChatModel)
+    first = AgentNode(name="first", model=model)
+    second = AgentNode(name="second", model=model)
+
+    first.rebind_tools([add])
+    second.rebind_tools([add])
+
+    assert first.model is second.model
+    assert first.tools == [add]
+    model.bind_tools.assert_called_once()
+
+
+def make_search_tool(calls):
+    @tool
+    async def search(query: str, topic: str | None = None) -> dict:
+        """Search the web."""
+        calls.append(query)
+        await asyncio.sleep(0.01)
+        return {"query": query, "results": [topic]}
+
+    return search
+
+
+async def test_cached_tool_serves_normalized_queries():
+    calls = []
+    cache = ToolResultCache(ttl=60)
+    cached = CachedTool.wrap(make_search_tool(calls), cache)
+
+    first = await cached.ainvoke({"query": "Refund  Policy"})
+    second = await cached.ainvoke({"query": " refund policy", "topic": None})
+    await cached.ainvoke({"query": "refund policy", "topic": "news"})
+
+    assert cached.name == "search"
+    assert first == second
+    assert calls == ["Refund  Policy", "refund policy"]
+    assert cache.stats()["hits"] == 1
+
+
+async def test_cached_tool_coalesces_concurrent_calls():
+    calls = []
+    cache = ToolResultCache()
+    cached = CachedTool.wrap(make_search_tool(calls), cache)
+
+    results = await asyncio.gather(
+        *(cached.ainvoke({"query": "weather"}) for _ in range(5))
+    )
+
+    assert len(calls) == 1
+    assert all(result == results[0] for result in results)
+    assert cache.stats()["coalesced"] == 4
+
+
+async def test_cancelled_leader_does_not_cancel_waiters():
+    cache = ToolResultCache()
+    started = asyncio.Event()
+    calls = []
+
+    async def run():
+        calls.append(1)
+        started.set()
+        await asyncio.sleep(0.01)
+        return {"ok": len(calls)}
+
+    leader = asyncio.create_task(cache.aget_or_run("key", run))
+    await started.wait()
+    followers = [asyncio.create_task(cache.aget_or_run("key", run)) for _ in range(2)]
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    results = await asyncio.gather(*followers)
+
+    assert leader.cancelled()
+    # The first follower ran it again, the second one shared that call
+    assert results == [{"ok": 2}, {"ok": 2}]
+    assert len(calls) == 2
+
+
+async def test_cached_tool_does_not_cache_errors():
+    cache = ToolResultCache()
+    run = mock.AsyncMock(side_effect=[ValueError("boom"), {"ok": True}])
+
+    with pytest.raises(ValueError):
+        await cache.aget_or_run("key", run)
+    assert await cache.aget_or_run("key", run) == {"ok": True}
+    assert run.await_count == 2
+
+
+async def test_cached_tool_does_not_cache_error_results():
+    cache = ToolResultCache()
+    run = mock.AsyncMock(side_effect=[{"error": "rate limited"}, {"ok": True}])
+
+    assert await cache.aget_or_run("key", run) == {"error": "rate limited"}
+    assert await cache.aget_or_run("key", run) == {"ok": True}
+    assert await cache.aget_or_run("key", run) == {"ok": True}
+    assert run.await_count == 2
+
+
+async def test_cached_tool_key_includes_tool_configuration():
+    from langchain_tavily import TavilySearch
+
+    cache = ToolResultCache()
+    news = TavilySearch(max_results=2, topic="news", tavily_api_key="k1")
+    general = TavilySearch(max_results=5, tavily_api_key="k1")
+    other_key = TavilySearch(max_results=2, topic="news", tavily_api_key="k2")
+    keys = {
+        CachedTool.wrap(search, cache).tool_key for search in (news, general, other_key)
+    }
+
+    assert len(keys) == 3
+    same = TavilySearch(max_results=2, topic="news", tavily_api_key="k1")
+    assert CachedTool.wrap(same, cache).tool_key in keys
+
+
+async def test_cached_tool_passes_config_and_callbacks():
+    seen = []
+
+    @tool
+    async def search(query: str, config: RunnableConfig) -> str:
+        """Search the web."""
+        seen.append(config)
+        return query
+
+    class Recorder(AsyncCallbackHandler):
+        def __init__(self):
+            self.tools = []
+
+        async def on_tool_start(self, serialized, input_str, **kwargs):
+            self.tools.append(serialized["name"])
+
+    cached = CachedTool.wrap(search, ToolResultCache())
+    handler = Recorder()
+
+    await cached.ainvoke(
+        {"query": "x"},
+        {"configurable": {"thread_id": "t1"}, "callbacks": [handler]},
+    )
+
+    assert seen[0]["configurable"]["thread_id"] == "t1"
+    # The wrapped tool run is a child of the cached tool run
+    assert handler.tools == ["search", "search"]
+
+
+def test_tool_result_cache_ttl():
+    now = [0.0]
+    cache = ToolResultCache(ttl=10)
+    cache._results._clock = lambda: now[0]
+    run = mock.Mock(return_value={"ok": True})
+
+    cache.get_or_run("key", run)
+    cache.get_or_run("key", run)
+    now[0] = 11
+    cache.get_or_run("key", run)
+
+    assert run.call_count == 2
+    assert cache.stats()["expirations"] == 1
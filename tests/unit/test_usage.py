@@ -0,0 +1,162 @@
+import asyncio
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.graph import StateGraph
+
+from assistant_core.builder import BuilderContext, SingleAgent
+from assistant_core.builder.summarization import SummarizationNode
+from assistant_core.models import GPT_5, GPT_5_MINI, estimate_cost
+from assistant_core.nodes import AgentNode
+from assistant_core.nodes.history import TokenCounter
+from assistant_core.nodes.response_cache import ResponseCache
+from assistant_core.state import UsageState
+from assistant_core.usage import UsageTracker
+
+
+def response(text="ok", model="gpt-5-mini-2025-08-07"):
+    return AIMessage(
+        text,
+        response_metadata={"model_name": model},
+        usage_metadata={
+            "input_tokens": 1000,
+            "output_tokens": 200,
+            "total_tokens": 1200,
+            "input_token_details": {"cache_read": 400},
+            "output_token_details": {"reasoning": 50},
+        },
+    )
+
+
+def config(thread_id="t1"):
+    return {"configurable": {"thread_id": thread_id}}
+
+
+def test_estimate_cost():
+    # 600 uncached + 400 cached input, 200 output at gpt-5-mini prices
+    expected = (600 * 0.25 + 400 * 0.025 + 200 * 2.0) / 1_000_000
+
+    assert estimate_cost(GPT_5_MINI, 1000, 200, 400) == pytest.approx(expected)
+    assert estimate_cost("gpt-5-mini-2025-08-07", 1000, 200, 400) == pytest.approx(
+        expected
+    )
+    assert estimate_cost(GPT_5, 1_000_000, 0) == pytest.approx(1.25)
+    assert estimate_cost("other-model", 10, 10) is None
+    assert estimate_cost(None, 10, 10) is None
+
+
+async def test_agent_usage_per_node_agent_thread_and_model(mock_model):
+    mock_model.ainvoke.return_value = response()
+    tracker = UsageTracker()
+    agent = AgentNode(name="agent", model=mock_model, usage_tracker=tracker)
+
+    update = await agent({"messages": [HumanMessage("hi")]}, config())
+    await agent(
+        {"messages": [HumanMessage("hi")], "active_agent": "sales"}, config("t2")
+    )
+
+    stats = tracker.stats()
+    assert stats["total"]["calls"] == 2
+    assert stats["total"]["input_tokens"] == 2000
+    assert stats["nodes"]["agent"]["cached_tokens"] == 800
+    assert stats["nodes"]["agent"]["reasoning_tokens"] == 100
+    assert stats["agents"]["agent"]["calls"] == 1
+    assert stats["agents"]["sales"]["calls"] == 1
+    assert tracker.thread("t1")["output_tokens"] == 200
+    assert stats["models"]["gpt-5-mini-2025-08-07"]["cost"] == pytest.approx(
+        2 * estimate_cost(GPT_5_MINI, 1000, 200, 400)
+    )
+    assert update["usage"]["agent"]["input_tokens"] == 1000
+
+
+async def test_cache_hits_are_not_counted_and_sinks(mock_model):
+    mock_model.ainvoke.return_value = response()
+    records = []
+
+    def failing_sink(record):
+        raise RuntimeError("sink down")
+
+    tracker = UsageTracker(sinks=[failing_sink, records.append])
+    agent = AgentNode(
+        name="agent",
+        model=mock_model,
+        usage_tracker=tracker,
+        response_cache=ResponseCache(),
+    )
+
+    await agent({"messages": [HumanMessage("hi")]}, config())
+    update = await agent({"messages": [HumanMessage("hi")]}, config())
+
+    assert tracker.stats()["total"]["calls"] == 1
+    assert "usage" not in update
+    assert [(r.node, r.thread_id, r.input_tokens) for r in records] == [
+        ("agent", "t1", 1000)
+    ]
+
+
+async def test_no_tracker_no_usage(mock_model):
+    mock_model.ainvoke.return_value = response()
+    agent = AgentNode(name="agent", model=mock_model)
+
+    assert await agent({"messages": [HumanMessage("hi")]}, config()) == {
+        "messages": [mock_model.ainvoke.return_value]
+    }
+
+
+async def test_summarization_calls_are_tracked(mock_model):
+    mock_model.ainvoke.return_value = response("summary", model=GPT_5)
+    tracker = UsageTracker()
+    node = SummarizationNode(model=mock_model, usage_tracker=tracker)
+
+    await node.summarize([HumanMessage("a"), AIMessage("b")], config())
+
+    assert tracker.stats()["nodes"]["summarization_node"]["calls"] == 1
+    assert tracker.stats()["models"][GPT_5]["cost"] > 0
+
+
+async def test_usage_state_accumulates_per_thread(mock_model, factory_config):
+    mock_model.ainvoke.return_value = response()
+    mock_model.bind_tools.return_value = mock_model
+    tracker = UsageTracker()
+    context = BuilderContext.create(
+        factory_config,
+        agent_factory=lambda model: AgentNode(
+            name="agent", model=model, usage_tracker=tracker
+        ),
+        model_factory=lambda _: mock_model,
+        graph_factory=lambda: StateGraph(UsageState),
+    )
+    graph = SingleAgent().make(context).compile(checkpointer=MemorySaver())
+
+    await graph.ainvoke({"messages": [HumanMessage("hi")]}, config())
+    result = await graph.ainvoke({"messages": [HumanMessage("again")]}, config())
+
+    assert result["usage"]["agent"]["calls"] == 2
+    assert result["usage"]["agent"]["output_tokens"] == 400
+    assert result["usage"] == {"agent": tracker.thread("t1")}
+
+
+async def test_background_summary_usage_per_thread(mock_model):
+    mock_model.ainvoke.return_value = response("summary", model=GPT_5)
+    tracker = UsageTracker()
+    node = SummarizationNode(
+        model=mock_model,
+        usage_tracker=tracker,
+        background=True,
+        max_tokens=50,
+        keep_tokens=20,
+        token_counter=TokenCounter(count=lambda message: 10),
+    )
+    messages = [
+        message
+        for turn in range(3)
+        for message in (HumanMessage(f"q{turn}", id=f"h{turn}"), AIMessage("a"))
+    ]
+
+    await node.schedule({"messages": messages}, config("t1"))
+    await asyncio.sleep(0)
+    update = await node({"messages": messages}, config("t1"))
+
+    assert tracker.thread("t1")["calls"] == 1
+    assert update["usage"]["summarization_node"]["input_tokens"] == 1000
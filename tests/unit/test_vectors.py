@@ -0,0 +1,60 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+from assistant_core.vectors import EmbeddingCache, VectorIndex  # noqa: E402
+
+
+def test_search_returns_top_k_by_cosine():
+    index = VectorIndex(capacity=1)
+    index.upsert("x", [1, 0, 0], "X")
+    index.upsert("y", [0, 1, 0], "Y")
+    index.upsert("xy", [1, 1, 0], "XY")
+
+    hits = index.search([2, 0.1, 0], limit=2)
+
+    assert [(key, value) for key, _, value in hits] == [("x", "X"), ("xy", "XY")]
+    assert hits[0][1] == pytest.approx(0.9988, abs=1e-3)
+    assert [key for key, _, _ in index.search([0, 1, 0], min_score=0.5)] == [
+        "y",
+        "xy",
+    ]
+
+
+def test_upsert_and_remove_are_incremental():
+    index = VectorIndex()
+    for i in range(100):
+        index.upsert(i, [i, 1], i)
+    index.upsert(5, [0, 1], "replaced")
+
+    assert index.remove(0)
+    assert not index.remove(0)
+    assert len(index) == 99
+    assert 0 not in index
+    assert index.get(5) == "replaced"
+    assert index.search([0, 1], limit=1)[0][0] == 5
+
+    with pytest.raises(ValueError):
+        index.upsert("bad", [1, 2, 3])
+
+
+def test_empty_index():
+    index = VectorIndex()
+
+    assert index.search([1, 0]) == []
+    index.upsert("a", [1, 0])
+    index.clear()
+    assert index.search([1, 0]) == []
+
+
+async def test_embedding_cache(embeddings):
+    cache = EmbeddingCache(embeddings)
+
+    first = cache.embed_query("refund please")
+    assert cache.embed_query("refund please") == first
+    assert await cache.aembed_query("refund please") == first
+    await cache.aembed_query("shipping")
+    await cache.aembed_query("shipping")
+
+    assert embeddings.calls == 2
+    assert cache.stats()["hits"] == 3